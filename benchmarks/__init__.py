@@ -0,0 +1 @@
+#benchmarks for the engine hot paths, run with: python -m benchmarks
@@ -0,0 +1,82 @@
+#run the benchmark suite, write results as json and compare against a stored baseline
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import time
+
+from benchmarks.cases import CASES
+from benchmarks.harness import measure
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def run(names, min_time):
+    results = {}
+    for name in names:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            fn, setup, batch = CASES[name]()
+        results[name] = measure(fn, setup, batch, min_time)
+        stats = results[name]
+        print(f"{name:22} {stats['ops_per_sec']:>14,.1f} ops/s  p50 {stats['p50_us']:>10.2f}us  p99 {stats['p99_us']:>10.2f}us  peak {stats['peak_kb']:>9.1f}KB")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    #a case regresses when its median speed falls more than `tolerance` below the baseline
+    #(the median batch is used rather than ops/sec so one noisy batch doesn't fail the run)
+    regressions = []
+    for name, stats in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+        #baselines from before the separate latency pass stored the median batch as p50_us
+        ratio = (base["median_us"] if "median_us" in base else base["p50_us"]) / stats["median_us"]
+        flag = "  REGRESSION" if ratio < 1 - tolerance else ""
+        print(f"{name:22} {ratio:>6.2f}x baseline{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Cluedo engine hot paths.")
+    parser.add_argument("cases", nargs="*", help=f"cases to run (default all): {', '.join(CASES)}")
+    parser.add_argument("--out", default="bench_results.json", help="where to write the json results")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="json results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed throughput drop before failing")
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds to spend per case")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.cases if name not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+
+    results = run(args.cases or list(CASES), args.min_time)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.out}")
+
+    if os.path.exists(args.baseline) and os.path.abspath(args.baseline) != os.path.abspath(args.out):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {args.baseline}:")
+        #absolute timings only mean something on the machine that recorded them
+        if baseline.get("meta", {}).get("platform") != report["meta"]["platform"] or baseline.get("meta", {}).get("python") != report["meta"]["python"]:
+            print("warning: the baseline was recorded on another platform or python, refresh it with --out before trusting the ratios")
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
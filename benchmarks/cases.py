@@ -0,0 +1,149 @@
+#benchmark cases, each returns (fn, setup, batch) for harness.measure
+import builtins
+import itertools
+import random
+
+from board import BOARD
+from cluedo import CluedoGame
+from configurations import CHARACTERS, ROOM_NAMES, START_POSITIONS, WEAPONS
+from gamelog import NULL
+from lockstep import LockstepBatch, MoveTables
+from movement import check_room_entry, move_player
+from player import Player
+from simulation import run_game
+from tracker import generate_tracker_log
+from turnmanager import TurnManager
+
+SEED = 1234
+
+
+def _ai_game(num_players=6):
+    return CluedoGame(num_players, ai_seats=range(num_players), seed=SEED, log=NULL)
+
+
+def bench_check_room_entry():
+    tiles = itertools.cycle([(x, y) for y in range(BOARD.height) for x in range(BOARD.width)])
+    return (lambda _: check_room_entry(next(tiles))), None, 1000
+
+
+def bench_move_player():
+    player = Player("Sherlock", START_POSITIONS["Sherlock"])
+    directions = itertools.cycle(["RIGHT", "LEFT", "DOWN", "UP"])
+    return (lambda _: move_player(player, next(directions), 1)), None, 1000
+
+
+def bench_refute():
+    game = _ai_game()
+    rng = random.Random(SEED)
+    suggestions = [(rng.choice(CHARACTERS), rng.choice(WEAPONS), rng.choice(ROOM_NAMES)) for _ in range(256)]
+    cycle = itertools.cycle(suggestions)
+    suggester = game.players[0]
+    return (lambda _: game.refute(suggester, next(cycle))), None, 1000
+
+
+def bench_ai_suggest():
+    # Full ai_suggest: choose, summon, refute, update the suggester and share with every other AI
+    # Every batch is one suggestion per seat in a fresh game, so knowledge doesn't pile up across samples
+    def setup():
+        game = _ai_game()
+        return TurnManager(game, interactive=False), iter(game.players)
+
+    def suggest(state):
+        manager, players = state
+        manager.ai_suggest(next(players), "Study")
+
+    return suggest, setup, 6
+
+
+def _recorded_outcomes(game, count):
+    rng = random.Random(SEED)
+    outcomes = []
+    for _ in range(count):
+        suggestion = (rng.choice(CHARACTERS), rng.choice(WEAPONS), rng.choice(ROOM_NAMES))
+        refuter, card = game.refute(game.players[0], suggestion)
+        outcomes.append((suggestion, refuter.name if refuter else None, card))
+    return outcomes
+
+
+def bench_knowledge_update():
+    # observe_suggestion + update_knowledge_from_refutation on a fresh AI, one op per suggestion outcome
+    game = _ai_game()
+    names = [p.name for p in game.players]
+    sizes = [len(p.cards) for p in game.players]
+    outcomes = _recorded_outcomes(game, 100)
+    me = game.players[0]
+
+    def setup():
+        player = Player(me.name, me.position, is_ai=True)
+        for card in me.cards:
+            player.receive_card(card)
+        player.start_deduction(names, sizes)
+        return [player, iter(outcomes)]
+
+    def update(state):
+        player, pending = state
+        suggestion, refuter, card = next(pending)
+        player.observe_suggestion(*suggestion, refuter, names)
+        if refuter:
+            player.update_knowledge_from_refutation(player.name, suggestion, refuter, card)
+
+    return update, setup, 100
+
+
+def bench_tracker_log():
+    rng = random.Random(SEED)
+    player = Player("Sherlock", START_POSITIONS["Sherlock"])
+    for _ in range(40):
+        player.suggestion_history.append((rng.choice(CHARACTERS), rng.choice(WEAPONS), rng.choice(ROOM_NAMES), rng.choice([None, "Watson", "Ivy"])))
+    return (lambda _: generate_tracker_log(player)), None, 100
+
+
+def bench_headless_game():
+    seeds = itertools.count(SEED)
+    return (lambda _: run_game(6, next(seeds))), None, 5
+
+
+def bench_lockstep_batch():
+    # One op is a whole batch of 256 six player games, compare against 256x headless_game
+    seeds = itertools.count(SEED, 256)
+    tables = MoveTables()
+    return (lambda _: LockstepBatch(256, 6, next(seeds), tables).run()), None, 1
+
+
+def _scripted_input(prompt=""):
+    # Drives the interactive path: 2 players, the human accuses wrongly straight away and the AI plays it out
+    if prompt.startswith("How many players"):
+        return "2"
+    if prompt.startswith("Enter your move"):
+        return "ACCUSE"
+    if prompt.strip() in ("Character:", "Weapon:", "Room:"):
+        return "Nobody"
+    return ""
+
+
+def bench_scripted_game():
+    seeds = itertools.count(SEED)
+
+    def play(_):
+        real_input = builtins.input
+        builtins.input = _scripted_input
+        try:
+            game = CluedoGame(seed=next(seeds))
+            TurnManager(game).run(max_turns=1000)
+        finally:
+            builtins.input = real_input
+
+    return play, None, 5
+
+
+CASES = {
+    "check_room_entry": bench_check_room_entry,
+    "move_player": bench_move_player,
+    "refute": bench_refute,
+    "ai_suggest": bench_ai_suggest,
+    "knowledge_update": bench_knowledge_update,
+    "generate_tracker_log": bench_tracker_log,
+    "headless_game": bench_headless_game,
+    "lockstep_batch": bench_lockstep_batch,
+    "scripted_game": bench_scripted_game,
+}
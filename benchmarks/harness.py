@@ -0,0 +1,62 @@
+#timing harness: ops/sec, p50/p99 latency and peak memory for one benchmark case
+import contextlib
+import gc
+import os
+import time
+import tracemalloc
+
+
+def measure(fn, setup=None, batch: int = 100, min_time: float = 0.5, max_batches: int = 10_000) -> dict:
+    """Call fn(state) `batch` times per sample until min_time has passed; setup() builds state untimed before each batch.
+
+    Throughput comes from whole batches with nothing else in the loop, p50/p99 from a separate pass timing single calls
+    (each of those includes one clock read)."""
+    clock = time.perf_counter_ns
+    batch_means = []
+    total_ops = 0
+    total_time = 0.0
+    latencies = []
+    latency_time = 0
+    #the game prints on every step, keep that out of the timings
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        gc.collect()
+        while (total_time < min_time or len(batch_means) < 5) and len(batch_means) < max_batches:
+            state = setup() if setup is not None else None
+            start = clock()
+            for _ in range(batch):
+                fn(state)
+            elapsed = clock() - start
+            batch_means.append(elapsed / batch)
+            total_ops += batch
+            total_time += elapsed / 1e9
+
+        # Latency pass, half as long again
+        batches = 0
+        while (latency_time < min_time * 5e8 or batches < 5) and batches < max_batches:
+            state = setup() if setup is not None else None
+            for _ in range(batch):
+                start = clock()
+                fn(state)
+                elapsed = clock() - start
+                latencies.append(elapsed)
+                latency_time += elapsed
+            batches += 1
+
+        # Memory is measured on a separate batch, tracemalloc slows everything down
+        state = setup() if setup is not None else None
+        tracemalloc.start()
+        for _ in range(batch):
+            fn(state)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    batch_means.sort()
+    latencies.sort()
+    return {
+        "ops_per_sec": total_ops / total_time if total_time else 0.0,
+        "median_us": batch_means[len(batch_means) // 2] / 1000,
+        "p50_us": latencies[len(latencies) // 2] / 1000,
+        "p99_us": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] / 1000,
+        "peak_kb": peak / 1024,
+        "ops": total_ops,
+    }
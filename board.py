@@ -0,0 +1,236 @@
+#compiled board, built once from the room layout so tile lookups are a single index instead of a scan over every room
+#binary form (see Board.to_bytes): MAGIC, version byte, json header length, json header with the layout, then
+#little-endian uint32 arrays: one distance field per room in header order, neighbour offsets per cell, neighbour cells
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import deque
+
+from configurations import CHARACTERS, ROOM_NAMES, ROOMS, SECRET_PASSAGES, START_POSITIONS
+
+#(dx, dy) per move direction, y grows downwards like the excel map
+DIRECTIONS = {
+    "UP": (0, -1),
+    "DOWN": (0, 1),
+    "LEFT": (-1, 0),
+    "RIGHT": (1, 0),
+}
+
+UNREACHABLE = 1 << 30 #distance for tiles that can't reach a room
+
+MAGIC = b"CLBD"
+VERSION = 1 #bump when the binary form or the way boardcompiler.py reads layouts changes, old cache entries are then ignored
+_HEADER = struct.Struct("<4sBI")
+
+
+class Board:
+    # Flat row-major grid of room names (None for hallway tiles).
+    # Width and height come from the furthest tile in the layout unless given explicitly.
+    # Also holds a distance field per room (fewest steps from every tile, secret passages count as one step).
+    # Precomputed neighbours and distance fields (from a compiled board, see boardcompiler.py) skip building them.
+
+    def __init__(self, rooms: dict[str, list[tuple[int, int]]], start_positions: dict[str, tuple[int, int]] | None = None, passages: dict[str, str] | None = None, width: int | None = None, height: int | None = None,
+                 distances: dict[str, list[int]] | None = None, neighbours: list[list[int]] | None = None):
+        tiles = [tile for room_tiles in rooms.values() for tile in room_tiles]
+        tiles += list((start_positions or {}).values())
+        self.width = width if width is not None else max(x for x, _ in tiles) + 1
+        self.height = height if height is not None else max(y for _, y in tiles) + 1
+        self.rooms = rooms
+        self.cells: list[str | None] = [None] * (self.width * self.height)
+        for room, room_tiles in rooms.items():
+            for x, y in room_tiles:
+                if not self.in_bounds(x, y):
+                    raise ValueError(f"{room} tile {(x, y)} is outside the {self.width}x{self.height} board")
+                self.cells[y * self.width + x] = room
+        self.starts = dict(start_positions or {})
+        self.passages = dict(passages or {})
+        if neighbours is not None and len(neighbours) != len(self.cells):
+            raise ValueError("precomputed neighbours don't match the board")
+        self.neighbours = neighbours if neighbours is not None else self._build_neighbours()
+        if distances is not None:
+            if set(distances) != set(rooms) or any(len(field) != len(self.cells) for field in distances.values()):
+                raise ValueError("precomputed distances don't match the board")
+            self.distances = distances
+        else:
+            self.distances = {room: self._distance_field(room) for room in rooms}
+
+    def _build_neighbours(self) -> list[list[int]]:
+        neighbours = []
+        for cell in range(self.width * self.height):
+            x, y = cell % self.width, cell // self.width
+            adjacent = [(x + dx) + (y + dy) * self.width for dx, dy in DIRECTIONS.values() if self.in_bounds(x + dx, y + dy)]
+            room = self.cells[cell]
+            if room in self.passages:
+                # A passage takes you from any tile of the room to the first tile of the other room
+                dest_x, dest_y = self.rooms[self.passages[room]][0]
+                adjacent.append(dest_y * self.width + dest_x)
+            neighbours.append(adjacent)
+        return neighbours
+
+    def _distance_field(self, room: str) -> list[int]:
+        #multi-source bfs outwards from every tile of the room, run over reversed edges so passages work one way too
+        reverse = [[] for _ in self.neighbours]
+        for cell, adjacent in enumerate(self.neighbours):
+            for other in adjacent:
+                reverse[other].append(cell)
+        dist = [UNREACHABLE] * len(self.cells)
+        queue = deque()
+        for x, y in self.rooms[room]:
+            dist[y * self.width + x] = 0
+            queue.append(y * self.width + x)
+        while queue:
+            cell = queue.popleft()
+            for prev in reverse[cell]:
+                if dist[prev] == UNREACHABLE:
+                    dist[prev] = dist[cell] + 1
+                    queue.append(prev)
+        return dist
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def room_at(self, pos: tuple[int, int]) -> str | None:
+        """Room covering a tile, or None for hallway/off-board tiles."""
+        x, y = pos
+        if not self.in_bounds(x, y):
+            return None
+        return self.cells[y * self.width + x]
+
+    def destination(self, pos: tuple[int, int], direction: str, steps: int) -> tuple[int, int]:
+        """Tile reached after moving in a straight line; unknown directions stay put."""
+        dx, dy = DIRECTIONS.get(direction, (0, 0))
+        x, y = pos
+        return (x + dx * steps, y + dy * steps)
+
+    def distance(self, room: str, pos: tuple[int, int]) -> int:
+        """Fewest steps from a tile to any tile of the room."""
+        x, y = pos
+        if not self.in_bounds(x, y):
+            return UNREACHABLE
+        return self.distances[room][y * self.width + x]
+
+    def best_target(self, rooms: list[str], pos: tuple[int, int], roll: int) -> str | None:
+        """Room left closest after moving up to `roll` steps; ties go to the nearer room, then list order."""
+        best, best_key = None, None
+        for room in rooms:
+            dist = self.distance(room, pos)
+            if dist == UNREACHABLE:
+                continue
+            key = (max(0, dist - roll), dist)
+            if best_key is None or key < best_key:
+                best, best_key = room, key
+        return best
+
+    def path_towards(self, room: str, pos: tuple[int, int], steps: int) -> list[tuple[int, int]]:
+        """Tiles visited walking up to `steps` along a shortest path, stopping once inside the room."""
+        dist = self.distances[room]
+        cell = pos[1] * self.width + pos[0]
+        path = []
+        while steps > 0 and 0 < dist[cell] < UNREACHABLE:
+            cell = next(other for other in self.neighbours[cell] if dist[other] == dist[cell] - 1)
+            path.append((cell % self.width, cell // self.width))
+            steps -= 1
+        return path
+
+    def will_move_off_board(self, pos: tuple[int, int], direction: str, steps: int) -> bool:
+        if direction not in DIRECTIONS:
+            return True
+        return not self.in_bounds(*self.destination(pos, direction, steps))
+
+    def room_tile(self, room: str) -> tuple[int, int]:
+        """Tile a player is placed on when moved into a room (summoned or through a passage)."""
+        return self.rooms[room][0]
+
+    def to_bytes(self) -> bytes:
+        header = json.dumps({
+            "width": self.width,
+            "height": self.height,
+            "rooms": {room: [list(tile) for tile in tiles] for room, tiles in self.rooms.items()},
+            "starts": {name: list(tile) for name, tile in self.starts.items()},
+            "passages": self.passages,
+        }, separators=(",", ":")).encode()
+        fields = array("I")
+        for room in self.rooms:
+            fields.extend(self.distances[room])
+        offset = 0
+        for adjacent in self.neighbours:
+            fields.append(offset)
+            offset += len(adjacent)
+        fields.append(offset)
+        for adjacent in self.neighbours:
+            fields.extend(adjacent)
+        if sys.byteorder == "big":
+            fields.byteswap()
+        return _HEADER.pack(MAGIC, VERSION, len(header)) + header + fields.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Board":
+        magic, version, header_size = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a compiled cluedo board (or unsupported version)")
+        offset = _HEADER.size + header_size
+        header = json.loads(data[_HEADER.size:offset])
+        rooms = {room: [tuple(tile) for tile in tiles] for room, tiles in header["rooms"].items()}
+        fields = array("I")
+        fields.frombytes(data[offset:])
+        if sys.byteorder == "big":
+            fields.byteswap()
+        size = header["width"] * header["height"]
+        values = fields.tolist()
+        table_end = size * len(rooms) + size + 1
+        if len(values) < table_end or len(values) != table_end + values[table_end - 1]:
+            raise ValueError("compiled board is truncated")
+        distances = {room: values[i * size:(i + 1) * size] for i, room in enumerate(rooms)}
+        offsets = values[size * len(rooms):table_end]
+        flat = values[table_end:]
+        neighbours = [flat[offsets[cell]:offsets[cell + 1]] for cell in range(size)]
+        starts = {name: tuple(tile) for name, tile in header["starts"].items()}
+        return cls(rooms, starts, header["passages"], header["width"], header["height"], distances, neighbours)
+
+
+def default_cache_dir() -> str:
+    return os.environ.get("CLUEDO_BOARD_CACHE") or os.path.join(os.path.expanduser("~"), ".cache", "cluedo")
+
+
+def compiled_path(layout: bytes, cache_dir: str | None = None) -> str:
+    """Cache file for a layout file's content (sha256, salted with VERSION and the configuration the compiler reads)."""
+    #the compiler checks rooms against ROOM_NAMES and falls back to START_POSITIONS, editing those must miss the cache
+    config = json.dumps([CHARACTERS, ROOM_NAMES, START_POSITIONS], separators=(",", ":"))
+    key = hashlib.sha256(f"{VERSION}:{config}:".encode() + layout).hexdigest()[:32]
+    return os.path.join(cache_dir or default_cache_dir(), f"board-{key}.bin")
+
+
+def read_compiled(path: str) -> Board | None:
+    """Board from a compiled file, or None if it is missing or damaged."""
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return Board.from_bytes(mapped)
+    except (OSError, ValueError, KeyError, TypeError, IndexError, struct.error):
+        return None
+
+
+def load_board(source: str, cache_dir: str | None = None) -> Board:
+    """Board for a layout file (.xlsx or text grid), compiled on the first use of its content and cached after that."""
+    with open(source, "rb") as f:
+        layout = f.read()
+    board = read_compiled(compiled_path(layout, cache_dir))
+    if board is None:
+        from boardcompiler import compile_file #only needed on a cache miss, and it builds on this module
+        board = compile_file(source, layout, cache_dir)
+    return board
+
+
+def _game_board() -> Board:
+    #the built-in layout, or the layout file CLUEDO_BOARD names
+    source = os.environ.get("CLUEDO_BOARD")
+    if not source:
+        return Board(ROOMS, START_POSITIONS, SECRET_PASSAGES)
+    return load_board(source)
+
+
+#the board used by the game, compiled once at import
+BOARD = _game_board()
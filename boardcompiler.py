@@ -0,0 +1,319 @@
+#board compiler: reads a layout (the excel map, or a plain text grid), validates it and caches the compiled board
+#the cache file is Board.to_bytes() named by a hash of the layout file, so a worker booting with CLUEDO_BOARD set
+#maps one small file (board.load_board) instead of parsing the layout and running every distance search again;
+#this module is only imported when that lookup misses
+import argparse
+import io
+import os
+import posixpath
+import re
+import tempfile
+import time
+import zipfile
+from typing import NamedTuple
+from xml.etree import ElementTree
+
+from board import UNREACHABLE, Board, compiled_path, load_board
+from configurations import CHARACTERS, ROOM_NAMES, START_POSITIONS
+
+GRID_ANCHOR = "X,Y" #corner cell of the excel grid: x coordinates run right of it, y coordinates down
+HALLWAY = "."
+
+_SHEET = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_RELS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_DOC_RELS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PASSAGE = re.compile(r"^\s*(.+?)\s*(<->|->)\s*(.+?)\s*$")
+
+
+class BoardError(ValueError):
+    """Raised when a layout can't be read or isn't a playable board."""
+
+
+class Layout(NamedTuple):
+    width: int
+    height: int
+    rooms: dict  # room -> tiles in row-major order, the first one is where summoned players land
+    starts: dict  # character -> start tile
+    passages: dict  # room -> room, one entry per direction
+
+
+# --- reading layouts ------------------------------------------------------
+
+def _cell_ref(ref: str) -> tuple[int, int]:
+    #"B12" -> (column 1, row 11), zero based
+    letters = ref.rstrip("0123456789")
+    column = 0
+    for letter in letters:
+        column = column * 26 + ord(letter) - ord("A") + 1
+    return column - 1, int(ref[len(letters):]) - 1
+
+
+def _read_cells(data: bytes) -> dict[tuple[int, int], str]:
+    #first worksheet of an xlsx as {(column, row): text}, with plain zip and xml parsing
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(data))
+        workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+        sheet_id = workbook.find(f"{_SHEET}sheets/{_SHEET}sheet").get(f"{_DOC_RELS}id")
+        rels = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+        target = next(rel.get("Target") for rel in rels.iter(f"{_RELS}Relationship") if rel.get("Id") == sheet_id)
+        sheet_path = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+        shared = []
+        if "xl/sharedStrings.xml" in archive.namelist():
+            for item in ElementTree.fromstring(archive.read("xl/sharedStrings.xml")).iter(f"{_SHEET}si"):
+                shared.append("".join(text.text or "" for text in item.iter(f"{_SHEET}t"))) #rich text comes in runs
+        sheet = ElementTree.fromstring(archive.read(sheet_path))
+    except (zipfile.BadZipFile, KeyError, StopIteration, AttributeError, ElementTree.ParseError) as exc:
+        raise BoardError(f"not a readable xlsx workbook: {exc}") from exc
+    cells = {}
+    for cell in sheet.iter(f"{_SHEET}c"):
+        kind = cell.get("t")
+        if kind == "inlineStr":
+            text = "".join(node.text or "" for node in cell.iter(f"{_SHEET}t"))
+        else:
+            value = cell.find(f"{_SHEET}v")
+            if value is None or value.text is None:
+                continue
+            text = shared[int(value.text)] if kind == "s" else value.text
+        if text.strip():
+            cells[_cell_ref(cell.get("r"))] = text.strip()
+    return cells
+
+
+def _parse_passages(text: str) -> dict[str, str]:
+    #"Study <-> Kitchen | Lounge -> Library"
+    passages = {}
+    for part in text.split("|"):
+        match = _PASSAGE.match(part)
+        if not match:
+            raise BoardError(f"can't read passage {part.strip()!r}, expected 'Room <-> Room' or 'Room -> Room'")
+        origin, arrow, dest = match.groups()
+        passages[origin] = dest
+        if arrow == "<->":
+            passages[dest] = origin
+    return passages
+
+
+def _number(text: str | None) -> int | None:
+    try:
+        return int(float(text))
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_xlsx(data: bytes) -> Layout:
+    """Layout from the excel map: a grid under an "X,Y" corner cell plus a "PASSAGES: ..." key cell.
+
+    Cells name the room they belong to (or a character, for its start tile); the sheet has no start tiles today,
+    so characters not placed on it start where configurations.START_POSITIONS puts them."""
+    cells = _read_cells(data)
+    anchor = next((ref for ref, text in cells.items() if text.replace(" ", "").upper() == GRID_ANCHOR), None)
+    if anchor is None:
+        raise BoardError(f"no {GRID_ANCHOR!r} corner cell marking the board grid")
+    column, row = anchor
+    xs = {}
+    while _number(cells.get((column + len(xs) + 1, row))) is not None:
+        xs[column + len(xs) + 1] = _number(cells[(column + len(xs) + 1, row)])
+    ys = {}
+    while _number(cells.get((column, row + len(ys) + 1))) is not None:
+        ys[row + len(ys) + 1] = _number(cells[(column, row + len(ys) + 1)])
+    if not xs or not ys:
+        raise BoardError("the board grid has no coordinates next to its corner cell")
+    rooms, starts = {}, {}
+    for y_row, y in ys.items():
+        for x_column, x in xs.items():
+            name = cells.get((x_column, y_row))
+            if name is None:
+                continue
+            if name in CHARACTERS:
+                starts[name] = (x, y)
+            else:
+                rooms.setdefault(name, []).append((x, y))
+    passages = {}
+    for text in cells.values():
+        if text.upper().startswith("PASSAGES"):
+            passages.update(_parse_passages(text.split(":", 1)[1] if ":" in text else ""))
+    for name in CHARACTERS:
+        starts.setdefault(name, START_POSITIONS[name])
+    rooms = {room: sorted(tiles, key=lambda tile: (tile[1], tile[0])) for room, tiles in rooms.items()}
+    return Layout(max(xs.values()) + 1, max(ys.values()) + 1, rooms, starts, passages)
+
+
+def parse_text(text: str) -> Layout:
+    """Layout from a text grid. Lines are:
+      - grid rows, one character per tile: '.' hallway, a legend letter for a room, 1-6 where that character starts
+      - legend entries "S = Study"
+      - passages "Study <-> Kitchen" (both ways) or "Study -> Kitchen"
+    Blank lines and lines starting with # are ignored; characters with no start digit use START_POSITIONS."""
+    grid, legend, passages = [], {}, {}
+    for number, line in enumerate(text.splitlines(), 1):
+        line = line.rstrip()
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        if "->" in line:
+            passages.update(_parse_passages(line))
+        elif "=" in line:
+            letter, _, room = line.partition("=")
+            letter, room = letter.strip(), room.strip()
+            if len(letter) != 1 or letter == HALLWAY or letter.isdigit():
+                raise BoardError(f"line {number}: legend keys are single letters, got {letter!r}")
+            legend[letter] = room
+        else:
+            grid.append((number, line))
+    if not grid:
+        raise BoardError("no grid rows in the layout")
+    width = len(grid[0][1])
+    rooms, starts = {}, {}
+    for y, (number, line) in enumerate(grid):
+        if len(line) != width:
+            raise BoardError(f"line {number}: grid rows must all be {width} tiles wide")
+        for x, tile in enumerate(line):
+            if tile == HALLWAY:
+                continue
+            if tile.isdigit():
+                if not 1 <= int(tile) <= len(CHARACTERS):
+                    raise BoardError(f"line {number}: start digits go from 1 to {len(CHARACTERS)}")
+                starts[CHARACTERS[int(tile) - 1]] = (x, y)
+            elif tile in legend:
+                rooms.setdefault(legend[tile], []).append((x, y))
+            else:
+                raise BoardError(f"line {number}: {tile!r} is not in the legend")
+    for name in CHARACTERS:
+        starts.setdefault(name, START_POSITIONS[name])
+    return Layout(width, len(grid), rooms, starts, passages)
+
+
+def parse(path: str, data: bytes) -> Layout:
+    if path.lower().endswith(".xlsx"):
+        return parse_xlsx(data)
+    try:
+        return parse_text(data.decode("utf-8"))
+    except UnicodeDecodeError as exc:
+        raise BoardError(f"{path} is neither an xlsx workbook nor a utf-8 text grid") from exc
+
+
+def format_text(layout: Layout) -> str:
+    """The layout as a text grid that parse_text reads back."""
+    legend = {}
+    for room in layout.rooms:
+        options = [char.upper() for char in room if char.isalpha()] + [chr(code) for code in range(ord("A"), ord("Z") + 1)]
+        legend[room] = next(letter for letter in options if letter not in legend.values())
+    grid = [[HALLWAY] * layout.width for _ in range(layout.height)]
+    for room, tiles in layout.rooms.items():
+        for x, y in tiles:
+            grid[y][x] = legend[room]
+    for index, name in enumerate(CHARACTERS, 1):
+        if name in layout.starts:
+            x, y = layout.starts[name]
+            grid[y][x] = str(index)
+    lines = ["".join(row) for row in grid] + [""]
+    lines += [f"{letter} = {room}" for room, letter in legend.items()] + [""]
+    done = set()
+    for origin, dest in layout.passages.items():
+        if (origin, dest) in done:
+            continue
+        both = layout.passages.get(dest) == origin
+        lines.append(f"{origin} {'<->' if both else '->'} {dest}")
+        done.update({(origin, dest), (dest, origin)} if both else {(origin, dest)})
+    return "\n".join(lines) + "\n"
+
+
+# --- validating and compiling ---------------------------------------------
+
+def _connected(tiles: list[tuple[int, int]]) -> bool:
+    remaining = set(tiles)
+    stack = [remaining.pop()]
+    while stack:
+        x, y = stack.pop()
+        for neighbour in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if neighbour in remaining:
+                remaining.remove(neighbour)
+                stack.append(neighbour)
+    return not remaining
+
+
+def compile_layout(layout: Layout) -> Board:
+    """Validate a layout and build its board, reporting every problem at once."""
+    problems = []
+    unknown = [room for room in layout.rooms if room not in ROOM_NAMES]
+    missing = [room for room in ROOM_NAMES if room not in layout.rooms]
+    if unknown:
+        problems.append(f"rooms without a card: {', '.join(unknown)}")
+    if missing:
+        problems.append(f"room cards missing from the board: {', '.join(missing)}")
+    problems += [f"{room} is split into separate areas" for room, tiles in layout.rooms.items() if not _connected(tiles)]
+    problems += [f"passage {origin} -> {dest} names an unknown room" for origin, dest in layout.passages.items()
+                 if origin not in layout.rooms or dest not in layout.rooms]
+    problems += [f"passage {origin} -> {dest} leads nowhere" for origin, dest in layout.passages.items() if origin == dest]
+    room_tiles = {tile for tiles in layout.rooms.values() for tile in tiles}
+    for name, (x, y) in layout.starts.items():
+        if not (0 <= x < layout.width and 0 <= y < layout.height):
+            problems.append(f"{name} starts off the board at {(x, y)}")
+        elif (x, y) in room_tiles:
+            problems.append(f"{name} starts inside a room at {(x, y)}")
+    if problems:
+        raise BoardError("invalid board layout: " + "; ".join(problems))
+    board = Board(layout.rooms, layout.starts, layout.passages, layout.width, layout.height)
+    cut_off = [f"{name} can't reach the {room}" for name, (x, y) in layout.starts.items() for room in layout.rooms
+               if board.distance(room, (x, y)) == UNREACHABLE]
+    if cut_off:
+        raise BoardError("invalid board layout: " + "; ".join(cut_off))
+    return board
+
+
+# --- cache ----------------------------------------------------------------
+
+def write_compiled(board: Board, path: str):
+    """Write a compiled board atomically, so a worker starting in parallel never maps half a file."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(board.to_bytes())
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def compile_file(source: str, layout: bytes, cache_dir: str | None = None) -> Board:
+    """Parse, validate and compile a layout file's content, then cache it for board.load_board."""
+    board = compile_layout(parse(source, layout))
+    try:
+        write_compiled(board, compiled_path(layout, cache_dir))
+    except OSError:
+        pass #read-only cache location, the board still works, it just gets compiled again next time
+    return board
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile a Cluedo board layout (.xlsx or text grid) and cache it.")
+    parser.add_argument("layout", help="Cluedo_Excel_Map.xlsx or a text grid (see parse_text)")
+    parser.add_argument("--cache-dir", default=None, help="defaults to $CLUEDO_BOARD_CACHE or ~/.cache/cluedo")
+    parser.add_argument("--out", help="also write the compiled board to this path")
+    parser.add_argument("--text", action="store_true", help="print the layout as a text grid instead of compiling")
+    args = parser.parse_args()
+
+    with open(args.layout, "rb") as f:
+        data = f.read()
+    layout = parse(args.layout, data)
+    if args.text:
+        print(format_text(layout), end="")
+        return
+    start = time.perf_counter()
+    board = compile_layout(layout)
+    compiled = time.perf_counter() - start
+    path = compiled_path(data, args.cache_dir)
+    write_compiled(board, path)
+    if args.out:
+        write_compiled(board, args.out)
+    start = time.perf_counter()
+    load_board(args.layout, args.cache_dir)
+    loaded = time.perf_counter() - start
+    print(f"{board.width}x{board.height} board, {len(board.rooms)} rooms, {len(board.passages)} passage(s), {len(board.starts)} start tiles")
+    print(f"Compiled in {compiled * 1000:.1f}ms, cached at {path} (loads in {loaded * 1000:.1f}ms)")
+    print(f"Play on it with CLUEDO_BOARD={args.layout}")
+
+
+if __name__ == "__main__":
+    main()
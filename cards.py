@@ -0,0 +1,48 @@
+#card index table, every card gets one bit so a set of cards is just an int
+from configurations import CHARACTERS, WEAPONS, ROOM_NAMES
+
+ALL_CARDS = CHARACTERS + WEAPONS + ROOM_NAMES
+CARD_INDEX = {card: i for i, card in enumerate(ALL_CARDS)}
+CARD_BITS = {card: 1 << i for i, card in enumerate(ALL_CARDS)}
+CATEGORIES = ("character", "weapon", "room")
+
+
+def mask_of(cards) -> int:
+    """Pack an iterable of card names into a bitmask."""
+    mask = 0
+    for card in cards:
+        mask |= CARD_BITS[card]
+    return mask
+
+
+CHARACTER_MASK = mask_of(CHARACTERS)
+WEAPON_MASK = mask_of(WEAPONS)
+ROOM_MASK = mask_of(ROOM_NAMES)
+FULL_MASK = CHARACTER_MASK | WEAPON_MASK | ROOM_MASK
+CATEGORY_MASKS = {
+    "character": CHARACTER_MASK,
+    "weapon": WEAPON_MASK,
+    "room": ROOM_MASK,
+}
+
+
+def cards_of(mask: int) -> list[str]:
+    """Unpack a bitmask into card names, in deck order."""
+    cards = []
+    while mask:
+        low = mask & -mask
+        cards.append(ALL_CARDS[low.bit_length() - 1])
+        mask ^= low
+    return cards
+
+
+def lowest_card(mask: int) -> str | None:
+    """First card in deck order that is set in the mask."""
+    if not mask:
+        return None
+    return ALL_CARDS[(mask & -mask).bit_length() - 1]
+
+
+def is_single(mask: int) -> bool:
+    """True when exactly one card is set."""
+    return mask != 0 and mask & (mask - 1) == 0
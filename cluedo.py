@@ -3,13 +3,42 @@ from player import Player
 from turnmanager import TurnManager
 from configurations import * 
 from movement import move_player, check_room_entry, will_move_off_board
+from board import BOARD
+from inference import DEFAULT_DECISION_BUDGET
+from events import SEED_LIMIT, EventLog
+from gamelog import ConsoleSink
 
 
 class CluedoGame:
-    def __init__(self):
-        self.num_players = self.ask_player_count()
-        print(f"{self.num_players -1} human(s), and 1 AI will be playing! Good luck!")
+    def __init__(self, num_players=None, ai_seats=None, decision_budget=None, seed=None, strategies=None, log=None):
+        #num_players and ai_seats can be passed in for headless games, otherwise ask at the terminal
+        #log is the gamelog sink for everything the game, turn manager and players say, the console by default
+        self.log = log if log is not None else ConsoleSink()
+        #strategies maps seat index -> decision maker (e.g. search.SearchStrategy), a seat given one is always an ai seat;
+        #other ai seats use the built-in rules
+        if num_players is None:
+            num_players = self.ask_player_count()
+        elif not 2 <= num_players <= 6:
+            raise ValueError("num_players must be between 2 and 6")
+        self.num_players = num_players
+        self.ai_seats = set(ai_seats) if ai_seats is not None else {num_players - 1} #default is one ai in the last seat
+        self.strategies = dict(strategies or {})
+        if not all(0 <= seat < num_players for seat in self.strategies):
+            raise ValueError("strategy seats must be between 0 and num_players - 1")
+        self.ai_seats |= self.strategies.keys()
+        num_ai = len(self.ai_seats)
+        self.log.info("{} human(s), and {} AI will be playing! Good luck!", self.num_players - num_ai, num_ai)
+        self.decision_budget = decision_budget #per-suggestion thinking time for ai seats, None is the instant rule
         self.current_player_idx = 0
+        self.winner = None #name of the player who made the correct accusation
+        if seed is None:
+            seed = random.randrange(1 << 63) #still recorded, so every game can be replayed
+        elif not 0 <= seed < SEED_LIMIT:
+            raise ValueError("seed must be between 0 and 2**64 - 1")
+        self.seed = seed
+        self.rng = random.Random(seed) #the rules' randomness (deal, dice, shown cards) goes through this, never the global random module
+        self.events = EventLog()
+        self.events.start(self.num_players, self.ai_seats, seed)
         self.solution = self.select_solution()
         self.players = self.create_players()
         self.deal_cards()
@@ -18,40 +47,83 @@ class CluedoGame:
         players = []
         for i in range(self.num_players):
             name = CHARACTERS[i]
-            position = START_POSITIONS[name]
-            is_ai = (i == self.num_players - 1) #only one ai right now
-            players.append(Player(name, position, is_ai = is_ai))
+            position = BOARD.starts[name]
+            is_ai = i in self.ai_seats
+            strategy = self.strategies.get(i) if is_ai else None
+            players.append(Player(name, position, is_ai = is_ai, decision_budget = self.decision_budget if is_ai else None, strategy = strategy, log = self.log))
         return players
     def ask_player_count(self):
         while True:
             try:
+                self.log.flush()
                 num = int(input("How many players (2–6)? "))
                 if 2 <= num <= 6:
                     return num
                 else:
-                    print("Please enter a number between 2 and 6.")
+                    self.log.info("Please enter a number between 2 and 6.")
             except ValueError: #in case a number out of range is chosen
-                print("Invalid input. Enter a number.")
+                self.log.info("Invalid input. Enter a number.")
     def select_solution(self):
         return (
-            random.choice(CHARACTERS),
-            random.choice(WEAPONS),
-            random.choice(ROOM_NAMES)
+            self.rng.choice(CHARACTERS),
+            self.rng.choice(WEAPONS),
+            self.rng.choice(ROOM_NAMES)
         )
     def deal_cards(self):
         full_deck = [card for card in CHARACTERS + WEAPONS + ROOM_NAMES if card not in self.solution]
-        random.shuffle(full_deck)
+        self.rng.shuffle(full_deck)
+        self.card_holder = {} #card -> seat index of the player holding it, solution cards are absent
         for i, card in enumerate(full_deck):
-            self.players[i % len(self.players)].cards.append(card)
+            seat = i % len(self.players)
+            self.players[seat].receive_card(card) #lets the ai rule out its own hand
+            self.card_holder[card] = seat
+        self.events.deal(self.solution, self.card_holder)
+        #hand sizes are public, the ai deduction engine needs them to reason about full hands
+        names = [player.name for player in self.players]
+        hand_sizes = [len(player.cards) for player in self.players]
+        for player in self.players:
+            player.start_deduction(names, hand_sizes)
+
+    def refute(self, suggester, suggestion):
+        #first player clockwise from the suggester holding any of the cards, found from the holder index instead of scanning hands
+        #returns (refuting player, card shown) or (None, None)
+        num = len(self.players)
+        start = self.players.index(suggester)
+        best_seat, best_distance = None, num
+        for card in suggestion:
+            seat = self.card_holder.get(card)
+            if seat is None:
+                continue
+            distance = (seat - start) % num
+            if 0 < distance < best_distance:
+                best_seat, best_distance = seat, distance
+        if best_seat is None:
+            return None, None
+        matching_cards = [card for card in suggestion if self.card_holder.get(card) == best_seat]
+        return self.players[best_seat], self.rng.choice(matching_cards)
+
+    def active_players(self):
+        return [player for player in self.players if not player.eliminated]
+    def is_over(self):
+        #game ends on a correct accusation, or once nobody is left to take a turn
+        return self.winner is not None or not self.active_players()
+
+    def thinking_rng(self, seat, turn, purpose):
+        #ai decisions get their own stream derived from (seed, seat, turn), a time-limited search draws as many numbers
+        #as the clock allows and must not shift the dice or the cards shown after it
+        return random.Random(f"{self.seed}:{seat}:{turn}:{purpose}")
 
     def roll_die(self):
-        return random.randint(1, 6)
+        roll = self.rng.randint(1, 6)
+        self.events.roll(self.current_player_idx, roll)
+        return roll
     def debug_print_ai_hand(self): #to help during presentation
         for player in self.players:
             if player.is_ai:
-                print(f"[FOR PRESENTATION] {player.name} (AI PLAYER) was dealt: {player.cards}")
+                self.log.debug("[FOR PRESENTATION] {} (AI PLAYER) was dealt: {}", player.name, player.cards)
 
 if __name__ == "__main__":
     #hand control to the turn manager.  The turn manager handles the game loop, prompting each player (human or AI)
-    game = CluedoGame()
-    TurnManager(game).run()
+    game = CluedoGame(decision_budget=DEFAULT_DECISION_BUDGET)
+    TurnManager(game, open_tracker=True).run()
+    game.log.close()
@@ -0,0 +1,185 @@
+#constraint propagation for ai deduction
+#keeps a card ownership matrix over every player plus the solution envelope, each cell is "has", "lacks" or unknown.
+#new facts go on a worklist and only the constraints touching that card/owner are re-checked, nothing is re-solved from scratch.
+from cards import ALL_CARDS, CARD_BITS, CATEGORY_MASKS, FULL_MASK, is_single, mask_of
+
+_SEATINGS: dict[tuple, tuple] = {} #names -> (names, seat map), shared by every engine at the same table layout
+
+CARD_CATEGORY_MASK = [next(mask for mask in CATEGORY_MASKS.values() if mask & (1 << i)) for i in range(len(ALL_CARDS))]
+
+
+class ContradictionError(ValueError):
+    """Raised when an observation conflicts with what has already been deduced."""
+
+
+class DeductionEngine:
+    # Owners are the players in seat order followed by the envelope (index == number of players).
+    # Rules enforced:
+    #   - every card has exactly one owner
+    #   - the envelope holds exactly one card per category
+    #   - every player holds exactly their dealt hand size
+    #   - "has one of" clauses from refutations we did not see
+    __slots__ = ("player_names", "seat", "envelope", "sizes", "has", "lacks", "candidates", "clauses", "_queue")
+
+    def __init__(self, player_names: list[str], hand_sizes: list[int]):
+        names = tuple(player_names)
+        if names not in _SEATINGS:
+            _SEATINGS[names] = (names, {name: i for i, name in enumerate(names)})
+        self.player_names, self.seat = _SEATINGS[names]
+        self.envelope = len(self.player_names)
+        self.sizes = list(hand_sizes) + [len(CATEGORY_MASKS)]
+        num_owners = len(self.sizes)
+        self.has = [0] * num_owners
+        self.lacks = [0] * num_owners
+        # For each card, a bitmask of owners that could still hold it
+        self.candidates = [(1 << num_owners) - 1] * len(ALL_CARDS)
+        # Per owner, card masks the owner holds at least one of (a shared empty tuple until the first clause)
+        self.clauses: list = [()] * num_owners
+        self._queue = []  # pending (owner, card, holds) facts; order doesn't matter, propagation runs to a fixpoint
+
+    def copy(self) -> "DeductionEngine":
+        """Independent copy for lookahead; clause lists are replaced rather than mutated, so they can be shared."""
+        other = DeductionEngine.__new__(DeductionEngine)
+        other.player_names, other.seat, other.envelope, other.sizes = self.player_names, self.seat, self.envelope, self.sizes
+        other.has, other.lacks, other.candidates, other.clauses = self.has[:], self.lacks[:], self.candidates[:], self.clauses[:]
+        other._queue = []
+        return other
+
+    # --- observations -------------------------------------------------
+
+    def learn_hand(self, name: str, cards: list[str]) -> int:
+        """A player's complete hand is known (normally our own)."""
+        owner = self.seat[name]
+        hand = mask_of(cards)
+        for i in range(len(ALL_CARDS)):
+            self._queue.append((owner, i, bool(hand >> i & 1)))
+        return self._propagate()
+
+    def learn_has(self, name: str, card: str) -> int:
+        """A player was seen to hold a card."""
+        self._queue.append((self.seat[name], CARD_BITS[card].bit_length() - 1, True))
+        return self._propagate()
+
+    def record_suggestion(self, suggester: str, suggestion: tuple[str, str, str], refuter: str | None, card_shown: str | None = None) -> int:
+        """Apply the outcome of anyone's suggestion, returns how many new facts were deduced."""
+        suggestion_mask = mask_of(suggestion)
+        start = self.seat[suggester]
+        num_players = len(self.player_names)
+        # Everyone asked before the refuter (or everyone, if nobody refuted) lacks all three cards
+        for step in range(1, num_players):
+            owner = (start + step) % num_players
+            if self.player_names[owner] == refuter:
+                break
+            self._queue_lacks(owner, suggestion_mask)
+        if refuter is not None:
+            owner = self.seat[refuter]
+            if card_shown is not None:
+                self._queue.append((owner, CARD_BITS[card_shown].bit_length() - 1, True))
+            else:
+                self._add_clause(owner, suggestion_mask)
+        return self._propagate()
+
+    # --- queries ------------------------------------------------------
+
+    def solution_mask(self) -> int:
+        """Cards that could still be in the envelope."""
+        return FULL_MASK & ~self.lacks[self.envelope]
+
+    def has_mask(self, name: str) -> int:
+        return self.has[self.seat[name]]
+
+    def lacks_mask(self, name: str) -> int:
+        return self.lacks[self.seat[name]]
+
+    def is_solved(self) -> bool:
+        return all(is_single(self.solution_mask() & mask) for mask in CATEGORY_MASKS.values())
+
+    # --- propagation --------------------------------------------------
+
+    def _queue_lacks(self, owner: int, mask: int):
+        while mask:
+            low = mask & -mask
+            self._queue.append((owner, low.bit_length() - 1, False))
+            mask ^= low
+
+    def _queue_has(self, owner: int, mask: int):
+        while mask:
+            low = mask & -mask
+            self._queue.append((owner, low.bit_length() - 1, True))
+            mask ^= low
+
+    def _add_clause(self, owner: int, mask: int):
+        if self.has[owner] & mask:
+            return  # already satisfied
+        mask &= ~self.lacks[owner]
+        if not mask:
+            raise ContradictionError(f"{self.player_names[owner]} cannot hold any of the refuted cards")
+        if is_single(mask):
+            self._queue_has(owner, mask)
+        else:
+            self.clauses[owner] = [*self.clauses[owner], mask]
+
+    def _propagate(self) -> int:
+        learned = 0
+        queue = self._queue
+        while queue:
+            owner, card, holds = queue.pop()
+            bit = 1 << card
+            if holds:
+                if self.has[owner] & bit:
+                    continue
+                if self.lacks[owner] & bit:
+                    raise ContradictionError(f"{ALL_CARDS[card]} is already known not to be held there")
+                self.has[owner] |= bit
+                learned += 1
+                # Nobody else can hold it
+                others = self.candidates[card] & ~(1 << owner)
+                while others:
+                    low = others & -others
+                    queue.append((low.bit_length() - 1, card, False))
+                    others ^= low
+                # Envelope has one card per category
+                if owner == self.envelope:
+                    self._queue_lacks(owner, CARD_CATEGORY_MASK[card] & ~bit & ~self.lacks[owner])
+                # Hand is full, everything else is lacked
+                if self.has[owner].bit_count() == self.sizes[owner]:
+                    self._queue_lacks(owner, FULL_MASK & ~self.has[owner] & ~self.lacks[owner])
+                # Drop clauses this satisfies
+                if self.clauses[owner]:
+                    self.clauses[owner] = [clause for clause in self.clauses[owner] if not clause & bit]
+            else:
+                if self.lacks[owner] & bit:
+                    continue
+                if self.has[owner] & bit:
+                    raise ContradictionError(f"{ALL_CARDS[card]} is already known to be held there")
+                self.lacks[owner] |= bit
+                learned += 1
+                # Only one place left for this card
+                self.candidates[card] &= ~(1 << owner)
+                remaining = self.candidates[card]
+                if not remaining:
+                    raise ContradictionError(f"{ALL_CARDS[card]} has no possible owner")
+                if is_single(remaining):
+                    queue.append((remaining.bit_length() - 1, card, True))
+                # Only one candidate left in this envelope category, or just enough cards left to fill the hand
+                open_cards = FULL_MASK & ~self.lacks[owner]
+                if owner == self.envelope:
+                    category_left = open_cards & CARD_CATEGORY_MASK[card]
+                    if is_single(category_left):
+                        queue.append((owner, category_left.bit_length() - 1, True))
+                elif open_cards.bit_count() == self.sizes[owner]:
+                    self._queue_has(owner, open_cards & ~self.has[owner])
+                # Shrink clauses that mentioned the card
+                if self.clauses[owner]:
+                    kept = []
+                    for clause in self.clauses[owner]:
+                        if clause & bit:
+                            clause &= ~bit
+                            if not clause:
+                                raise ContradictionError(f"{self.player_names[owner]} cannot satisfy a refutation")
+                            if is_single(clause):
+                                queue.append((owner, clause.bit_length() - 1, True))
+                                continue
+                        kept.append(clause)
+                    self.clauses[owner] = kept
+        return learned
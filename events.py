@@ -0,0 +1,115 @@
+#game event stream with a compact binary encoding, cards and players are stored as small ids instead of names
+#layout: MAGIC, version byte, then one kind byte + fixed size payload per event
+import struct
+
+from cards import ALL_CARDS, CARD_INDEX
+
+MAGIC = b"CLEV"
+VERSION = 1
+NONE_ID = 255 #no player / unknown card
+SEED_LIMIT = 1 << 64 #seeds are stored unsigned in 8 bytes
+
+#event kinds
+START = 0       #num_players, ai seat bitmask, seed
+DEAL = 1        #solution card ids, then holder seat per card (NONE_ID for the envelope)
+ROLL = 2        #seat, value
+MOVE = 3        #seat, x, y
+SUGGESTION = 4  #seat, character id, weapon id, room id
+REFUTATION = 5  #suggester seat, refuter seat, card shown id
+ACCUSATION = 6  #seat, character id, weapon id, room id, correct
+
+FORMATS = {
+    START: struct.Struct("<BBQ"),
+    DEAL: struct.Struct(f"<3B{len(ALL_CARDS)}B"),
+    ROLL: struct.Struct("<BB"),
+    MOVE: struct.Struct("<BHH"),
+    SUGGESTION: struct.Struct("<BBBB"),
+    REFUTATION: struct.Struct("<BBB"),
+    ACCUSATION: struct.Struct("<BBBBB"),
+}
+_HEADER = struct.Struct("<4sB")
+_LENGTH = struct.Struct("<I")
+
+
+def card_id(card: str | None) -> int:
+    #typo'd human input has no id
+    return CARD_INDEX.get(card, NONE_ID)
+
+
+def card_name(card: int) -> str | None:
+    return ALL_CARDS[card] if card != NONE_ID else None
+
+
+class EventLog:
+    # In-memory list of (kind, payload tuple) events for one game.
+
+    def __init__(self, events: list[tuple[int, tuple]] | None = None):
+        self.events = events if events is not None else []
+
+    def __len__(self):
+        return len(self.events)
+
+    def __eq__(self, other):
+        return isinstance(other, EventLog) and self.events == other.events
+
+    def start(self, num_players: int, ai_seats, seed: int):
+        ai_mask = sum(1 << seat for seat in ai_seats)
+        self.events.append((START, (num_players, ai_mask, seed)))
+
+    def deal(self, solution: tuple[str, str, str], card_holder: dict[str, int]):
+        holders = tuple(card_holder.get(card, NONE_ID) for card in ALL_CARDS)
+        self.events.append((DEAL, tuple(card_id(card) for card in solution) + holders))
+
+    def roll(self, seat: int, value: int):
+        self.events.append((ROLL, (seat, value)))
+
+    def move(self, seat: int, position: tuple[int, int]):
+        self.events.append((MOVE, (seat, *position)))
+
+    def suggestion(self, seat: int, suggestion: tuple[str, str, str]):
+        self.events.append((SUGGESTION, (seat, *(card_id(card) for card in suggestion))))
+
+    def refutation(self, suggester: int, refuter: int | None, card_shown: str | None):
+        self.events.append((REFUTATION, (suggester, NONE_ID if refuter is None else refuter, card_id(card_shown))))
+
+    def accusation(self, seat: int, accusation: tuple[str, str, str], correct: bool):
+        self.events.append((ACCUSATION, (seat, *(card_id(card) for card in accusation), int(correct))))
+
+    def to_bytes(self) -> bytes:
+        parts = [_HEADER.pack(MAGIC, VERSION)]
+        for kind, payload in self.events:
+            parts.append(bytes((kind,)))
+            parts.append(FORMATS[kind].pack(*payload))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "EventLog":
+        magic, version = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a cluedo event log (or unsupported version)")
+        events = []
+        offset = _HEADER.size
+        end = len(data)
+        while offset < end:
+            kind = data[offset]
+            fmt = FORMATS[kind]
+            events.append((kind, fmt.unpack_from(data, offset + 1)))
+            offset += 1 + fmt.size
+        return cls(events)
+
+
+def append_to_archive(file, log: EventLog):
+    """Append one game to an open binary archive file (length-prefixed records)."""
+    data = log.to_bytes()
+    file.write(_LENGTH.pack(len(data)))
+    file.write(data)
+
+
+def read_archive(file):
+    """Yield every EventLog stored in an open binary archive file."""
+    while True:
+        prefix = file.read(_LENGTH.size)
+        if not prefix:
+            return
+        (length,) = _LENGTH.unpack(prefix)
+        yield EventLog.from_bytes(file.read(length))
@@ -0,0 +1,131 @@
+#pluggable output for the game loop, every message the engine produces goes through one of these sinks instead of print
+#messages are str.format templates with their arguments, and nothing is formatted unless the sink wants that level,
+#so a silent batch run pays for a method call per message and nothing else
+import json
+import sys
+import time
+
+DEBUG = 10 #ai reasoning and the presentation hand dump, private to the seat
+INFO = 20 #what everyone at the table sees
+SILENT = 100 #above every level, nothing is emitted
+LEVEL_NAMES = {DEBUG: "debug", INFO: "info"}
+DEFAULT_BATCH_LINES = 64 #console lines buffered before a write
+
+
+def _render(message: str, args: tuple) -> str:
+    return message.format(*args) if args else message
+
+
+class Sink:
+    # Base sink: subclasses implement _emit(level, message, args) and optionally flush().
+
+    level = DEBUG
+
+    def enabled(self, level: int) -> bool:
+        """Whether a message at this level would be emitted, for callers that build expensive arguments."""
+        return level >= self.level
+
+    def debug(self, message: str, *args):
+        if DEBUG >= self.level:
+            self._emit(DEBUG, message, args)
+
+    def info(self, message: str, *args):
+        if INFO >= self.level:
+            self._emit(INFO, message, args)
+
+    def _emit(self, level: int, message: str, args: tuple):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+
+class NullSink(Sink):
+    # Drops everything, for headless runs.
+    level = SILENT
+
+    def debug(self, message: str, *args):
+        pass
+
+    def info(self, message: str, *args):
+        pass
+
+
+NULL = NullSink() #stateless, shared by every silent game
+
+
+class ConsoleSink(Sink):
+    # Formats enabled messages and writes them to a stream in batches; flush() before anything reads from the terminal.
+    # The stream defaults to whatever sys.stdout is at write time. flush() hands the lines to the stream like print
+    # would (input() flushes stdout itself), close() flushes the stream too.
+    # debug/info are inlined, the interactive game logs tens of messages per turn.
+
+    def __init__(self, level: int = DEBUG, stream=None, batch_lines: int = DEFAULT_BATCH_LINES):
+        self.level = level
+        self.stream = stream
+        self.batch_lines = max(1, batch_lines)
+        self._lines: list[str] = []
+
+    def debug(self, message: str, *args):
+        if DEBUG >= self.level:
+            lines = self._lines
+            lines.append(message.format(*args) if args else message)
+            if len(lines) >= self.batch_lines:
+                self.flush()
+
+    def info(self, message: str, *args):
+        if INFO >= self.level:
+            lines = self._lines
+            lines.append(message.format(*args) if args else message)
+            if len(lines) >= self.batch_lines:
+                self.flush()
+
+    def _emit(self, level: int, message: str, args: tuple):
+        self._lines.append(_render(message, args))
+        if len(self._lines) >= self.batch_lines:
+            self.flush()
+
+    def flush(self):
+        if self._lines:
+            stream = self.stream if self.stream is not None else sys.stdout
+            stream.write("\n".join(self._lines) + "\n")
+            self._lines = []
+
+    def close(self):
+        self.flush()
+        (self.stream if self.stream is not None else sys.stdout).flush()
+
+
+class JsonLinesSink(Sink):
+    # One JSON object per message: time, level, rendered text, and the template with its arguments for grouping.
+    # The stream is the caller's; close() flushes it but leaves it open.
+
+    def __init__(self, stream, level: int = DEBUG):
+        self.level = level
+        self.stream = stream
+
+    def _emit(self, level: int, message: str, args: tuple):
+        record = {"time": time.time(), "level": LEVEL_NAMES.get(level, level), "text": _render(message, args), "template": message, "args": args}
+        self.stream.write(json.dumps(record, separators=(",", ":"), default=str) + "\n")
+
+    def flush(self):
+        self.stream.flush()
+
+
+class BufferSink(Sink):
+    # Keeps rendered lines in memory until drained, e.g. to forward one engine call's output somewhere else.
+
+    def __init__(self, level: int = INFO):
+        self.level = level
+        self.lines: list[str] = []
+
+    def _emit(self, level: int, message: str, args: tuple):
+        self.lines.append(_render(message, args))
+
+    def drain(self) -> list[str]:
+        """Return the buffered lines and start over."""
+        lines, self.lines = self.lines, []
+        return lines
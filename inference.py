@@ -0,0 +1,144 @@
+#monte carlo inference for the ai, samples hidden deals that agree with everything the deduction engine knows
+#and uses them to estimate solution probabilities and pick the suggestion whose answer tells us the most
+import math
+import random
+import time
+from collections import defaultdict
+
+from cards import ALL_CARDS, CATEGORY_MASKS, cards_of
+
+DEFAULT_DECISION_BUDGET = 0.05 #seconds per suggestion decision
+DEFAULT_MAX_SAMPLES = 400 #stop early once this many consistent deals are drawn
+
+CATEGORY_CARDS = [[ALL_CARDS.index(card) for card in cards_of(mask)] for mask in CATEGORY_MASKS.values()]
+
+
+def sample_deals(engine, count: int = DEFAULT_MAX_SAMPLES, deadline: float | None = None, rng=random) -> list[list[int]]:
+    """Draw up to `count` deals consistent with the engine, each a list of owner indices per card (envelope == engine.envelope)."""
+    envelope = engine.envelope
+    num_cards = len(ALL_CARDS)
+    base = [-1] * num_cards
+    capacity = list(engine.sizes)
+    for owner, mask in enumerate(engine.has):
+        for card in range(num_cards):
+            if mask >> card & 1:
+                base[card] = owner
+        capacity[owner] -= mask.bit_count()
+    envelope_open = [[card for card in cards if base[card] == -1 and engine.candidates[card] >> envelope & 1] for cards in CATEGORY_CARDS]
+    envelope_needed = [not any(base[card] == envelope for card in cards) for cards in CATEGORY_CARDS]
+    free_cards = [card for card in range(num_cards) if base[card] == -1]
+    allowed = {card: [owner for owner in range(envelope) if engine.candidates[card] >> owner & 1] for card in free_cards}
+    clauses = [(owner, clause) for owner, owner_clauses in enumerate(engine.clauses) for clause in owner_clauses]
+
+    samples = []
+    attempts = 0
+    while len(samples) < count and attempts < count * 20:
+        attempts += 1
+        if deadline is not None and attempts % 16 == 0 and time.perf_counter() > deadline:
+            break
+        owner_of = base[:]
+        left = capacity[:]
+        # Envelope first, one open card per category that still needs one
+        for needed, options in zip(envelope_needed, envelope_open):
+            if needed:
+                owner_of[rng.choice(options)] = envelope
+        # Then the rest, each to an allowed player weighted by how many cards they still hold
+        order = [card for card in free_cards if owner_of[card] == -1]
+        rng.shuffle(order)
+        ok = True
+        for card in order:
+            choices = [owner for owner in allowed[card] if left[owner] > 0]
+            if not choices:
+                ok = False
+                break
+            owner = rng.choices(choices, weights=[left[o] for o in choices])[0]
+            owner_of[card] = owner
+            left[owner] -= 1
+        if not ok:
+            continue
+        # Refutations we didn't see must still be satisfiable
+        if all(any(owner_of[card] == owner for card in range(num_cards) if clause >> card & 1) for owner, clause in clauses):
+            samples.append(owner_of)
+    return samples
+
+
+def solution_probabilities(samples: list[list[int]], envelope: int) -> dict[str, float]:
+    """Fraction of sampled deals with each card in the envelope."""
+    if not samples:
+        return {}
+    counts = [0] * len(ALL_CARDS)
+    for owner_of in samples:
+        for card, owner in enumerate(owner_of):
+            if owner == envelope:
+                counts[card] += 1
+    return {card: counts[i] / len(samples) for i, card in enumerate(ALL_CARDS)}
+
+
+def information_gain(samples: list[list[int]], suggester: int, num_players: int, suggestion: tuple[int, int, int]) -> float:
+    """Entropy (bits) of what we would see after suggesting: who refutes and which card they show."""
+    outcomes = defaultdict(float)
+    for owner_of in samples:
+        best, best_distance = None, num_players
+        for card in suggestion:
+            owner = owner_of[card]
+            if owner < num_players:
+                distance = (owner - suggester) % num_players
+                if 0 < distance < best_distance:
+                    best, best_distance = owner, distance
+        if best is None:
+            outcomes[None] += 1.0
+            continue
+        shown = [card for card in suggestion if owner_of[card] == best]
+        for card in shown:
+            outcomes[(best, card)] += 1.0 / len(shown)
+    total = len(samples)
+    return -sum(weight / total * math.log2(weight / total) for weight in outcomes.values())
+
+
+def choose_informative_suggestion(engine, suggester: str, budget: float = DEFAULT_DECISION_BUDGET, max_samples: int = DEFAULT_MAX_SAMPLES, rng=None) -> tuple[str, str, str] | None:
+    """Suggestion with the highest expected information gain, found within `budget` seconds (anytime)."""
+    rng = rng if rng is not None else random
+    start = time.perf_counter()
+    deadline = start + budget
+    # Half the budget on sampling, the rest scoring candidates
+    samples = sample_deals(engine, max_samples, start + budget / 2, rng)
+    if not samples:
+        return None
+    probabilities = solution_probabilities(samples, engine.envelope)
+    options = [[ALL_CARDS.index(card) for card in cards_of(engine.solution_mask() & mask)] for mask in CATEGORY_MASKS.values()]
+    candidates = [(c, w, r) for c in options[0] for w in options[1] for r in options[2]]
+    if not candidates:
+        return None
+    # Most likely solutions first, so running out of time still leaves a sensible pick
+    candidates.sort(key=lambda triple: -sum(probabilities[ALL_CARDS[card]] for card in triple))
+    seat = engine.seat[suggester]
+    num_players = len(engine.player_names)
+    best, best_gain = candidates[0], -1.0
+    for triple in candidates:
+        gain = information_gain(samples, seat, num_players, triple)
+        if gain > best_gain:
+            best, best_gain = triple, gain
+        if time.perf_counter() > deadline:
+            break
+    return tuple(ALL_CARDS[card] for card in best)
+
+
+class SamplingStrategy:
+    # The information gain rule as a per-seat strategy (see Player.strategy), so seats at one table can think for different budgets.
+    # Accusations are left to the player's built-in rule (only when certain).
+    name = "sampling"
+
+    def __init__(self, budget: float = DEFAULT_DECISION_BUDGET, max_samples: int = DEFAULT_MAX_SAMPLES):
+        self.budget = budget
+        self.max_samples = max_samples
+
+    def choose_suggestion(self, player, rng=None) -> tuple[str, str, str] | None:
+        if player.deduction is None:
+            return None
+        return choose_informative_suggestion(player.deduction, player.name, self.budget, self.max_samples, rng)
+
+    def choose_accusation(self, player, rng=None) -> tuple[str, str, str] | None:
+        return None
+
+    def close(self):
+        pass
@@ -0,0 +1,440 @@
+#lockstep batch simulator, plays many ai-only games side by side with all of their state in flat columns instead of objects
+#every step advances each unfinished game by one turn: roll, move, suggest and refute run in a tight loop per game over those
+#columns, deduction is bit-parallel across the whole batch. a few times run_game's speed on one core, not orders of magnitude
+#the rules and random draws are the ones TurnManager.ai_play_turn uses, so game i plays out exactly like run_game(seed=seed + i)
+import argparse
+import random
+import sys
+import time
+from array import array
+
+from board import BOARD, UNREACHABLE
+from cards import ALL_CARDS, CARD_INDEX, CATEGORY_MASKS, CHARACTER_MASK, FULL_MASK, ROOM_MASK, WEAPON_MASK, is_single
+from configurations import CHARACTERS, ROOM_NAMES, WEAPONS
+from deduction import ContradictionError
+from simulation import DEFAULT_MAX_TURNS, GameResult, run_game, summarize
+
+NUM_CARDS = len(ALL_CARDS)
+CHARACTER_IDS = [CARD_INDEX[card] for card in CHARACTERS]
+WEAPON_IDS = [CARD_INDEX[card] for card in WEAPONS]
+ROOM_IDS = [CARD_INDEX[card] for card in ROOM_NAMES]
+NO_SEAT = 255 #holder of the envelope cards
+MAX_ROLL = 6
+DEFAULT_BATCH = 4096 #games per batch, a knowledge column is then a 16KB int
+FIELD_BITS = 32 #one card mask per game in every column, the top bit stays clear as a guard bit
+
+
+def _lowest(mask: int) -> int:
+    return (mask & -mask).bit_length() - 1
+
+
+class Fields:
+    # Bit-parallel ("SWAR") helpers for ints packed with one 32-bit field per game, the stdlib stand-in for a vector:
+    # &, |, +, - and shifts on the int work on every game at once. Flags are 0/1 per field, expand() widens them to masks.
+
+    def __init__(self, count: int):
+        self.count = count
+        self.ones = self.pack(array("I", [1]) * count)
+        self.guard = self.ones << (FIELD_BITS - 1)
+        self.below_guard = self.repeat((1 << (FIELD_BITS - 1)) - 1)
+        self.full = self.repeat(FULL_MASK)
+        self.categories = [self.repeat(mask) for mask in CATEGORY_MASKS.values()]
+        self._counts: dict[int, int] = {}
+        self._m1, self._m2, self._m4, self._m6 = (self.repeat(mask) for mask in (0x55555555, 0x33333333, 0x0F0F0F0F, 0x3F))
+
+    def pack(self, values: array) -> int:
+        return int.from_bytes(values.tobytes(), sys.byteorder)
+
+    def unpack(self, packed: int) -> array:
+        values = array("I")
+        values.frombytes(packed.to_bytes(self.count * 4, sys.byteorder))
+        return values
+
+    def repeat(self, value: int) -> int:
+        return self.ones * value
+
+    def nonzero(self, x: int) -> int:
+        return ((x + self.below_guard) & self.guard) >> (FIELD_BITS - 1)
+
+    def expand(self, flags: int) -> int:
+        return (flags << FIELD_BITS) - flags
+
+    def single(self, x: int) -> int:
+        """Flags the fields holding exactly one card."""
+        below = ((x | self.guard) - self.ones) & self.below_guard  # x - 1 per field, the guard bit stops borrows
+        return self.nonzero(x) & ~self.nonzero(x & below)
+
+    def count_equals(self, x: int, value: int) -> int:
+        """Flags the fields with exactly `value` cards set."""
+        x -= (x >> 1) & self._m1
+        x = (x & self._m2) + ((x >> 2) & self._m2)
+        x = (x + (x >> 4)) & self._m4
+        x += x >> 8
+        x = (x + (x >> 16)) & self._m6
+        if value not in self._counts:
+            self._counts[value] = self.repeat(value)
+        return self.ones & ~self.nonzero(x ^ self._counts[value])
+
+
+class MoveTables:
+    # Board lookups for the ai walk, flattened so a move is a couple of indexes:
+    #   room_of[cell] -> room card id or -1
+    #   dist[room][cell] -> steps to the room (card ids index the outer list)
+    #   reach[room][cell * (MAX_ROLL + 1) + roll] -> cell reached by Board.path_towards after walking up to roll steps
+
+    def __init__(self, board=BOARD):
+        self.room_of = [CARD_INDEX[room] if room is not None else -1 for room in board.cells]
+        self.start_cell = {name: y * board.width + x for name, (x, y) in board.starts.items()}
+        self.room_cell = {CARD_INDEX[room]: tiles[0][1] * board.width + tiles[0][0] for room, tiles in board.rooms.items()}
+        self.dist = [None] * NUM_CARDS
+        self.reach = [None] * NUM_CARDS
+        for room, dist in board.distances.items():
+            card = CARD_INDEX[room]
+            self.dist[card] = dist
+            reach = []
+            for cell in range(len(board.cells)):
+                reach.append(cell)
+                for _ in range(MAX_ROLL):
+                    if 0 < dist[cell] < UNREACHABLE:
+                        cell = next(other for other in board.neighbours[cell] if dist[other] == dist[cell] - 1)
+                    reach.append(cell)
+            self.reach[card] = reach
+
+
+class LockstepBatch:
+    # One batch of all-AI games. Games are "lanes", finished lanes are dropped as the batch goes on.
+    # Per lane: rngs, solution (mask), holder[lane * NUM_CARDS + card] (seat, NO_SEAT for the envelope), eliminated (seat mask)
+    # Per lane and seat, at [lane * P + seat]: position (board cell), visited (mask of rooms already suggested)
+    # Knowledge, one column per (viewer, owner) with a field per lane, the envelope is owner P:
+    #   has[viewer][owner], lacks[viewer][owner], clauses[viewer][owner] -> columns of "holds one of these" masks
+    # Every lane is on the same turn, so the seat to play is the same across the batch.
+    # The deduction rules are the ones deduction.DeductionEngine applies fact by fact, run here as whole-column passes.
+
+    def __init__(self, num_games: int, num_players: int = 6, seed: int = 0, tables: MoveTables | None = None):
+        if not 2 <= num_players <= 6:
+            raise ValueError("num_players must be between 2 and 6")
+        self.num_players = num_players
+        self.seed = seed
+        self.tables = tables or MoveTables()
+        dealt = NUM_CARDS - 3
+        self.sizes = [dealt // num_players + (seat < dealt % num_players) for seat in range(num_players)] + [3]
+        self.turn = 0
+        self.games = list(range(num_games))  # game index of each lane
+        self.results: list[GameResult | None] = [None] * num_games
+        self.fields = Fields(num_games)
+        self.rngs = [random.Random(seed + game) for game in self.games]
+        self.solution = [0] * num_games
+        self.holder = array("B", [NO_SEAT]) * (num_games * NUM_CARDS)
+        self.position = array("H", [self.tables.start_cell[CHARACTERS[seat]] for seat in range(num_players)] * num_games)
+        self.visited = array("I", [0]) * (num_games * num_players)
+        self.eliminated = array("B", [0]) * num_games
+        self.done = bytearray(num_games)  # finished lanes sit idle until the next compaction
+        owners = range(num_players + 1)
+        self.has = [[0 for _ in owners] for _ in range(num_players)]
+        self.lacks = [[0 for _ in owners] for _ in range(num_players)]
+        self.clauses = [[[] for _ in owners] for _ in range(num_players)]
+        self.envelope_lacks: list[array] = []  # lacks[viewer][envelope] unpacked, for the per-lane turn logic
+        self._deal()
+
+    # --- setup ---------------------------------------------------------
+
+    def _deal(self):
+        #same draws as CluedoGame.select_solution and deal_cards
+        num_players = self.num_players
+        hands = [array("I", [0]) * self.fields.count for _ in range(num_players)]
+        for lane, rng in enumerate(self.rngs):
+            solution = (rng.choice(CHARACTER_IDS), rng.choice(WEAPON_IDS), rng.choice(ROOM_IDS))
+            self.solution[lane] = 1 << solution[0] | 1 << solution[1] | 1 << solution[2]
+            deck = [card for card in range(NUM_CARDS) if card not in solution]
+            rng.shuffle(deck)
+            for i, card in enumerate(deck):
+                seat = i % num_players
+                self.holder[lane * NUM_CARDS + card] = seat
+                hands[seat][lane] |= 1 << card
+        for seat in range(num_players):
+            hand = self.fields.pack(hands[seat])
+            self.has[seat][seat] = hand
+            self.lacks[seat][seat] = self.fields.full & ~hand
+        self._deduce()
+
+    # --- deduction -----------------------------------------------------
+
+    def _deduce(self):
+        for viewer in range(self.num_players):
+            self._close(viewer)
+        self.envelope_lacks = [self.fields.unpack(self.lacks[viewer][self.num_players]) for viewer in range(self.num_players)]
+
+    def _close(self, viewer: int):
+        #one viewer's knowledge in every lane, rules repeated until nothing changes:
+        #  a held card is lacked by everyone else, a card everyone else lacks is held
+        #  the envelope holds one card per category, a full hand lacks the rest, a hand with just enough open cards holds them
+        #  "holds one of" clauses drop once satisfied and resolve when down to one card
+        #updates are visible to the owners after them in the same pass, the last pass just confirms nothing moved
+        fields = self.fields
+        full = fields.full
+        envelope = self.num_players
+        has, lacks, clauses = self.has[viewer], self.lacks[viewer], self.clauses[viewer]
+        settled = [False] * (envelope + 1)  # the owner's own rules had nothing to add to its current columns
+        changed = True
+        while changed:
+            changed = False
+            held = 0
+            for column in has:
+                held |= column
+            # suffix[o] is the cards lacked by owners o onwards, so prefix & suffix[o + 1] is what everyone but o lacks
+            suffix = [full] * (envelope + 2)
+            for owner in range(envelope, -1, -1):
+                suffix[owner] = suffix[owner + 1] & lacks[owner]
+            if suffix[0]:
+                raise ContradictionError("a card has no possible owner")
+            prefix = full
+            for owner in range(envelope + 1):
+                owner_has, owner_lacks = has[owner], lacks[owner]
+                new_has = owner_has | prefix & suffix[owner + 1]
+                new_lacks = owner_lacks | held & ~owner_has
+                if settled[owner] and new_has == owner_has and new_lacks == owner_lacks:
+                    prefix &= new_lacks
+                    continue
+                crossed = (new_has, new_lacks)
+                if owner == envelope:
+                    for category in fields.categories:
+                        new_lacks |= fields.expand(fields.nonzero(new_has & category)) & category & ~new_has
+                        open_cards = category & ~new_lacks
+                        new_has |= fields.expand(fields.single(open_cards)) & open_cards
+                else:
+                    size = self.sizes[owner]
+                    new_lacks |= fields.expand(fields.count_equals(new_has, size)) & full & ~new_has
+                    open_cards = full & ~new_lacks
+                    new_has |= fields.expand(fields.count_equals(open_cards, size)) & open_cards
+                    if clauses[owner]:
+                        kept = []
+                        for column in clauses[owner]:
+                            column &= ~new_lacks & ~fields.expand(fields.nonzero(column & new_has))
+                            new_has |= column & fields.expand(fields.single(column))
+                            if column:
+                                kept.append(column)
+                        clauses[owner] = kept
+                if new_has & new_lacks:
+                    raise ContradictionError("a card is both held and lacked")
+                settled[owner] = (new_has, new_lacks) == crossed
+                prefix &= new_lacks
+                held |= new_has
+                if new_has != owner_has or new_lacks != owner_lacks:
+                    has[owner], lacks[owner] = new_has, new_lacks
+                    changed = True
+
+    def _add_clauses(self, viewer: int, owner: int, new: int):
+        #first fit per lane into the existing clause columns, skipping clauses a lane already has
+        fields = self.fields
+        columns = self.clauses[viewer][owner]
+        for column in columns:
+            new &= ~fields.expand(fields.ones & ~fields.nonzero(column ^ new))
+        for i, column in enumerate(columns):
+            if not new:
+                return
+            taken = fields.expand(fields.nonzero(column))
+            columns[i] = column | new & ~taken
+            new &= taken
+        if new:
+            columns.append(new)
+
+    def solution_mask(self, lane: int, seat: int) -> int:
+        """Cards the seat still thinks could be in the envelope (Player.possible_mask)."""
+        return FULL_MASK & ~self.envelope_lacks[seat][lane]
+
+    # --- turns ---------------------------------------------------------
+
+    def step(self) -> int:
+        """Play one turn in every unfinished game, returns how many are still running."""
+        num_players = self.num_players
+        seat = self.turn % num_players
+        tables = self.tables
+        room_of, dist, reach = tables.room_of, tables.dist, tables.reach
+        position, visited, holder, rngs = self.position, self.visited, self.holder, self.rngs
+        count = self.fields.count
+        envelope_lacks = self.envelope_lacks[seat]
+        lacks_delta: list[array | None] = [None] * num_players  # public: players passed over lack all three cards
+        shown_delta: list[array | None] = [None] * num_players  # the suggester sees the card
+        clause_delta: list[array | None] = [None] * num_players  # everyone else learns the refuter holds one of them
+        suggested = []
+
+        for lane in range(count):
+            if self.done[lane] or self.eliminated[lane] >> seat & 1:
+                continue
+            index = lane * num_players + seat
+            cell = position[index]
+
+            # Hallway: roll and head for the possible (preferably unsuggested) room that leaves the least walking
+            if room_of[cell] < 0:
+                roll = rngs[lane].randint(1, MAX_ROLL)
+                rooms = FULL_MASK & ~envelope_lacks[lane] & ROOM_MASK
+                if rooms & ~visited[index]:
+                    rooms &= ~visited[index]
+                target, best_key = -1, None
+                while rooms:
+                    room = _lowest(rooms)
+                    rooms &= rooms - 1
+                    steps = dist[room][cell]
+                    if steps == UNREACHABLE:
+                        continue
+                    key = (max(0, steps - roll), steps)
+                    if best_key is None or key < best_key:
+                        target, best_key = room, key
+                if target < 0:
+                    continue
+                cell = reach[target][cell * (MAX_ROLL + 1) + roll]
+                position[index] = cell
+                if room_of[cell] < 0:
+                    continue
+
+            # Suggestion: lowest possible card per category, the named character is pulled into the room
+            suggested.append(lane)
+            possible = FULL_MASK & ~envelope_lacks[lane]
+            if not possible & CHARACTER_MASK or not possible & WEAPON_MASK or not possible & ROOM_MASK:
+                continue
+            char, weapon, room = _lowest(possible & CHARACTER_MASK), _lowest(possible & WEAPON_MASK), _lowest(possible & ROOM_MASK)
+            if char < num_players and char != seat:
+                position[lane * num_players + char] = tables.room_cell[room]
+            visited[index] |= 1 << room
+            mask = 1 << char | 1 << weapon | 1 << room
+
+            # Refutation: first seat clockwise holding any of the cards
+            base = lane * NUM_CARDS
+            refuter, nearest = NO_SEAT, num_players
+            for card in (char, weapon, room):
+                owner = holder[base + card]
+                if owner != NO_SEAT and 0 < (owner - seat) % num_players < nearest:
+                    refuter, nearest = owner, (owner - seat) % num_players
+            for step in range(1, nearest):
+                owner = (seat + step) % num_players
+                if lacks_delta[owner] is None:
+                    lacks_delta[owner] = array("I", [0]) * count
+                lacks_delta[owner][lane] = mask
+            if refuter != NO_SEAT:
+                shown = rngs[lane].choice([card for card in (char, weapon, room) if holder[base + card] == refuter])
+                if shown_delta[refuter] is None:
+                    shown_delta[refuter] = array("I", [0]) * count
+                    clause_delta[refuter] = array("I", [0]) * count
+                shown_delta[refuter][lane] = 1 << shown
+                clause_delta[refuter][lane] = mask
+
+        # Deduction: every seat's knowledge, a column at a time
+        fields = self.fields
+        for owner in range(num_players):
+            if lacks_delta[owner] is not None:
+                packed = fields.pack(lacks_delta[owner])
+                for viewer in range(num_players):
+                    self.lacks[viewer][owner] |= packed
+            if shown_delta[owner] is not None:
+                self.has[seat][owner] |= fields.pack(shown_delta[owner])
+                packed = fields.pack(clause_delta[owner])
+                for viewer in range(num_players):
+                    if viewer != seat:
+                        self._add_clauses(viewer, owner, packed)
+        if suggested:
+            self._deduce()
+
+        # Accusation once every category is down to one card
+        envelope_lacks = self.envelope_lacks[seat]
+        winners = set()
+        for lane in suggested:
+            possible = FULL_MASK & ~envelope_lacks[lane]
+            if not (is_single(possible & CHARACTER_MASK) and is_single(possible & WEAPON_MASK) and is_single(possible & ROOM_MASK)):
+                continue
+            if possible == self.solution[lane]:
+                winners.add(lane)
+            else:
+                self.eliminated[lane] |= 1 << seat
+
+        self.turn += 1
+        everyone = (1 << num_players) - 1
+        for lane in suggested:
+            if lane in winners or self.eliminated[lane] == everyone:
+                self._finish(lane, CHARACTERS[seat] if lane in winners else None)
+        running = self.done.count(0)
+        if running <= count // 2:
+            self._keep([lane for lane in range(count) if not self.done[lane]])
+        return running
+
+    def _finish(self, lane: int, winner: str | None):
+        self.done[lane] = 1
+        game = self.games[lane]
+        self.results[game] = GameResult(
+            seed=self.seed + game,
+            winner=winner,
+            turns=self.turn,
+            eliminated=tuple(CHARACTERS[seat] for seat in range(self.num_players) if self.eliminated[lane] >> seat & 1),
+            solution=tuple(ALL_CARDS[_lowest(self.solution[lane] & mask)] for mask in CATEGORY_MASKS.values()),
+        )
+
+    def _keep(self, lanes: list[int]):
+        #drop finished lanes from every column, done once half the batch has finished so later steps only pay for running games
+        old, new = self.fields, Fields(len(lanes))
+        num_players = self.num_players
+
+        def select(column: int) -> int:
+            values = old.unpack(column)
+            return new.pack(array("I", [values[lane] for lane in lanes]))
+
+        self.games = [self.games[lane] for lane in lanes]
+        self.rngs = [self.rngs[lane] for lane in lanes]
+        self.solution = [self.solution[lane] for lane in lanes]
+        self.eliminated = array("B", [self.eliminated[lane] for lane in lanes])
+        self.done = bytearray(len(lanes))
+        self.holder = array("B", b"".join(self.holder[lane * NUM_CARDS:(lane + 1) * NUM_CARDS].tobytes() for lane in lanes))
+        self.position = array("H", [self.position[lane * num_players + seat] for lane in lanes for seat in range(num_players)])
+        self.visited = array("I", [self.visited[lane * num_players + seat] for lane in lanes for seat in range(num_players)])
+        for viewer in range(num_players):
+            for owner in range(num_players + 1):
+                self.has[viewer][owner] = select(self.has[viewer][owner])
+                self.lacks[viewer][owner] = select(self.lacks[viewer][owner])
+                self.clauses[viewer][owner] = [column for column in map(select, self.clauses[viewer][owner]) if column]
+            self.envelope_lacks[viewer] = array("I", [self.envelope_lacks[viewer][lane] for lane in lanes])
+        self.fields = new
+
+    def run(self, max_turns: int | None = DEFAULT_MAX_TURNS) -> list[GameResult]:
+        """Play until every game ends or max_turns is reached; unfinished games are reported with no winner."""
+        while 0 in self.done and (max_turns is None or self.turn < max_turns):
+            self.step()
+        for lane in range(len(self.games)):
+            if not self.done[lane]:
+                self._finish(lane, None)
+        return self.results
+
+
+def simulate_lockstep(num_games: int, num_players: int = 6, seed: int = 0, max_turns: int | None = DEFAULT_MAX_TURNS, batch: int = DEFAULT_BATCH) -> list[GameResult]:
+    """Play num_games all-AI games in lockstep batches, game i is seeded with seed + i like simulation.simulate_games."""
+    tables = MoveTables()
+    results = []
+    for start in range(0, num_games, batch):
+        results.extend(LockstepBatch(min(batch, num_games - start), num_players, seed + start, tables).run(max_turns))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless AI-vs-AI Cluedo games in lockstep batches.")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--players", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+    parser.add_argument("--batch", type=int, default=DEFAULT_BATCH, help="games advanced together")
+    parser.add_argument("--verify", type=int, default=0, metavar="N", help="replay the first N games with the object engine and compare")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = simulate_lockstep(args.games, args.players, args.seed, args.max_turns, args.batch)
+    elapsed = time.perf_counter() - start
+
+    stats = summarize(results)
+    print(f"Played {stats['games']} games in {elapsed:.2f}s ({stats['games'] / elapsed:.1f} games/sec)")
+    print(f"Finished: {stats['finished']}, mean turns: {stats['mean_turns']:.1f}, mean eliminated: {stats['mean_eliminated']:.2f}")
+    for name, wins in sorted(stats["wins"].items(), key=lambda item: -item[1]):
+        print(f"  {name}: {wins} wins")
+
+    if args.verify:
+        mismatched = [r.seed for r in results[:args.verify] if r != run_game(args.players, r.seed, args.max_turns)]
+        print(f"Verified {min(args.verify, len(results))} games against run_game: {len(mismatched)} mismatch(es) {mismatched[:10] if mismatched else ''}")
+
+
+if __name__ == "__main__":
+    main()
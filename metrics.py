@@ -0,0 +1,69 @@
+#opt-in per-phase turn metrics, wall and cpu time per phase plus simple counters
+#TurnManager only touches this when it was given a registry, so disabled runs pay a single None check per phase
+import contextlib
+import cProfile
+import io
+import pstats
+import time
+
+PHASES = ("roll", "movement", "suggestion", "refutation", "knowledge", "accusation")
+
+
+class Metrics:
+    # In-process registry: phase -> [calls, wall seconds, cpu seconds], counter -> int
+
+    def __init__(self):
+        self.timings: dict[str, list] = {}
+        self.counters: dict[str, int] = {}
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            entry = self.timings.setdefault(name, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += time.perf_counter() - wall
+            entry[2] += time.process_time() - cpu
+
+    def count(self, name: str, amount: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def merge(self, other: "Metrics"):
+        """Fold another registry into this one, e.g. from a worker process."""
+        for name, (calls, wall, cpu) in other.timings.items():
+            entry = self.timings.setdefault(name, [0, 0.0, 0.0])
+            entry[0] += calls
+            entry[1] += wall
+            entry[2] += cpu
+        for name, amount in other.counters.items():
+            self.count(name, amount)
+
+    def snapshot(self) -> dict:
+        return {
+            "phases": {name: {"calls": calls, "wall_s": wall, "cpu_s": cpu} for name, (calls, wall, cpu) in self.timings.items()},
+            "counters": dict(self.counters),
+        }
+
+    def report(self) -> str:
+        lines = [f"{'phase':12} {'calls':>8} {'wall ms':>10} {'cpu ms':>10} {'avg us':>10}"]
+        for name in sorted(self.timings, key=lambda n: PHASES.index(n) if n in PHASES else len(PHASES)):
+            calls, wall, cpu = self.timings[name]
+            lines.append(f"{name:12} {calls:>8} {wall * 1000:>10.2f} {cpu * 1000:>10.2f} {wall / calls * 1e6 if calls else 0:>10.1f}")
+        for name, amount in sorted(self.counters.items()):
+            lines.append(f"{name:12} {amount:>8}")
+        return "\n".join(lines)
+
+
+def profile_run(manager, max_turns=None, sort: str = "cumulative", limit: int = 25) -> str:
+    """Play one game under cProfile and return the formatted stats."""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        manager.run(max_turns)
+    finally:
+        profiler.disable()
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats(sort).print_stats(limit)
+    return out.getvalue()
@@ -1,39 +1,171 @@
-from configurations import CHARACTERS, WEAPONS, ROOM_NAMES
+from array import array
+
+from deduction import DeductionEngine
+from gamelog import NULL
+from inference import choose_informative_suggestion
+from cards import ALL_CARDS, CARD_BITS, CARD_INDEX, CATEGORIES, CATEGORY_MASKS, FULL_MASK, cards_of, is_single, lowest_card, mask_of
+from configurations import CHARACTERS
+
+_NO_ID = 255  # no refuter
+_UNPACKED = 254  # entry with a name that has no id (typo'd human input), kept as a plain tuple on the side
+_PLAYER_INDEX = {name: i for i, name in enumerate(CHARACTERS)}
+_REFUTERS = {**dict(enumerate(CHARACTERS)), _NO_ID: None}
+
+
+class SuggestionHistory:
+    # Packed list of (character, weapon, room, refuter) suggestions, 4 bytes per entry:
+    # card ids from cards.py and the refuter's character index. Reads back as tuples of names.
+    # `rooms` is the mask of rooms suggested in so far, kept as entries come in so the AI never unpacks the list to ask.
+    __slots__ = ("_data", "_extra", "rooms")
+
+    def __init__(self, entries=()):
+        self._data = array("B")
+        self._extra = None  # index -> raw tuple, only created if needed
+        self.rooms = 0
+        for entry in entries:
+            self.append(entry)
+
+    def append(self, entry):
+        char, weap, room, refuter = entry
+        self.rooms |= CARD_BITS.get(room, 0)
+        ids = (CARD_INDEX.get(char), CARD_INDEX.get(weap), CARD_INDEX.get(room), _NO_ID if refuter is None else _PLAYER_INDEX.get(refuter))
+        if None in ids:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[len(self)] = tuple(entry)
+            ids = (_UNPACKED,) * 4
+        self._data.extend(ids)
+
+    def _unpack(self, index):
+        data = self._data
+        offset = index * 4
+        if data[offset] == _UNPACKED:
+            return self._extra[index]
+        refuter = data[offset + 3]
+        return (ALL_CARDS[data[offset]], ALL_CARDS[data[offset + 1]], ALL_CARDS[data[offset + 2]], None if refuter == _NO_ID else CHARACTERS[refuter])
+
+    def __len__(self):
+        return len(self._data) // 4
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._unpack(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("suggestion history index out of range")
+        return self._unpack(index)
+
+    def __iter__(self):
+        if self._extra:
+            for index in range(len(self)):
+                yield self._unpack(index)
+            return
+        #strided slices through map/zip keep the whole unpack in C
+        data, card = self._data, ALL_CARDS.__getitem__
+        yield from zip(map(card, data[0::4]), map(card, data[1::4]), map(card, data[2::4]), map(_REFUTERS.__getitem__, data[3::4]))
+
+    def __eq__(self, other):
+        #packed bytes compare directly, otherwise entry by entry without building either list
+        if isinstance(other, SuggestionHistory) and not self._extra and not other._extra:
+            return self._data == other._data
+        if not isinstance(other, (SuggestionHistory, list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and all(mine == theirs for mine, theirs in zip(self, other))
+
+    def __repr__(self):
+        return f"SuggestionHistory({list(self)!r})"
+
 
 class Player:
     # Represents a player in the Cluedo game. A player has a name, current position on the board, and a hand of cards.
     # The `is_ai` flag indicates whether this player is controlled by the computer.
     # Each player also maintains a knowledge base for deduction purposes when controlled by the AI.
+    # Slotted so large numbers of resident games (server tables, batch runs) stay small.
+    __slots__ = ("name", "position", "cards", "eliminated", "is_ai", "decision_budget", "strategy", "log",
+                 "known_masks", "not_have_masks", "possible_mask", "suggestion_history", "deduction")
 
-    def __init__(self, name, position, is_ai: bool = False):
+    def __init__(self, name, position, is_ai: bool = False, decision_budget: float | None = None, strategy=None, log=NULL):
         # Initialize a new player.
         self.name = name
         self.position = position
         self.cards: list[str] = []
         self.eliminated: bool = False
         self.is_ai: bool = is_ai
+        # Seconds the AI may spend sampling deals per suggestion; None keeps the instant lowest-card rule
+        self.decision_budget: float | None = decision_budget
+        # Optional pluggable decision maker (e.g. search.SearchStrategy) with choose_suggestion/choose_accusation,
+        # None keeps the built-in rules below; returning None from it also falls back to them
+        self.strategy = strategy
+        # gamelog sink for the AI's reasoning, CluedoGame hands every player its own; silent on its own
+        self.log = log
+
+        # AI deduction state, card sets are int bitmasks (see cards.py)
+        # Maps other player names to the mask of cards known to be held by them
+        self.known_masks: dict[str, int] = {}
+        # Maps other player names to the mask of cards known to NOT be held by them
+        self.not_have_masks: dict[str, int] = {}
+        # Cards that could still be in the solution; narrowed as the game progresses
+        self.possible_mask: int = FULL_MASK
+        # Suggestion history for potential future logic or replay/debugging, packed (see SuggestionHistory)
+        self.suggestion_history = SuggestionHistory()
+        # Full constraint propagation over every player's hand, started once the deal is known
+        self.deduction: DeductionEngine | None = None
+
+    @property
+    def possible_solution(self) -> dict[str, set[str]]:
+        """Possible solution sets for character, weapon, and room, unpacked from the bitmask."""
+        return {category: set(cards_of(self.possible_mask & CATEGORY_MASKS[category])) for category in CATEGORIES}
 
-        # AI deduction state
-        # Maps other player names to the set of cards known to be held by them
-        self.known_cards: dict[str, set[str]] = {}
-        # Maps other player names to the set of cards known to NOT be held by them
-        self.not_have: dict[str, set[str]] = {}
-        # Possible solution sets for character, weapon, and room; narrowed as the game progresses
-        self.possible_solution = {
-            "character": set(CHARACTERS),
-            "weapon": set(WEAPONS),
-            "room": set(ROOM_NAMES),
-        }
-        # Suggestion history for potential future logic or replay/debugging
-        self.suggestion_history: list[tuple[str, str, str, str | None]] = []
+    @property
+    def known_cards(self) -> dict[str, set[str]]:
+        """Cards known to be held by each other player."""
+        return {name: set(cards_of(mask)) for name, mask in self.known_masks.items()}
+
+    @property
+    def not_have(self) -> dict[str, set[str]]:
+        """Cards known to NOT be held by each other player."""
+        return {name: set(cards_of(mask)) for name, mask in self.not_have_masks.items()}
+
+    def possible_in(self, category: str) -> int:
+        """Mask of the cards still possible in one category."""
+        return self.possible_mask & CATEGORY_MASKS[category]
 
     def receive_card(self, card: str):
         """Assign a card to this player and update AI deduction if applicable."""
         self.cards.append(card)
         if self.is_ai:
             # Eliminate owned cards from the possible solution
-            for category in self.possible_solution:
-                self.possible_solution[category].discard(card)
+            self.possible_mask &= ~CARD_BITS[card]
+
+    def start_deduction(self, player_names: list[str], hand_sizes: list[int]):
+        """Start the deduction engine once cards are dealt; hand sizes are public information."""
+        if not self.is_ai:
+            return
+        self.deduction = DeductionEngine(player_names, hand_sizes)
+        self.deduction.learn_hand(self.name, self.cards)
+        self._sync_deduction()
+
+    def _sync_deduction(self):
+        # Mirror the engine's conclusions into the mask fields the rest of the game reads
+        engine = self.deduction
+        self.possible_mask = engine.solution_mask()
+        for seat, name in enumerate(engine.player_names):
+            if name == self.name:
+                continue
+            if engine.has[seat]:
+                self.known_masks[name] = engine.has[seat]
+            if engine.lacks[seat]:
+                self.not_have_masks[name] = engine.lacks[seat]
+
+    def observe_other_suggestion(self, suggester: str, suggestion: tuple[str, str, str], refuter_name: str | None):
+        """Deduce from a suggestion made by another player (we don't see the card shown)."""
+        if not self.is_ai or self.deduction is None:
+            return
+        learned = self.deduction.record_suggestion(suggester, suggestion, refuter_name)
+        if learned:
+            self.log.debug("[AI LOGIC] Learned {} new fact(s) from {}'s suggestion", learned, suggester)
+            self._sync_deduction()
 
     def observe_suggestion(self, character: str, weapon: str, room: str, refuter_name: str | None, players_in_game: list[str]):
         """Update AI deduction based on suggestion outcome."""
@@ -41,58 +173,89 @@ class Player:
             return
 
         suggestion = (character, weapon, room)
+        suggestion_mask = mask_of(suggestion)
         self.suggestion_history.append((*suggestion, refuter_name))
 
+        if self.deduction is not None:
+            self.log.debug("[AI LOGIC] {} refuted suggestion: {}", refuter_name or 'No one', suggestion)
+            if self.deduction.record_suggestion(self.name, suggestion, refuter_name):
+                self._sync_deduction()
+            return
+
         if refuter_name is None:
-            print(f"[AI LOGIC] No one refuted suggestion: {suggestion}")
-            # Eliminate all 3 from all other players; include them in possible solution
-            for category, card in zip(["character", "weapon", "room"], suggestion):
-                self.possible_solution[category].intersection_update({card})
-                for player in players_in_game:
-                    if player != self.name:
-                        self.not_have.setdefault(player, set()).add(card)
+            self.log.debug("[AI LOGIC] No one refuted suggestion: {}", suggestion)
+            # Eliminate all 3 from all other players; each category narrows to the suggested card
+            self.possible_mask &= suggestion_mask
+            for player in players_in_game:
+                if player != self.name:
+                    self.not_have_masks[player] = self.not_have_masks.get(player, 0) | suggestion_mask
         else:
-            print(f"[AI LOGIC] {refuter_name} refuted suggestion: {suggestion}")
+            self.log.debug("[AI LOGIC] {} refuted suggestion: {}", refuter_name, suggestion)
             # Mark that everyone else doesn't have any of the three
             for player in players_in_game:
                 if player != self.name and player != refuter_name:
-                    self.not_have.setdefault(player, set()).update(suggestion)
+                    self.not_have_masks[player] = self.not_have_masks.get(player, 0) | suggestion_mask
 
     def update_knowledge_from_refutation(self, suggester: str, suggestion: tuple[str, str, str], refuter: str, card_shown: str | None):
         """Refinement from private card shown to AI."""
         if not self.is_ai or not card_shown:
             return
 
-        self.known_cards.setdefault(refuter, set()).add(card_shown)
-        print(f"[AI LOGIC] {refuter} must have '{card_shown}'")
+        self.log.debug("[AI LOGIC] {} must have '{}'", refuter, card_shown)
+        if self.deduction is not None:
+            if self.deduction.learn_has(refuter, card_shown):
+                self._sync_deduction()
+            return
+
+        bit = CARD_BITS[card_shown]
+        self.known_masks[refuter] = self.known_masks.get(refuter, 0) | bit
         # Remove shown card from the possible solution
-        for category in self.possible_solution:
-            self.possible_solution[category].discard(card_shown)
+        self.possible_mask &= ~bit
 
     def should_accuse(self) -> bool:
         """Check if AI has narrowed down the solution and should accuse."""
         if not self.is_ai:
             return False
-        return all(len(self.possible_solution[cat]) == 1 for cat in self.possible_solution)
+        return all(is_single(self.possible_mask & mask) for mask in CATEGORY_MASKS.values())
 
-    def make_accusation(self) -> tuple[str, str, str] | None:
-        """Return the AI's accusation if it's sure, else None."""
+    def make_accusation(self, rng=None) -> tuple[str, str, str] | None:
+        """Return the AI's accusation if it's sure (or its strategy decides to risk one), else None."""
+        if self.is_ai and self.strategy is not None:
+            accusation = self.strategy.choose_accusation(self, rng)
+            if accusation is not None:
+                self.log.debug("[AI DECISION] Making accusation: {}, {}, {}", accusation[0], accusation[1], accusation[2])
+                return accusation
         if self.should_accuse():
-            char = next(iter(self.possible_solution["character"]))
-            weap = next(iter(self.possible_solution["weapon"]))
-            room = next(iter(self.possible_solution["room"]))
-            print(f"[AI DECISION] Making accusation: {char}, {weap}, {room}")
+            char = lowest_card(self.possible_in("character"))
+            weap = lowest_card(self.possible_in("weapon"))
+            room = lowest_card(self.possible_in("room"))
+            self.log.debug("[AI DECISION] Making accusation: {}, {}, {}", char, weap, room)
             return (char, weap, room)
         return None
 
-    def choose_suggestion(self) -> tuple[str, str, str] | None:
+    def choose_suggestion(self, rng=None) -> tuple[str, str, str] | None:
         """AI chooses a suggestion based on narrowed possibilities."""
         if not self.is_ai:
             return None
 
-        char = next(iter(self.possible_solution["character"]))
-        weap = next(iter(self.possible_solution["weapon"]))
-        room = next(iter(self.possible_solution["room"]))
+        if self.strategy is not None:
+            suggestion = self.strategy.choose_suggestion(self, rng)
+            if suggestion is not None:
+                self.log.debug("[AI DECISION] Suggesting: {}, {}, {}", suggestion[0], suggestion[1], suggestion[2])
+                return suggestion
+
+        if self.decision_budget and self.deduction is not None:
+            suggestion = choose_informative_suggestion(self.deduction, self.name, self.decision_budget, rng=rng)
+            if suggestion is not None:
+                self.log.debug("[AI DECISION] Suggesting: {}, {}, {}", suggestion[0], suggestion[1], suggestion[2])
+                return suggestion
+
+        # Lowest remaining card per category, deterministic unlike set iteration order
+        char = lowest_card(self.possible_in("character"))
+        weap = lowest_card(self.possible_in("weapon"))
+        room = lowest_card(self.possible_in("room"))
+        if char is None or weap is None or room is None:
+            return None
 
-        print(f"[AI DECISION] Suggesting: {char}, {weap}, {room}")
+        self.log.debug("[AI DECISION] Suggesting: {}, {}, {}", char, weap, room)
         return (char, weap, room)
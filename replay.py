@@ -0,0 +1,98 @@
+#replays a recorded game from its event log at full speed, no prompts and no printing
+#rebuilds positions, eliminations and every ai seat's deduction state so a bad ai decision can be inspected
+import argparse
+import time
+
+from cards import ALL_CARDS
+from board import BOARD
+from configurations import CHARACTERS
+from deduction import DeductionEngine
+from events import ACCUSATION, DEAL, MOVE, NONE_ID, REFUTATION, ROLL, START, SUGGESTION, card_name, read_archive
+
+
+class ReplayState:
+    # Game state rebuilt from events, seats are indices into player_names.
+
+    def __init__(self, num_players: int, ai_mask: int, seed: int):
+        self.seed = seed
+        self.player_names = CHARACTERS[:num_players]
+        self.ai_seats = [seat for seat in range(num_players) if ai_mask >> seat & 1]
+        self.positions = [BOARD.starts[name] for name in self.player_names]
+        self.hands: list[list[str]] = [[] for _ in range(num_players)]
+        self.solution: tuple[str, str, str] | None = None
+        self.eliminated: set[int] = set()
+        self.winner: int | None = None
+        self.rolls = 0
+        self.engines: dict[int, DeductionEngine] = {}
+        self._pending = None #suggestion waiting for its refutation event
+
+    def apply(self, kind: int, payload: tuple):
+        if kind == DEAL:
+            self.solution = tuple(card_name(card) for card in payload[:3])
+            for card, holder in enumerate(payload[3:]):
+                if holder != NONE_ID:
+                    self.hands[holder].append(ALL_CARDS[card])
+            sizes = [len(hand) for hand in self.hands]
+            for seat in self.ai_seats:
+                engine = DeductionEngine(self.player_names, sizes)
+                engine.learn_hand(self.player_names[seat], self.hands[seat])
+                self.engines[seat] = engine
+        elif kind == ROLL:
+            self.rolls += 1
+        elif kind == MOVE:
+            seat, x, y = payload
+            self.positions[seat] = (x, y)
+        elif kind == SUGGESTION:
+            self._pending = payload
+        elif kind == REFUTATION:
+            seat, *cards = self._pending
+            self._pending = None
+            if NONE_ID in cards:
+                return #typo'd human suggestion, the ai seats ignored it live too
+            suggester, refuter, shown = payload
+            suggestion = tuple(ALL_CARDS[card] for card in cards)
+            refuter_name = self.player_names[refuter] if refuter != NONE_ID else None
+            for ai_seat, engine in self.engines.items():
+                # Only the suggester sees the card
+                engine.record_suggestion(self.player_names[seat], suggestion, refuter_name)
+                if ai_seat == suggester and shown != NONE_ID:
+                    engine.learn_has(refuter_name, ALL_CARDS[shown])
+        elif kind == ACCUSATION:
+            seat, *_, correct = payload
+            if correct:
+                self.winner = seat
+            else:
+                self.eliminated.add(seat)
+
+
+def replay(log, on_event=None) -> ReplayState:
+    """Re-execute a game from its EventLog; on_event(state, kind, payload) runs after each event."""
+    events = log.events
+    if not events or events[0][0] != START:
+        raise ValueError("event log does not begin with a START event")
+    state = ReplayState(*events[0][1])
+    for kind, payload in events[1:]:
+        state.apply(kind, payload)
+        if on_event is not None:
+            on_event(state, kind, payload)
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a binary archive of recorded Cluedo games.")
+    parser.add_argument("archive")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    games = wins = 0
+    with open(args.archive, "rb") as f:
+        for log in read_archive(f):
+            state = replay(log)
+            games += 1
+            wins += state.winner is not None
+    elapsed = time.perf_counter() - start
+    print(f"Replayed {games} games ({wins} won) in {elapsed:.2f}s ({games / elapsed if elapsed else 0:.1f} games/sec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+#anytime monte carlo tree search for ai suggestions and accusation timing, pluggable per seat next to the built-in rules
+#every iteration draws a hidden deal consistent with what the deduction engine knows (a determinization), walks the tree of
+#our own next suggestions with UCB1, finishes with the instant lowest-card rule and backs up how soon the deal got solved
+import math
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from cards import ALL_CARDS, CARD_INDEX, CATEGORY_MASKS, cards_of, lowest_card
+from inference import DEFAULT_DECISION_BUDGET, DEFAULT_MAX_SAMPLES, sample_deals, solution_probabilities
+
+DEFAULT_HORIZON = 4 #own suggestions looked ahead before a playout is scored
+DEFAULT_PATIENCE = 0.85 #value kept per extra turn, roughly the chance nobody else solves it in the meantime
+DEFAULT_WIDTH = 2 #most likely cards per category tried at the root, so at most 8 candidate suggestions
+DEFAULT_ACCUSE_FLOOR = 0.5 #never gamble on a guess less likely than this
+MIN_GAMBLE_SAMPLES = 200 #deals needed before a sampled chance is trusted enough to gamble on
+EXPLORATION = 1.4 #UCB1 constant
+SAMPLING_SHARE = 0.25 #part of the budget spent drawing deals, the rest searching
+DEADLINE_GRACE = 0.005 #seconds a worker's answer may arrive after the deadline before it is dropped
+
+
+class Node:
+    # One own suggestion in the (open loop) tree, children are keyed by the next suggestion.
+    __slots__ = ("visits", "value", "children")
+
+    def __init__(self):
+        self.visits = 0
+        self.value = 0.0
+        self.children: dict[tuple, "Node"] = {}
+
+
+def _remaining(engine) -> int:
+    """Solutions still possible, 1 once solved."""
+    possible = engine.solution_mask()
+    return math.prod((possible & mask).bit_count() for mask in CATEGORY_MASKS.values())
+
+
+def _lowest_triple(engine) -> tuple[int, int, int] | None:
+    possible = engine.solution_mask()
+    cards = [possible & mask for mask in CATEGORY_MASKS.values()]
+    if not all(cards):
+        return None
+    return tuple((mask & -mask).bit_length() - 1 for mask in cards)
+
+
+def _play(engine, seat: int, owner_of: list[int], triple: tuple[int, int, int], rng):
+    #suggest against a determinized deal: first seat clockwise holding a card refutes and shows us one of them
+    names = engine.player_names
+    num_players = len(names)
+    refuter, nearest = None, num_players
+    for card in triple:
+        owner = owner_of[card]
+        if owner < num_players and 0 < (owner - seat) % num_players < nearest:
+            refuter, nearest = owner, (owner - seat) % num_players
+    suggestion = tuple(ALL_CARDS[card] for card in triple)
+    if refuter is None:
+        engine.record_suggestion(names[seat], suggestion, None)
+    else:
+        shown = rng.choice([card for card in triple if owner_of[card] == refuter])
+        engine.record_suggestion(names[seat], suggestion, names[refuter], ALL_CARDS[shown])
+
+
+def _iterate(root: Node, engine, seat: int, samples, candidates, horizon: int, patience: float, rng):
+    owner_of = rng.choice(samples)
+    engine = engine.copy()
+    node, path, depth = root, [root], 0
+    # Selection and expansion: UCB1 among tried suggestions, one untried suggestion per iteration
+    while depth < horizon and _remaining(engine) > 1:
+        untried = next((triple for triple in candidates if triple not in node.children), None)
+        if untried is not None:
+            triple = untried  # candidates are ordered most likely first
+            child = node.children[triple] = Node()
+        else:
+            log_visits = math.log(node.visits)
+            triple, child = max(node.children.items(), key=lambda item: item[1].value / item[1].visits + EXPLORATION * math.sqrt(log_visits / item[1].visits))
+        _play(engine, seat, owner_of, triple, rng)
+        node = child
+        path.append(node)
+        depth += 1
+        if untried is not None:
+            break
+    # Playout with the instant rule
+    while depth < horizon and _remaining(engine) > 1:
+        _play(engine, seat, owner_of, _lowest_triple(engine), rng)
+        depth += 1
+    # Sooner is better; an unsolved playout is scored as if each halving of what's left costs one more turn
+    reward = patience ** (depth + math.log2(_remaining(engine)))
+    for node in path:
+        node.visits += 1
+        node.value += reward
+
+
+def search(engine, suggester: str, samples: list[list[int]], candidates: list[tuple[int, int, int]], deadline: float | None, seed: int,
+           horizon: int = DEFAULT_HORIZON, patience: float = DEFAULT_PATIENCE, max_iterations: int | None = None) -> dict[tuple, tuple[int, float]]:
+    """UCB1 tree search until `deadline` (time.perf_counter) or `max_iterations`; returns {root suggestion: (visits, total value)}."""
+    rng = random.Random(seed)
+    root = Node()
+    seat = engine.seat[suggester]
+    iterations = 0
+    while max_iterations is None or iterations < max_iterations:
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        _iterate(root, engine, seat, samples, candidates, horizon, patience, rng)
+        iterations += 1
+    return {triple: (child.visits, child.value) for triple, child in root.children.items()}
+
+
+class SearchStrategy:
+    # Anytime MCTS AI. Give it to a seat with Player(strategy=...) or CluedoGame(strategies={seat: ...}).
+    # Every decision ends by the deadline: with workers > 1 the root is searched in parallel (threads or processes),
+    # answers that miss the deadline are dropped and the merged visit counts pick the move.
+    name = "mcts"
+
+    def __init__(self, budget: float = DEFAULT_DECISION_BUDGET, workers: int = 1, executor: str = "process",
+                 horizon: int = DEFAULT_HORIZON, patience: float = DEFAULT_PATIENCE, width: int = DEFAULT_WIDTH,
+                 accuse_floor: float = DEFAULT_ACCUSE_FLOOR, max_samples: int = DEFAULT_MAX_SAMPLES, max_iterations: int | None = None):
+        if executor not in ("thread", "process"):
+            raise ValueError("executor must be 'thread' or 'process'")
+        self.budget = budget
+        self.workers = max(1, workers)
+        self.executor = executor
+        self.horizon = horizon
+        self.patience = patience
+        self.width = width
+        self.accuse_floor = accuse_floor
+        self.max_samples = max_samples
+        self.max_iterations = max_iterations #per worker, for reproducible runs; None searches until the deadline
+        self._pool = None
+
+    def _executor(self):
+        if self._pool is None:
+            pool_class = ProcessPoolExecutor if self.executor == "process" else ThreadPoolExecutor
+            self._pool = pool_class(max_workers=self.workers - 1)
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def _candidates(self, engine, probabilities: dict[str, float]) -> list[tuple[int, int, int]]:
+        options = []
+        for mask in CATEGORY_MASKS.values():
+            cards = sorted(cards_of(engine.solution_mask() & mask), key=lambda card: -probabilities[card])
+            options.append([CARD_INDEX[card] for card in cards[:self.width]])
+        triples = [(c, w, r) for c in options[0] for w in options[1] for r in options[2]]
+        triples.sort(key=lambda triple: -sum(probabilities[ALL_CARDS[card]] for card in triple))
+        return triples
+
+    def _search(self, engine, suggester: str, samples, candidates, start: float, rng) -> dict[tuple, tuple[int, float]]:
+        #root parallel search, this thread takes one share and the pool the rest
+        deadline = start + self.budget if self.max_iterations is None else None
+        args = (engine, suggester, samples, candidates, deadline)
+        options = (self.horizon, self.patience, self.max_iterations)
+        futures = [self._executor().submit(search, *args, rng.getrandbits(64), *options) for _ in range(self.workers - 1)]
+        totals = search(*args, rng.getrandbits(64), *options)
+        if futures:
+            timeout = None if deadline is None else max(0.0, deadline - time.perf_counter()) + DEADLINE_GRACE
+            done, late = wait(futures, timeout=timeout)
+            for future in late:
+                future.cancel()
+            for future in done:
+                for triple, (visits, value) in future.result().items():
+                    seen, total = totals.get(triple, (0, 0.0))
+                    totals[triple] = (seen + visits, total + value)
+        return totals
+
+    def _samples(self, engine, start: float, rng):
+        #the first share of the decision's budget, on the same clock as sample_deals
+        sampling_deadline = start + self.budget * SAMPLING_SHARE if self.max_iterations is None else None
+        return sample_deals(engine, self.max_samples, sampling_deadline, rng)
+
+    def choose_suggestion(self, player, rng=None) -> tuple[str, str, str] | None:
+        """Most visited root suggestion, or None to fall back to the player's built-in rule."""
+        engine = player.deduction
+        if engine is None:
+            return None
+        rng = rng if rng is not None else random
+        start = time.perf_counter()
+        samples = self._samples(engine, start, rng)
+        if not samples:
+            return None
+        candidates = self._candidates(engine, solution_probabilities(samples, engine.envelope))
+        if not candidates:
+            return None
+        totals = self._search(engine, player.name, samples, candidates, start, rng)
+        if not totals:
+            return None
+        best = max(candidates, key=lambda triple: totals.get(triple, (0, 0.0)))
+        return tuple(ALL_CARDS[card] for card in best)
+
+    def choose_accusation(self, player, rng=None) -> tuple[str, str, str] | None:
+        """Accuse when certain, or when the likeliest solution beats the searched value of waiting another turn."""
+        engine = player.deduction
+        if engine is None:
+            return None
+        if engine.is_solved():
+            possible = engine.solution_mask()
+            return tuple(lowest_card(possible & mask) for mask in CATEGORY_MASKS.values())
+        rng = rng if rng is not None else random
+        start = time.perf_counter()
+        samples = self._samples(engine, start, rng)
+        if len(samples) < MIN_GAMBLE_SAMPLES:
+            return None  # too few deals to tell a likely guess from noise
+        envelopes = Counter(tuple(card for card, owner in enumerate(owner_of) if owner == engine.envelope) for owner_of in samples)
+        guess, hits = envelopes.most_common(1)[0]
+        chance = hits / len(samples)
+        if chance < self.accuse_floor:
+            return None
+        if chance < self.patience:
+            # Waiting is worth the best root suggestion's mean value
+            candidates = self._candidates(engine, solution_probabilities(samples, engine.envelope))
+            totals = self._search(engine, player.name, samples, candidates, start, rng)
+            waiting = max((value / visits for visits, value in totals.values() if visits), default=0.0)
+            if chance <= waiting:
+                return None
+        return tuple(ALL_CARDS[card] for card in guess)
@@ -0,0 +1,311 @@
+#asyncio game server, hosts many tables in one process over a plain tcp line protocol
+#lobby commands: NEW <players 2-6> [humans], JOIN <table>, LIST, QUIT
+#in game the server sends the same prompts as the terminal game and each reply is one line
+#(UP 2, CARDS, TRACK, ACCUSE, SECRET_PASSAGE_TO_<ROOM>, then character/weapon/room answers)
+import argparse
+import asyncio
+import contextlib
+import itertools
+
+from cluedo import CluedoGame
+from gamelog import INFO, BufferSink
+from movement import check_room_entry
+from turnmanager import TurnManager
+
+MOVE_PROMPT = "Enter your move (e.g., UP 2), 'CARDS' to view your hand, 'TRACK' to see info, 'ACCUSE' to make an accusation: "
+
+
+class Disconnected(Exception):
+    """The client at a seat went away."""
+
+
+class Seat:
+    # One client connection.
+    __slots__ = ("reader", "writer", "idle")
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.idle = asyncio.Event() #cleared while the lobby is watching the connection, only one reader at a time
+        self.idle.set()
+
+    async def send(self, text: str):
+        self.writer.write((text + "\n").encode())
+        await self.writer.drain()
+
+    async def read(self) -> str:
+        line = await self.reader.readline()
+        if not line:
+            raise Disconnected()
+        return line.decode(errors="replace").strip()
+
+    async def ask(self, prompt: str) -> str:
+        await self.send(prompt)
+        return await self.read()
+
+
+class Table:
+    # One game. Humans take the first seats, AI seats fill the rest.
+    # The engine logs into a per-table buffer at table (INFO) level, so AI reasoning and the presentation hand dump,
+    # which name private cards, are never even formatted; whatever one engine call logged is broadcast to the table.
+
+    def __init__(self, table_id: int, num_players: int, num_humans: int, seed: int | None = None):
+        self.table_id = table_id
+        self.num_humans = num_humans
+        self.log = BufferSink(level=INFO)
+        self.game = CluedoGame(num_players, ai_seats=range(num_humans, num_players), seed=seed, log=self.log)
+        self.log.drain() #the player count greeting is for the terminal game
+        self.manager = TurnManager(self.game, interactive=False)
+        self.seats: list[Seat | None] = [None] * num_humans
+        self.dropped: set[int] = set() #seats whose client went away mid game, never reopened
+        self.full = asyncio.Event()
+        self.finished = asyncio.Event()
+        self.task: asyncio.Task | None = None #play(), set by the server
+
+    def open_seats(self) -> int:
+        return self.seats.count(None)
+
+    def join(self, seat: Seat) -> int | None:
+        for i, taken in enumerate(self.seats):
+            if taken is None:
+                self.seats[i] = seat
+                if not self.open_seats():
+                    self.full.set()
+                return i
+        return None
+
+    def leave(self, index: int) -> bool:
+        """Free a seat before the game starts; True if nobody is left waiting at the table."""
+        self.seats[index] = None
+        return self.open_seats() == self.num_humans
+
+    async def drop(self, index: int):
+        #a human who went away mid game is out, the rest play on
+        self.game.players[index].eliminated = True
+        self.dropped.add(index)
+        await self.broadcast(f"{self.game.players[index].name} disconnected and is out of the game.")
+
+    async def broadcast(self, text: str):
+        for i, seat in enumerate(self.seats):
+            if seat is not None and i not in self.dropped:
+                with contextlib.suppress(ConnectionError):
+                    await seat.send(text)
+
+    async def engine(self, fn, *args):
+        #run a synchronous engine call and share what it logged
+        result = fn(*args)
+        lines = self.log.drain()
+        if lines:
+            await self.broadcast("\n".join(lines))
+        return result
+
+    async def play(self):
+        #finished is set however this ends, the seats' connections wait on it
+        try:
+            await self.full.wait()
+            for seat in self.seats:
+                await seat.idle.wait()
+            await self._play()
+        finally:
+            self.finished.set()
+
+    async def _play(self):
+        game = self.game
+        await self.broadcast(f"GAME START table {self.table_id}: {', '.join(p.name for p in game.players)}")
+        for i, seat in enumerate(self.seats):
+            try:
+                await seat.send(f"You are {game.players[i].name}. Your cards: {game.players[i].cards}")
+            except ConnectionError:
+                await self.drop(i)
+        while not game.is_over():
+            if len(self.dropped) == len(self.seats):
+                return #every human left, nobody is watching the AIs finish
+            idx = game.current_player_idx
+            player = game.players[idx]
+            if player.is_ai:
+                await self.engine(self.manager.ai_play_turn, player)
+            elif not player.eliminated:
+                try:
+                    await self.human_turn(player, self.seats[idx])
+                except (Disconnected, ConnectionError):
+                    await self.drop(idx)
+            self.manager.turns_played += 1
+            game.current_player_idx = (idx + 1) % game.num_players
+            await asyncio.sleep(0) #let other tables run between turns
+        winner = game.winner or "nobody"
+        await self.broadcast(f"GAME OVER: winner {winner}. Solution was {', '.join(game.solution)}")
+
+    async def wait_for_start(self, seat: Seat) -> bool:
+        """Hold a seated client until the table is full; False if it disconnects first."""
+        while not self.full.is_set():
+            started = asyncio.create_task(self.full.wait())
+            line = asyncio.create_task(seat.reader.readline())
+            seat.idle.clear()
+            try:
+                await asyncio.wait((started, line), return_when=asyncio.FIRST_COMPLETED)
+                started.cancel()
+                line.cancel() #a cancelled readline leaves any partial line in the buffer for the game
+                with contextlib.suppress(asyncio.CancelledError, ConnectionError):
+                    await line
+            finally:
+                seat.idle.set()
+            if line.cancelled():
+                break
+            text = b"" if line.exception() is not None else line.result()
+            if not text:
+                return False
+            if not self.full.is_set():
+                await seat.send(f"Waiting for {self.open_seats()} more player(s)...")
+        return True
+
+    async def human_turn(self, player, seat: Seat):
+        await self.broadcast(f"\n--- {player.name}'s Turn ---")
+        room_name = check_room_entry(player.position)
+        await seat.send(f"Current position: {player.position}" + (f" ({room_name})" if room_name else ""))
+        roll = self.game.roll_die()
+        await seat.send(f"You rolled a {roll}.")
+
+        while True:
+            move = (await seat.ask(MOVE_PROMPT)).upper().split()
+            if not move:
+                await seat.send("Please enter a command.")
+                continue
+            if move[0] == "CARDS":
+                await seat.send(f"Your cards: {player.cards}")
+                continue
+            if move[0] == "TRACK":
+                await seat.send("\n".join(self.manager.tracker_for(player).lines()))
+                continue
+            if move[0] == "ACCUSE":
+                await self.human_accuse(player, seat)
+                return
+            if len(move) == 2 and move[0] in {"UP", "DOWN", "LEFT", "RIGHT"}:
+                try:
+                    steps = int(move[1])
+                except ValueError:
+                    await seat.send("Steps must be a number!")
+                    continue
+                if steps < 1:
+                    await seat.send("Steps must be at least 1!")
+                    continue
+                if not self.manager.move_straight(player, move[0], steps):
+                    await seat.send("That move will take you off the board. Try again in range.")
+                    continue
+                await self.broadcast(f"{player.name} moved to {player.position}")
+                break
+            if move[0].startswith("SECRET_PASSAGE_TO_"):
+                if await self.engine(self.manager.use_secret_passage, player, move[0]) is None:
+                    await seat.send("Invalid secret passage.")
+                    continue
+                break
+            await seat.send("Invalid move input.")
+
+        new_room = check_room_entry(player.position)
+        if new_room:
+            await self.human_suggest(player, seat, new_room)
+
+    async def human_suggest(self, player, seat: Seat, room: str):
+        await seat.send(f"You entered the {room}. Make a suggestion:")
+        char = await seat.ask("  Character: ")
+        weapon = await seat.ask("  Weapon: ")
+        await self.broadcast(f"{player.name} suggests: {char} with the {weapon} in the {room}")
+        refuter, shown_card = await self.engine(self.manager.resolve_suggestion, player, char, weapon, room)
+        if refuter is None:
+            await self.broadcast("No one could refute the suggestion.")
+        else:
+            await self.broadcast(f"{refuter.name} refuted the suggestion.")
+            await seat.send(f"{refuter.name} showed you: {shown_card}")
+
+    async def human_accuse(self, player, seat: Seat):
+        char = await seat.ask("  Character: ")
+        weapon = await seat.ask("  Weapon: ")
+        room = await seat.ask("  Room: ")
+        await self.broadcast(f"{player.name} accuses: {char} with the {weapon} in the {room}")
+        if await self.engine(self.manager.resolve_accusation, player, (char, weapon, room)):
+            await self.broadcast(f"{player.name} made a correct accusation and wins the game!")
+        else:
+            await self.broadcast(f"Wrong accusation. {player.name} is eliminated.")
+
+
+class GameServer:
+    # Lobby plus the set of live tables.
+
+    def __init__(self):
+        self.tables: dict[int, Table] = {}
+        self._ids = itertools.count(1)
+
+    def create_table(self, num_players: int, num_humans: int) -> Table:
+        table = Table(next(self._ids), num_players, num_humans)
+        self.tables[table.table_id] = table
+        table.task = asyncio.create_task(table.play())
+        table.task.add_done_callback(lambda _: self.tables.pop(table.table_id, None))
+        return table
+
+    async def handle(self, reader, writer):
+        seat = Seat(reader, writer)
+        try:
+            await seat.send("WELCOME to Cluedo. Commands: NEW <players 2-6> [humans], JOIN <table>, LIST, QUIT")
+            while True:
+                parts = (await seat.read()).upper().split()
+                if not parts:
+                    continue
+                if parts[0] == "QUIT":
+                    break
+                if parts[0] == "LIST":
+                    waiting = [f"{t.table_id} ({t.open_seats()} open)" for t in self.tables.values() if not t.full.is_set() and t.open_seats()]
+                    await seat.send("TABLES " + (", ".join(waiting) if waiting else "none waiting"))
+                    continue
+                table = None
+                if parts[0] == "NEW":
+                    try:
+                        num_players = int(parts[1])
+                        num_humans = int(parts[2]) if len(parts) > 2 else 1
+                        if not 1 <= num_humans <= num_players:
+                            raise ValueError
+                        table = self.create_table(num_players, num_humans)
+                    except (IndexError, ValueError):
+                        await seat.send("ERROR usage: NEW <players 2-6> [humans]")
+                        continue
+                elif parts[0] == "JOIN":
+                    table = self.tables.get(int(parts[1])) if len(parts) > 1 and parts[1].isdigit() else None
+                    if table is None or table.full.is_set() or not table.open_seats():
+                        await seat.send("ERROR no such table with an open seat")
+                        continue
+                else:
+                    await seat.send("ERROR unknown command")
+                    continue
+                index = table.join(seat)
+                try:
+                    await seat.send(f"TABLE {table.table_id} SEAT {index} ({table.open_seats()} seat(s) still open)")
+                    started = await table.wait_for_start(seat)
+                except ConnectionError:
+                    started = False
+                if not started:
+                    # Once the game is on it notices the dead connection itself
+                    if not table.full.is_set() and table.leave(index):
+                        table.task.cancel() #nobody left waiting, drop the table
+                    break
+                # The table reads from this connection until the game ends
+                await table.finished.wait()
+        except (Disconnected, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str, port: int):
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"Cluedo server listening on {host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host many Cluedo tables over TCP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    args = parser.parse_args()
+    asyncio.run(GameServer().serve(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#headless ai-vs-ai batch simulation, plays complete games with no prompts and fans them out over a process pool
+import argparse
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+
+from cluedo import CluedoGame
+from events import SEED_LIMIT, EventLog, append_to_archive
+from gamelog import NULL, ConsoleSink
+from metrics import Metrics, profile_run
+from turnmanager import TurnManager
+
+DEFAULT_MAX_TURNS = 1000 #safety cap so a stuck ai can't hang a worker
+
+
+@dataclass(frozen=True)
+class GameResult:
+    """Outcome of one headless game."""
+    seed: int | None
+    winner: str | None
+    turns: int
+    eliminated: tuple[str, ...]
+    solution: tuple[str, str, str]
+    events: bytes | None = None #binary event log, only kept when recording
+
+
+def run_game(num_players: int = 6, seed: int | None = None, max_turns: int | None = DEFAULT_MAX_TURNS, quiet: bool = True, decision_budget: float | None = None, record: bool = False, metrics=None, strategies=None) -> GameResult:
+    """Play one full game where every seat is an AI and return its result; metrics is an optional metrics.Metrics registry."""
+    game = CluedoGame(num_players, ai_seats=range(num_players), decision_budget=decision_budget, seed=seed, strategies=strategies,
+                      log=NULL if quiet else ConsoleSink())
+    manager = TurnManager(game, interactive=False, metrics=metrics)
+    manager.run(max_turns)
+    return GameResult(
+        seed=seed,
+        winner=game.winner,
+        turns=manager.turns_played,
+        eliminated=tuple(p.name for p in game.players if p.eliminated),
+        solution=game.solution,
+        events=game.events.to_bytes() if record else None,
+    )
+
+
+def _run_seeded(num_players, max_turns, decision_budget, record, seed):
+    return run_game(num_players, seed, max_turns, decision_budget=decision_budget, record=record)
+
+
+def simulate_games(num_games: int, num_players: int = 6, workers: int | None = None, seed: int = 0, max_turns: int | None = DEFAULT_MAX_TURNS, decision_budget: float | None = None, record: bool = False) -> list[GameResult]:
+    """Run num_games headless games, game i is seeded with seed + i so results don't depend on scheduling."""
+    seeds = range(seed, seed + num_games)
+    play = partial(_run_seeded, num_players, max_turns, decision_budget, record)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return [play(s) for s in seeds]
+    chunksize = max(1, num_games // (workers * 4)) #big enough chunks to hide the pickling overhead
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(play, seeds, chunksize=chunksize))
+
+
+def summarize(results: list[GameResult]) -> dict:
+    """Aggregate win counts and turn stats over a batch of results."""
+    finished = [r for r in results if r.winner is not None]
+    return {
+        "games": len(results),
+        "finished": len(finished),
+        "wins": dict(Counter(r.winner for r in finished)),
+        "mean_turns": sum(r.turns for r in results) / len(results) if results else 0.0,
+        "mean_eliminated": sum(len(r.eliminated) for r in results) / len(results) if results else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless AI-vs-AI Cluedo games.")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--players", type=int, default=6)
+    parser.add_argument("--workers", type=int, default=None, help="defaults to the number of cpus")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+    parser.add_argument("--decision-budget", type=float, default=None, help="seconds of monte carlo sampling per ai suggestion")
+    parser.add_argument("--record", metavar="PATH", help="append every game's binary event log to this archive")
+    parser.add_argument("--metrics", action="store_true", help="collect per-phase turn timings (runs in this process)")
+    parser.add_argument("--profile", action="store_true", help="play a single game under cProfile and print the hot spots")
+    args = parser.parse_args()
+    if args.seed < 0 or args.seed + args.games > SEED_LIMIT:
+        parser.error("seeds must be between 0 and 2**64 - 1")
+
+    if args.profile:
+        game = CluedoGame(args.players, ai_seats=range(args.players), decision_budget=args.decision_budget, seed=args.seed, log=NULL)
+        stats = profile_run(TurnManager(game, interactive=False), args.max_turns)
+        print(stats)
+        return
+
+    if args.metrics:
+        registry = Metrics()
+        start = time.perf_counter()
+        for seed in range(args.seed, args.seed + args.games):
+            run_game(args.players, seed, args.max_turns, decision_budget=args.decision_budget, metrics=registry)
+        print(f"Played {args.games} games in {time.perf_counter() - start:.2f}s with metrics on")
+        print(registry.report())
+        return
+
+    start = time.perf_counter()
+    results = simulate_games(args.games, args.players, args.workers, args.seed, args.max_turns, args.decision_budget, args.record is not None)
+    elapsed = time.perf_counter() - start
+
+    if args.record:
+        with open(args.record, "ab") as f:
+            for result in results:
+                append_to_archive(f, EventLog.from_bytes(result.events))
+
+    stats = summarize(results)
+    print(f"Played {stats['games']} games in {elapsed:.2f}s ({stats['games'] / elapsed:.1f} games/sec)")
+    print(f"Finished: {stats['finished']}, mean turns: {stats['mean_turns']:.1f}, mean eliminated: {stats['mean_eliminated']:.2f}")
+    for name, wins in sorted(stats["wins"].items(), key=lambda item: -item[1]):
+        print(f"  {name}: {wins} wins")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+#game snapshots for pause/resume and cheap forking (lookahead, what-if analysis)
+#a snapshot is nested tuples, so it is immutable and every fork restored from it shares the same card, history and event tuples
+import json
+import random
+from typing import NamedTuple
+
+from cluedo import CluedoGame
+from deduction import DeductionEngine
+from events import EventLog
+from gamelog import NULL, ConsoleSink
+from player import Player, SuggestionHistory
+from turnmanager import TurnManager
+
+FORMAT_VERSION = 1
+
+
+class DeductionState(NamedTuple):
+    player_names: tuple
+    sizes: tuple
+    has: tuple
+    lacks: tuple
+    candidates: tuple
+    clauses: tuple  # per owner, tuple of card masks
+
+
+class PlayerState(NamedTuple):
+    name: str
+    position: tuple
+    cards: tuple
+    eliminated: bool
+    is_ai: bool
+    decision_budget: float | None
+    possible_mask: int
+    known_masks: tuple  # (name, mask) pairs
+    not_have_masks: tuple
+    suggestion_history: tuple
+    deduction: DeductionState | None
+
+
+class GameState(NamedTuple):
+    num_players: int
+    ai_seats: tuple
+    decision_budget: float | None
+    seed: int
+    rng_state: tuple
+    current_player_idx: int
+    winner: str | None
+    solution: tuple
+    card_holder: tuple  # (card, seat) pairs
+    events: tuple | None  # None when the snapshot was taken without the event log
+    players: tuple
+    turns_played: int
+
+
+def _deduction_state(engine: DeductionEngine | None) -> DeductionState | None:
+    if engine is None:
+        return None
+    return DeductionState(tuple(engine.player_names), tuple(engine.sizes), tuple(engine.has), tuple(engine.lacks),
+                          tuple(engine.candidates), tuple(tuple(clauses) for clauses in engine.clauses))
+
+
+def _player_state(player: Player) -> PlayerState:
+    return PlayerState(player.name, player.position, tuple(player.cards), player.eliminated, player.is_ai, player.decision_budget,
+                       player.possible_mask, tuple(player.known_masks.items()), tuple(player.not_have_masks.items()),
+                       tuple(player.suggestion_history), _deduction_state(player.deduction))
+
+
+def snapshot(game: CluedoGame, manager: TurnManager | None = None, include_events: bool = True) -> GameState:
+    """Capture the whole game (and the manager's turn count) as an immutable GameState."""
+    return GameState(
+        num_players=game.num_players,
+        ai_seats=tuple(sorted(game.ai_seats)),
+        decision_budget=game.decision_budget,
+        seed=game.seed,
+        rng_state=game.rng.getstate(),
+        current_player_idx=game.current_player_idx,
+        winner=game.winner,
+        solution=game.solution,
+        card_holder=tuple(game.card_holder.items()),
+        events=tuple(game.events.events) if include_events else None,
+        players=tuple(_player_state(player) for player in game.players),
+        turns_played=manager.turns_played if manager is not None else 0,
+    )
+
+
+def _restore_deduction(state: DeductionState) -> DeductionEngine:
+    engine = DeductionEngine(state.player_names, state.sizes[:-1])
+    engine.has = list(state.has)
+    engine.lacks = list(state.lacks)
+    engine.candidates = list(state.candidates)
+    engine.clauses = [list(clauses) for clauses in state.clauses]
+    return engine
+
+
+def _restore_player(state: PlayerState) -> Player:
+    player = Player(state.name, state.position, is_ai=state.is_ai, decision_budget=state.decision_budget)
+    player.cards = list(state.cards)
+    player.eliminated = state.eliminated
+    player.possible_mask = state.possible_mask
+    player.known_masks = dict(state.known_masks)
+    player.not_have_masks = dict(state.not_have_masks)
+    player.suggestion_history = SuggestionHistory(state.suggestion_history)
+    player.deduction = _restore_deduction(state.deduction) if state.deduction is not None else None
+    return player
+
+
+def restore(state: GameState, log=None) -> CluedoGame:
+    """Build a live CluedoGame from a snapshot, without prompting or dealing; log is its gamelog sink (console by default)."""
+    game = CluedoGame.__new__(CluedoGame)
+    game.log = log if log is not None else ConsoleSink()
+    game.num_players = state.num_players
+    game.ai_seats = set(state.ai_seats)
+    game.decision_budget = state.decision_budget
+    game.strategies = {} #strategies aren't part of a snapshot, restored seats use the built-in rules
+    game.seed = state.seed
+    game.rng = random.Random()
+    game.rng.setstate(state.rng_state)
+    game.current_player_idx = state.current_player_idx
+    game.winner = state.winner
+    game.solution = state.solution
+    game.card_holder = dict(state.card_holder)
+    game.events = EventLog(list(state.events) if state.events is not None else None)
+    game.players = [_restore_player(player) for player in state.players]
+    for player in game.players:
+        player.log = game.log
+    return game
+
+
+def resume(state: GameState, log=None, **manager_options) -> TurnManager:
+    """Restore a snapshot and wrap it in a TurnManager that carries on the turn count."""
+    manager = TurnManager(restore(state, log), **manager_options)
+    manager.turns_played = state.turns_played
+    return manager
+
+
+def fork(game: CluedoGame, manager: TurnManager | None = None, include_events: bool = False, log=None) -> CluedoGame:
+    """Independent copy of a live game; event logs are skipped by default since rollouts rarely need them.
+
+    The fork is silent unless given a log, so rollouts don't talk over the real game."""
+    return restore(snapshot(game, manager, include_events), log if log is not None else NULL)
+
+
+def to_bytes(state: GameState) -> bytes:
+    """Serialise a snapshot for pause/resume (plain json, no pickle)."""
+    return json.dumps([FORMAT_VERSION, state], separators=(",", ":")).encode()
+
+
+def _tuples(value):
+    #json turns every tuple into a list, turn them back so the snapshot is immutable again
+    if isinstance(value, list):
+        return tuple(_tuples(item) for item in value)
+    return value
+
+
+def from_bytes(data: bytes) -> GameState:
+    version, raw = json.loads(data)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"unsupported snapshot version {version}")
+    raw = _tuples(raw)
+    players = tuple(
+        PlayerState(*player[:-1], DeductionState(*player[-1]) if player[-1] is not None else None)
+        for player in raw[10]
+    )
+    return GameState(*raw[:10], players, raw[11])
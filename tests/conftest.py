@@ -0,0 +1,5 @@
+#the modules live at the top of the repo, make them importable however pytest is started
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
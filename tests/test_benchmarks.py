@@ -0,0 +1,46 @@
+import contextlib
+import os
+
+import pytest
+
+from benchmarks.__main__ import compare
+from benchmarks.cases import CASES
+from benchmarks.harness import measure
+
+
+def test_measure_reports_throughput_latency_and_memory():
+    setups = []
+    calls = []
+
+    def setup():
+        setups.append(len(calls))
+        return len(setups)
+
+    stats = measure(calls.append, setup, batch=10, min_time=0.001)
+    assert set(stats) == {"ops_per_sec", "median_us", "p50_us", "p99_us", "peak_kb", "ops"}
+    assert stats["ops"] % 10 == 0 and stats["ops"] >= 50
+    assert stats["ops_per_sec"] > 0
+    assert stats["p50_us"] <= stats["p99_us"]
+    # setup runs once per batch, before any of that batch's calls
+    assert all(count % 10 == 0 for count in setups)
+    assert calls[:10] == [1] * 10
+
+
+def test_compare_flags_cases_slower_than_the_tolerance(capsys):
+    results = {"fast": {"median_us": 1.0}, "slow": {"median_us": 2.0}, "new": {"median_us": 1.0}}
+    baseline = {"results": {"fast": {"median_us": 1.1, "p50_us": 9.0}, "slow": {"median_us": 1.0}}}
+    assert compare(results, baseline, 0.2) == ["slow"]
+    assert "REGRESSION" in capsys.readouterr().out
+
+
+def test_compare_reads_old_baselines_without_median_us():
+    assert compare({"case": {"median_us": 1.0}}, {"results": {"case": {"p50_us": 0.5}}}, 0.2) == ["case"]
+    assert compare({"case": {"median_us": 1.0}}, {"results": {"case": {"p50_us": 1.0}}}, 0.2) == []
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_every_case_runs(name):
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        fn, setup, batch = CASES[name]()
+        fn(setup() if setup is not None else None)
+    assert batch >= 1
@@ -0,0 +1,71 @@
+import pytest
+
+from board import BOARD, UNREACHABLE, Board
+from cluedo import CluedoGame
+from configurations import ROOMS
+from gamelog import NULL
+from movement import check_room_entry, move_player, will_move_off_board
+from player import Player
+from turnmanager import TurnManager
+
+
+def test_room_at_matches_the_layout():
+    room_tiles = {tile: room for room, tiles in ROOMS.items() for tile in tiles}
+    for y in range(BOARD.height):
+        for x in range(BOARD.width):
+            assert check_room_entry((x, y)) == room_tiles.get((x, y))
+
+
+def test_off_board_tiles_are_no_room():
+    assert BOARD.room_at((-1, 0)) is None
+    assert BOARD.room_at((0, BOARD.height)) is None
+
+
+def test_straight_moves_and_the_board_edge():
+    player = Player("Sherlock", (2, 1))
+    move_player(player, "DOWN", 3)
+    assert player.position == (2, 4)
+    assert will_move_off_board((2, 1), "UP", 2)
+    assert not will_move_off_board((2, 1), "UP", 1)
+    assert will_move_off_board((2, 1), "SIDEWAYS", 1)
+
+
+def test_move_straight_rejects_fewer_than_one_step():
+    game = CluedoGame(2, ai_seats=[1], seed=1, log=NULL)
+    manager = TurnManager(game, interactive=False)
+    player = game.players[0]
+    start = player.position
+    assert not manager.move_straight(player, "DOWN", 0)
+    assert not manager.move_straight(player, "UP", -1)
+    assert player.position == start
+    assert manager.move_straight(player, "DOWN", 1)
+    assert player.position == (start[0], start[1] + 1)
+
+
+def test_tiles_outside_an_explicit_size_are_rejected():
+    with pytest.raises(ValueError):
+        Board({"Hall": [(3, 0)]}, width=2, height=2)
+
+
+def test_distance_is_zero_inside_and_counts_passages_as_one_step():
+    for room, tiles in ROOMS.items():
+        assert all(BOARD.distance(room, tile) == 0 for tile in tiles)
+    for tile in ROOMS["Kitchen"]:
+        assert BOARD.distance("Study", tile) == 1
+    assert BOARD.distance("Study", (-1, 0)) == UNREACHABLE
+
+
+def test_best_target_prefers_a_room_the_roll_reaches():
+    pos = (2, 1)
+    near = min(ROOMS, key=lambda room: BOARD.distance(room, pos))
+    assert BOARD.best_target(list(ROOMS), pos, 6) == near
+    assert BOARD.best_target([], pos, 6) is None
+
+
+def test_path_towards_walks_a_shortest_path_and_stops_in_the_room():
+    pos = (2, 8)
+    path = BOARD.path_towards("Kitchen", pos, 20)
+    assert len(path) == BOARD.distance("Kitchen", pos)
+    assert check_room_entry(path[-1]) == "Kitchen"
+    assert all(check_room_entry(tile) != "Kitchen" for tile in path[:-1])
+    assert BOARD.path_towards("Kitchen", pos, 2) == path[:2]
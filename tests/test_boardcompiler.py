@@ -0,0 +1,96 @@
+import os
+from pathlib import Path
+
+import pytest
+
+import board
+import boardcompiler
+from board import BOARD, Board, compiled_path, load_board, read_compiled
+from boardcompiler import BoardError, Layout, compile_file, compile_layout, format_text, parse, parse_text
+
+MAP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Cluedo_Excel_Map.xlsx")
+
+
+def builtin_layout():
+    return Layout(BOARD.width, BOARD.height, BOARD.rooms, BOARD.starts, BOARD.passages)
+
+
+def same_board(a, b):
+    return (a.width, a.height, a.cells, a.starts, a.passages, a.neighbours, a.distances) == \
+           (b.width, b.height, b.cells, b.starts, b.passages, b.neighbours, b.distances)
+
+
+def text_layout(tmp_path, text=None):
+    path = tmp_path / "board.txt"
+    path.write_text(text if text is not None else format_text(builtin_layout()))
+    return str(path)
+
+
+def test_excel_map_compiles_to_the_builtin_board():
+    with open(MAP, "rb") as f:
+        layout = parse(MAP, f.read())
+    assert same_board(compile_layout(layout), BOARD)
+
+
+def test_text_grid_round_trip():
+    assert parse_text(format_text(builtin_layout())) == builtin_layout()
+
+
+def test_binary_form_round_trip():
+    assert same_board(Board.from_bytes(BOARD.to_bytes()), BOARD)
+
+
+def test_every_problem_is_reported_at_once():
+    layout = builtin_layout()
+    rooms = dict(layout.rooms)
+    rooms["Cellar"] = rooms.pop("Hall")
+    rooms["Study"] = [(0, 0), (9, 9)]
+    with pytest.raises(BoardError) as error:
+        compile_layout(layout._replace(rooms=rooms))
+    message = str(error.value)
+    assert "rooms without a card: Cellar" in message
+    assert "room cards missing from the board: Hall" in message
+    assert "Study is split" in message
+
+
+def test_text_errors_name_the_line():
+    with pytest.raises(BoardError, match="line 1"):
+        parse_text("..Z..\n")
+
+
+def test_second_load_reads_the_cache(tmp_path, monkeypatch):
+    source = text_layout(tmp_path)
+    cache = str(tmp_path / "cache")
+    first = load_board(source, cache)
+    assert os.listdir(cache) == [os.path.basename(compiled_path(Path(source).read_bytes(), cache))]
+    monkeypatch.setattr(boardcompiler, "compile_file", lambda *args: pytest.fail("compiled again on a cache hit"))
+    assert same_board(load_board(source, cache), first)
+
+
+@pytest.mark.parametrize("damage", [b"", b"CLBD", b"not a board at all", "truncate"])
+def test_damaged_cache_file_is_recompiled(tmp_path, damage):
+    source = text_layout(tmp_path)
+    cache = str(tmp_path / "cache")
+    load_board(source, cache)
+    path = compiled_path(Path(source).read_bytes(), cache)
+    good = Path(path).read_bytes()
+    Path(path).write_bytes(good[:len(good) // 2] if damage == "truncate" else damage)
+    assert read_compiled(path) is None
+    assert same_board(load_board(source, cache), BOARD)
+    assert Path(path).read_bytes() == good
+
+
+def test_cache_key_covers_content_and_configuration(monkeypatch):
+    layout = format_text(builtin_layout()).encode()
+    key = compiled_path(layout, "cache")
+    assert compiled_path(layout + b"\n", "cache") != key
+    monkeypatch.setattr(board, "START_POSITIONS", {**board.START_POSITIONS, "Sherlock": (3, 3)})
+    assert compiled_path(layout, "cache") != key
+
+
+def test_unwritable_cache_still_gives_a_board(tmp_path):
+    source = text_layout(tmp_path)
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    layout = Path(source).read_bytes()
+    assert same_board(compile_file(source, layout, str(blocker / "cache")), BOARD)
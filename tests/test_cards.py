@@ -0,0 +1,54 @@
+from cards import ALL_CARDS, CARD_BITS, CATEGORY_MASKS, FULL_MASK, cards_of, is_single, lowest_card, mask_of
+from configurations import CHARACTERS, ROOM_NAMES, WEAPONS
+from player import Player
+
+
+def test_every_card_has_its_own_bit():
+    assert len(set(CARD_BITS.values())) == len(ALL_CARDS)
+    assert FULL_MASK == (1 << len(ALL_CARDS)) - 1
+    assert sum(CATEGORY_MASKS.values()) == FULL_MASK
+
+
+def test_mask_round_trip_keeps_deck_order():
+    cards = ["Study", "Sherlock", "Rat Poison"]
+    assert cards_of(mask_of(cards)) == ["Sherlock", "Rat Poison", "Study"]
+    assert cards_of(0) == []
+
+
+def test_lowest_card_and_is_single():
+    assert lowest_card(CATEGORY_MASKS["weapon"]) == WEAPONS[0]
+    assert lowest_card(0) is None
+    assert is_single(CARD_BITS["Hall"])
+    assert not is_single(0)
+    assert not is_single(mask_of(["Hall", "Study"]))
+
+
+def test_ai_rules_out_its_own_cards():
+    player = Player("Sherlock", (0, 0), is_ai=True)
+    player.receive_card("Watson")
+    player.receive_card("Hall")
+    assert player.cards == ["Watson", "Hall"]
+    assert player.possible_solution["character"] == set(CHARACTERS) - {"Watson"}
+    assert player.possible_solution["room"] == set(ROOM_NAMES) - {"Hall"}
+
+
+def test_human_possible_mask_is_untouched():
+    player = Player("Sherlock", (0, 0))
+    player.receive_card("Watson")
+    assert player.possible_mask == FULL_MASK
+
+
+def test_unrefuted_suggestion_narrows_without_an_engine():
+    player = Player("Sherlock", (0, 0), is_ai=True)
+    player.observe_suggestion("Ivy", "Iron", "Study", None, CHARACTERS[:3])
+    assert player.should_accuse()
+    assert player.make_accusation() == ("Ivy", "Iron", "Study")
+    assert player.not_have["Watson"] == {"Ivy", "Iron", "Study"}
+    assert "Sherlock" not in player.not_have_masks
+
+
+def test_shown_card_is_known_and_ruled_out():
+    player = Player("Sherlock", (0, 0), is_ai=True)
+    player.update_knowledge_from_refutation("Sherlock", ("Ivy", "Iron", "Study"), "Watson", "Iron")
+    assert player.known_cards == {"Watson": {"Iron"}}
+    assert "Iron" not in player.possible_solution["weapon"]
@@ -0,0 +1,46 @@
+from cluedo import CluedoGame
+from gamelog import NULL
+
+
+def game(num_players=4, seed=3):
+    return CluedoGame(num_players, ai_seats=range(num_players), seed=seed, log=NULL)
+
+
+def test_card_index_matches_the_hands():
+    g = game()
+    for seat, player in enumerate(g.players):
+        for card in player.cards:
+            assert g.card_holder[card] == seat
+    assert not set(g.solution) & g.card_holder.keys()
+
+
+def test_refuted_by_the_first_holder_clockwise():
+    g = game()
+    far, near = g.players[3].cards[0], g.players[1].cards[0]
+    refuter, shown = g.refute(g.players[0], (g.solution[0], far, near))
+    assert refuter is g.players[1]
+    assert shown == near
+
+
+def test_clockwise_order_wraps_past_the_last_seat():
+    g = game()
+    far, near = g.players[1].cards[0], g.players[0].cards[0]
+    refuter, shown = g.refute(g.players[2], (far, near, g.solution[2]))
+    assert refuter is g.players[0]
+    assert shown == near
+
+
+def test_suggester_never_refutes_its_own_suggestion():
+    g = game()
+    suggester = g.players[2]
+    refuter, shown = g.refute(suggester, (suggester.cards[0], g.solution[1], g.solution[2]))
+    assert (refuter, shown) == (None, None)
+
+
+def test_shown_card_is_one_the_refuter_holds():
+    g = game(seed=8)
+    holder = g.players[1]
+    suggestion = (holder.cards[0], g.solution[1], g.solution[2])
+    refuter, shown = g.refute(g.players[0], suggestion)
+    assert refuter is holder
+    assert shown in holder.cards and shown in suggestion
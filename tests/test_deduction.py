@@ -0,0 +1,88 @@
+import pytest
+
+from cards import CHARACTER_MASK, FULL_MASK, mask_of
+from configurations import CHARACTERS
+from deduction import ContradictionError, DeductionEngine
+
+NAMES = CHARACTERS[:3]
+
+
+def engine():
+    return DeductionEngine(NAMES, [6, 6, 6])
+
+
+def test_own_hand_is_held_and_everything_else_lacked():
+    e = engine()
+    hand = ["Watson", "Ivy", "Iron", "Bust", "Hall", "Study"]
+    e.learn_hand("Sherlock", hand)
+    assert e.has_mask("Sherlock") == mask_of(hand)
+    assert e.lacks_mask("Sherlock") == FULL_MASK & ~mask_of(hand)
+    for other in ("Watson", "Daniel"):
+        assert e.lacks_mask(other) & mask_of(hand) == mask_of(hand)
+    assert e.solution_mask() & mask_of(hand) == 0
+
+
+def test_unrefuted_suggestion_puts_the_cards_in_the_suggester_hand_or_envelope():
+    e = engine()
+    suggestion = ("Ivy", "Iron", "Study")
+    e.record_suggestion("Sherlock", suggestion, None)
+    assert e.lacks_mask("Watson") & mask_of(suggestion) == mask_of(suggestion)
+    assert e.lacks_mask("Daniel") & mask_of(suggestion) == mask_of(suggestion)
+    assert e.lacks_mask("Sherlock") & mask_of(suggestion) == 0
+
+
+def test_players_before_the_refuter_lack_the_cards():
+    e = engine()
+    suggestion = ("Ivy", "Iron", "Study")
+    e.record_suggestion("Sherlock", suggestion, "Daniel")
+    assert e.lacks_mask("Watson") & mask_of(suggestion) == mask_of(suggestion)
+    assert e.lacks_mask("Daniel") & mask_of(suggestion) == 0
+
+
+def test_unseen_refutation_resolves_once_two_cards_are_ruled_out():
+    e = engine()
+    e.record_suggestion("Sherlock", ("Ivy", "Iron", "Study"), "Watson")
+    assert not e.has_mask("Watson")
+    e.learn_has("Daniel", "Ivy")
+    assert not e.has_mask("Watson")
+    e.learn_has("Sherlock", "Iron")
+    assert e.has_mask("Watson") == mask_of(["Study"])
+
+
+def test_envelope_takes_the_last_card_of_a_category():
+    e = engine()
+    for name, card in zip(NAMES * 2, CHARACTERS[:5]):
+        e.learn_has(name, card)
+    assert e.solution_mask() & CHARACTER_MASK == mask_of(["Lilith"])
+    assert e.has[e.envelope] & mask_of(["Lilith"])
+
+
+def test_solved_once_one_card_per_category_is_left():
+    e = engine()
+    hands = [
+        ["Sherlock", "Watson", "Trophy", "Iron", "Study", "Hall"],
+        ["Daniel", "Ivy", "Bust", "Fire Poker", "Lounge", "Library"],
+        ["James", "Meat Tenderizer", "Gaming Room", "Dining Room", "Theater", "Fireplace"],
+    ]
+    for name, hand in zip(NAMES[:2], hands[:2]):
+        e.learn_hand(name, hand)
+    assert not e.is_solved()
+    e.learn_hand("Daniel", hands[2])
+    assert e.is_solved()
+    assert e.solution_mask() == mask_of(["Lilith", "Rat Poison", "Kitchen"])
+
+
+def test_conflicting_facts_raise():
+    e = engine()
+    e.learn_has("Watson", "Ivy")
+    with pytest.raises(ContradictionError):
+        e.learn_has("Daniel", "Ivy")
+
+
+def test_copy_is_independent():
+    e = engine()
+    e.learn_has("Watson", "Ivy")
+    other = e.copy()
+    other.learn_has("Daniel", "Iron")
+    assert not e.has_mask("Daniel")
+    assert other.has_mask("Watson") == e.has_mask("Watson")
@@ -0,0 +1,61 @@
+import io
+
+import pytest
+
+from cluedo import CluedoGame
+from events import ACCUSATION, SEED_LIMIT, START, EventLog, append_to_archive, read_archive
+from gamelog import NULL
+from simulation import run_game
+
+
+def recorded(seed):
+    return EventLog.from_bytes(run_game(4, seed=seed, record=True).events)
+
+
+def test_binary_round_trip():
+    log = recorded(3)
+    assert log.events[0] == (START, (4, 0b1111, 3))
+    assert EventLog.from_bytes(log.to_bytes()) == log
+
+
+def test_recording_is_deterministic():
+    assert run_game(4, seed=9, record=True).events == run_game(4, seed=9, record=True).events
+
+
+def test_archive_holds_games_back_to_back():
+    logs = [recorded(seed) for seed in range(3)]
+    archive = io.BytesIO()
+    for log in logs:
+        append_to_archive(archive, log)
+    archive.seek(0)
+    assert list(read_archive(archive)) == logs
+
+
+def test_unknown_cards_are_stored_as_no_card():
+    log = EventLog()
+    log.accusation(0, ("Nobody", "Iron", "Hall"), False)
+    assert EventLog.from_bytes(log.to_bytes()).events == [(ACCUSATION, (0, 255, 7, 13, 0))]
+
+
+def test_rejects_other_data():
+    with pytest.raises(ValueError):
+        EventLog.from_bytes(b"XXXX\x01")
+
+
+@pytest.mark.parametrize("seed", [-1, SEED_LIMIT])
+def test_seeds_the_log_cannot_store_are_rejected(seed):
+    with pytest.raises(ValueError):
+        CluedoGame(2, ai_seats=[0, 1], seed=seed, log=NULL)
+
+
+def test_largest_seed_round_trips():
+    game = CluedoGame(2, ai_seats=[0, 1], seed=SEED_LIMIT - 1, log=NULL)
+    assert EventLog.from_bytes(game.events.to_bytes()).events[0][1][2] == SEED_LIMIT - 1
+
+
+def test_thinking_rng_depends_only_on_seed_seat_turn_and_purpose():
+    game = CluedoGame(2, ai_seats=[0, 1], seed=4, log=NULL)
+    draw = game.thinking_rng(1, 7, "suggest").random()
+    assert game.thinking_rng(1, 7, "suggest").random() == draw
+    assert game.thinking_rng(1, 7, "accuse").random() != draw
+    assert game.thinking_rng(0, 7, "suggest").random() != draw
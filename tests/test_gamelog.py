@@ -0,0 +1,67 @@
+import io
+import json
+
+from gamelog import DEBUG, INFO, NULL, BufferSink, ConsoleSink, JsonLinesSink
+from simulation import run_game
+
+
+class Unformattable:
+    # Fails the test if a sink ever formats it.
+    def __format__(self, spec):
+        raise AssertionError("formatted a message the sink doesn't want")
+
+
+def test_silent_sinks_never_format():
+    NULL.debug("{}", Unformattable())
+    NULL.info("{}", Unformattable())
+    BufferSink(level=INFO).debug("{}", Unformattable())
+    ConsoleSink(level=INFO, stream=io.StringIO()).debug("{}", Unformattable())
+    assert not NULL.enabled(INFO)
+
+
+def test_buffer_sink_keeps_lines_until_drained():
+    log = BufferSink(level=DEBUG)
+    log.info("{} rolled a {}.", "Ivy", 4)
+    log.debug("plain {braces} without args")
+    assert log.drain() == ["Ivy rolled a 4.", "plain {braces} without args"]
+    assert log.drain() == []
+
+
+def test_console_sink_writes_in_batches():
+    stream = io.StringIO()
+    log = ConsoleSink(stream=stream, batch_lines=3)
+    log.info("one")
+    log.debug("{}", "two")
+    assert stream.getvalue() == ""
+    log.info("three")
+    assert stream.getvalue() == "one\ntwo\nthree\n"
+    log.info("four")
+    log.flush()
+    assert stream.getvalue().endswith("three\nfour\n")
+
+
+def test_console_sink_follows_sys_stdout(capsys):
+    log = ConsoleSink()
+    log.info("hello {}", "table")
+    log.close()
+    assert capsys.readouterr().out == "hello table\n"
+
+
+def test_json_lines_sink_keeps_the_template_and_arguments():
+    stream = io.StringIO()
+    log = JsonLinesSink(stream, level=INFO)
+    log.debug("hidden")
+    log.info("{} suggests {}", "Ivy", ("Iron",))
+    (line,) = stream.getvalue().splitlines()
+    record = json.loads(line)
+    assert record["level"] == "info"
+    assert record["text"] == "Ivy suggests ('Iron',)"
+    assert record["template"] == "{} suggests {}"
+    assert record["args"] == ["Ivy", ["Iron"]]
+
+
+def test_quiet_games_print_nothing(capsys):
+    run_game(3, seed=1)
+    assert capsys.readouterr().out == ""
+    run_game(3, seed=1, quiet=False)
+    assert "Turn ---" in capsys.readouterr().out
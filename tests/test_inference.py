@@ -0,0 +1,53 @@
+import random
+
+from cards import CARD_INDEX, CATEGORY_MASKS, mask_of
+from configurations import CHARACTERS
+from deduction import DeductionEngine
+from inference import information_gain, sample_deals, solution_probabilities
+
+NAMES = CHARACTERS[:3]
+HAND = ["Watson", "Ivy", "Iron", "Bust", "Hall", "Study"]
+
+
+def engine():
+    e = DeductionEngine(NAMES, [6, 6, 6])
+    e.learn_hand("Sherlock", HAND)
+    e.record_suggestion("Sherlock", ("Daniel", "Trophy", "Lounge"), "Watson")
+    e.learn_has("Daniel", "Trophy")
+    return e
+
+
+def test_samples_agree_with_every_known_fact():
+    e = engine()
+    samples = sample_deals(e, 50, rng=random.Random(1))
+    assert samples
+    for owner_of in samples:
+        assert owner_of.count(e.envelope) == 3
+        for mask in CATEGORY_MASKS.values():
+            assert sum(1 for card, owner in enumerate(owner_of) if owner == e.envelope and mask >> card & 1) == 1
+        for owner, size in enumerate(e.sizes):
+            held = mask_of(card for card in CARD_INDEX if owner_of[CARD_INDEX[card]] == owner)
+            assert held.bit_count() == size
+            assert held & e.has[owner] == e.has[owner]
+            assert not held & e.lacks[owner]
+        assert owner_of[CARD_INDEX["Daniel"]] == 1 or owner_of[CARD_INDEX["Lounge"]] == 1
+
+
+def test_sampling_is_reproducible_from_the_rng():
+    e = engine()
+    assert sample_deals(e, 20, rng=random.Random(5)) == sample_deals(e, 20, rng=random.Random(5))
+
+
+def test_probabilities_only_cover_open_solution_cards():
+    e = engine()
+    probabilities = solution_probabilities(sample_deals(e, 50, rng=random.Random(2)), e.envelope)
+    assert all(probabilities[card] == 0 for card in HAND + ["Trophy"])
+    assert abs(sum(probabilities.values()) - 3) < 1e-9
+    assert solution_probabilities([], e.envelope) == {}
+
+
+def test_a_suggestion_everyone_can_answer_the_same_way_tells_nothing():
+    # Sherlock holds all three, so nobody else can ever refute
+    samples = sample_deals(engine(), 20, rng=random.Random(3))
+    own = tuple(CARD_INDEX[card] for card in ("Watson", "Iron", "Hall"))
+    assert information_gain(samples, 0, 3, own) == 0
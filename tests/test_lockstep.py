@@ -0,0 +1,38 @@
+import random
+from array import array
+
+import pytest
+
+from lockstep import Fields, LockstepBatch, simulate_lockstep
+from simulation import run_game
+
+
+@pytest.mark.parametrize("num_players", [2, 3, 4, 5, 6])
+def test_every_game_matches_the_object_engine(num_players):
+    results = simulate_lockstep(12, num_players, seed=100)
+    assert results == [run_game(num_players, 100 + i) for i in range(12)]
+
+
+def test_batches_split_the_games_without_changing_them():
+    assert simulate_lockstep(10, 4, seed=7, batch=3) == simulate_lockstep(10, 4, seed=7)
+
+
+def test_turn_cap_matches_run_game():
+    assert simulate_lockstep(6, 6, seed=0, max_turns=5) == [run_game(6, i, max_turns=5) for i in range(6)]
+
+
+def test_rejects_bad_player_counts():
+    with pytest.raises(ValueError):
+        LockstepBatch(1, 7)
+
+
+def test_field_helpers_agree_with_scalar_code():
+    rng = random.Random(3)
+    values = [0, 1, 1 << 20, 3, (1 << 21) - 1] + [rng.getrandbits(21) for _ in range(50)]
+    fields = Fields(len(values))
+    packed = fields.pack(array("I", values))
+    assert list(fields.unpack(packed)) == values
+    assert list(fields.unpack(fields.nonzero(packed))) == [int(v != 0) for v in values]
+    assert list(fields.unpack(fields.single(packed))) == [int(v != 0 and v & (v - 1) == 0) for v in values]
+    for count in (0, 1, 2, 10, 21):
+        assert list(fields.unpack(fields.count_equals(packed, count))) == [int(v.bit_count() == count) for v in values]
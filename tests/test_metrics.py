@@ -0,0 +1,72 @@
+import time
+
+from board import BOARD
+from cluedo import CluedoGame
+from gamelog import NULL
+from metrics import PHASES, Metrics, profile_run
+from simulation import run_game
+from turnmanager import TurnManager
+
+
+def test_phase_counts_calls_and_time():
+    metrics = Metrics()
+    for _ in range(3):
+        with metrics.phase("roll"):
+            pass
+    metrics.count("eliminations", 2)
+    snapshot = metrics.snapshot()
+    assert snapshot["phases"]["roll"]["calls"] == 3
+    assert snapshot["phases"]["roll"]["wall_s"] >= 0
+    assert snapshot["counters"] == {"eliminations": 2}
+
+
+def test_merge_adds_up_registries():
+    first, second = Metrics(), Metrics()
+    with first.phase("roll"):
+        pass
+    with second.phase("roll"):
+        pass
+    second.count("accusations")
+    first.merge(second)
+    assert first.timings["roll"][0] == 2
+    assert first.counters == {"accusations": 1}
+
+
+def test_report_lists_phases_in_turn_order():
+    metrics = Metrics()
+    for name in reversed(PHASES):
+        with metrics.phase(name):
+            pass
+    rows = [line.split()[0] for line in metrics.report().splitlines()[1:]]
+    assert rows == list(PHASES)
+
+
+def test_a_game_fills_the_phases_without_changing_its_outcome():
+    metrics = Metrics()
+    assert run_game(4, seed=5, metrics=metrics) == run_game(4, seed=5)
+    assert {"roll", "suggestion", "refutation", "knowledge"} <= metrics.timings.keys()
+
+
+def test_human_input_is_not_timed():
+    game = CluedoGame(2, ai_seats=[1], seed=2, log=NULL)
+    metrics = Metrics()
+    manager = TurnManager(game, interactive=False, metrics=metrics)
+    player = game.players[0]
+    player.position = BOARD.room_tile("Kitchen")
+    answers = iter(["", "SECRET_PASSAGE_TO_STUDY", "Ivy", "Iron"])
+
+    def slow_answer(prompt):
+        time.sleep(0.05)
+        return next(answers)
+
+    manager.ask = slow_answer
+    manager.play_turn(player)
+    assert {"roll", "movement", "refutation"} <= metrics.timings.keys()
+    assert all(wall < 0.05 for _, wall, _ in metrics.timings.values())
+
+
+def test_profile_run_plays_the_game():
+    game = CluedoGame(3, ai_seats=range(3), seed=1, log=NULL)
+    manager = TurnManager(game, interactive=False)
+    assert "function calls" in profile_run(manager, max_turns=20, limit=5)
+    assert manager.turns_played > 0
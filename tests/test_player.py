@@ -0,0 +1,62 @@
+import pytest
+
+from cards import mask_of
+from player import Player, SuggestionHistory
+
+ENTRIES = [
+    ("Ivy", "Iron", "Hall", "Watson"),
+    ("Lilith", "Bust", "Study", None),
+    ("Sherlock", "Trophy", "Kitchen", "Daniel"),
+    ("Ivy", "Rat Poison", "Hall", "Lilith"),
+]
+
+
+def test_reads_back_what_was_appended():
+    history = SuggestionHistory(ENTRIES)
+    assert len(history) == 4
+    assert list(history) == ENTRIES
+    assert history[0] == ENTRIES[0]
+    assert history[-1] == ENTRIES[-1]
+
+
+def test_index_out_of_range():
+    history = SuggestionHistory(ENTRIES)
+    with pytest.raises(IndexError):
+        history[4]
+    with pytest.raises(IndexError):
+        history[-5]
+
+
+@pytest.mark.parametrize("index", [slice(-3, None), slice(None, 2), slice(None, None, 2), slice(None, None, -1), slice(5, 9)])
+def test_slices_are_lists_of_entries(index):
+    assert SuggestionHistory(ENTRIES)[index] == ENTRIES[index]
+
+
+def test_names_without_a_card_are_kept_as_given():
+    entries = ENTRIES[:1] + [("Colonel Mustard", "Iron", "Hall", "Watson")] + ENTRIES[1:]
+    history = SuggestionHistory(entries)
+    assert list(history) == entries
+    assert history[1:3] == entries[1:3]
+    assert history == entries
+
+
+def test_equality():
+    history = SuggestionHistory(ENTRIES)
+    assert history == SuggestionHistory(ENTRIES)
+    assert history == ENTRIES
+    assert history == tuple(ENTRIES)
+    assert history != ENTRIES[:-1]
+    assert history != SuggestionHistory(ENTRIES[::-1])
+    assert history != SuggestionHistory(ENTRIES[:1] + [("Colonel Mustard", "Iron", "Hall", "Watson")])
+    assert history != "not a history"
+
+
+def test_rooms_mask_tracks_every_room_suggested_in():
+    history = SuggestionHistory(ENTRIES)
+    assert history.rooms == mask_of(["Hall", "Study", "Kitchen"])
+
+
+def test_player_is_slotted():
+    player = Player("Sherlock", (0, 0))
+    with pytest.raises(AttributeError):
+        player.nickname = "S"
@@ -0,0 +1,39 @@
+import pytest
+
+from cluedo import CluedoGame
+from events import EventLog
+from gamelog import NULL
+from replay import replay
+from turnmanager import TurnManager
+
+
+def played(seed, num_players=4):
+    game = CluedoGame(num_players, ai_seats=range(num_players), seed=seed, log=NULL)
+    TurnManager(game, interactive=False).run(200)
+    return game
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_replay_rebuilds_the_live_game(seed):
+    game = played(seed)
+    state = replay(EventLog.from_bytes(game.events.to_bytes()))
+    assert state.solution == game.solution
+    assert state.positions == [player.position for player in game.players]
+    assert state.eliminated == {seat for seat, player in enumerate(game.players) if player.eliminated}
+    assert (game.players[state.winner].name if state.winner is not None else None) == game.winner
+    for seat, player in enumerate(game.players):
+        assert sorted(state.hands[seat]) == sorted(player.cards)
+        assert state.engines[seat].has == player.deduction.has
+        assert state.engines[seat].lacks == player.deduction.lacks
+
+
+def test_on_event_sees_every_event_after_start():
+    game = played(1)
+    seen = []
+    replay(game.events, on_event=lambda state, kind, payload: seen.append((kind, payload)))
+    assert seen == game.events.events[1:]
+
+
+def test_log_must_begin_with_start():
+    with pytest.raises(ValueError):
+        replay(EventLog())
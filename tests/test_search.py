@@ -0,0 +1,83 @@
+import random
+import time
+
+import pytest
+
+from cards import CARD_INDEX, CATEGORY_MASKS, cards_of
+from configurations import CHARACTERS
+from deduction import DeductionEngine
+from inference import sample_deals
+from player import Player
+from search import SearchStrategy, search
+from simulation import run_game
+
+NAMES = CHARACTERS[:3]
+HAND = ["Watson", "Ivy", "Iron", "Bust", "Hall", "Study"]
+
+
+def player():
+    p = Player("Sherlock", (0, 0), is_ai=True)
+    for card in HAND:
+        p.receive_card(card)
+    p.start_deduction(NAMES, [6, 6, 6])
+    return p
+
+
+def test_root_visits_add_up_to_the_iterations():
+    engine = player().deduction
+    samples = sample_deals(engine, 50, rng=random.Random(1))
+    candidates = [(CARD_INDEX["Daniel"], CARD_INDEX["Trophy"], CARD_INDEX["Lounge"]),
+                  (CARD_INDEX["James"], CARD_INDEX["Trophy"], CARD_INDEX["Library"])]
+    totals = search(engine, "Sherlock", samples, candidates, None, seed=2, max_iterations=40)
+    assert set(totals) <= set(candidates)
+    assert sum(visits for visits, _ in totals.values()) == 40
+
+
+def test_fixed_iterations_are_reproducible():
+    strategy = SearchStrategy(max_iterations=30)
+    first = strategy.choose_suggestion(player(), random.Random(4))
+    assert first == strategy.choose_suggestion(player(), random.Random(4))
+    possible = player().deduction.solution_mask()
+    for card, mask in zip(first, CATEGORY_MASKS.values()):
+        assert card in cards_of(possible & mask)
+
+
+def test_solved_engine_accuses_the_solution():
+    p = player()
+    p.deduction.learn_hand("Watson", ["Sherlock", "Daniel", "Trophy", "Fire Poker", "Lounge", "Library"])
+    p.deduction.learn_hand("Daniel", ["James", "Meat Tenderizer", "Gaming Room", "Dining Room", "Theater", "Fireplace"])
+    assert SearchStrategy(max_iterations=5).choose_accusation(p) == ("Lilith", "Rat Poison", "Kitchen")
+
+
+def test_decision_ends_near_its_budget():
+    strategy = SearchStrategy(budget=0.05)
+    start = time.perf_counter()
+    assert strategy.choose_suggestion(player(), random.Random(1)) is not None
+    assert time.perf_counter() - start < 0.5
+
+
+def test_sampling_deadline_runs_from_the_decision_start():
+    strategy = SearchStrategy(budget=0.4)
+    engine = player().deduction
+    late = strategy._samples(engine, time.perf_counter() - 1.0, random.Random(1))
+    assert len(late) < 16  # the deadline had passed, sampling stops at its first clock check
+    assert len(strategy._samples(engine, time.perf_counter(), random.Random(1))) > 16
+
+
+def test_thread_workers_merge_their_visits():
+    strategy = SearchStrategy(workers=2, executor="thread", max_iterations=20)
+    try:
+        assert strategy.choose_suggestion(player(), random.Random(3)) is not None
+    finally:
+        strategy.close()
+
+
+def test_games_with_a_fixed_iteration_search_are_reproducible():
+    def play():
+        return run_game(3, seed=6, strategies={0: SearchStrategy(max_iterations=20)})
+    assert play() == play()
+
+
+def test_rejects_unknown_executors():
+    with pytest.raises(ValueError):
+        SearchStrategy(executor="fiber")
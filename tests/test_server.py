@@ -0,0 +1,149 @@
+import asyncio
+
+from board import BOARD
+from server import GameServer, Table
+
+TIMEOUT = 10
+
+
+class Client:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    async def send(self, *lines):
+        self.writer.write("".join(line + "\n" for line in lines).encode())
+        await self.writer.drain()
+
+    async def until(self, text):
+        #lines up to and including the first one containing text
+        lines = []
+        while True:
+            line = await asyncio.wait_for(self.reader.readline(), TIMEOUT)
+            if not line:
+                raise ConnectionError(f"closed before {text!r}, got {lines}")
+            lines.append(line.decode().rstrip("\n"))
+            if text in lines[-1]:
+                return lines
+
+    async def close(self):
+        self.writer.close()
+        await asyncio.sleep(0.05) #let the server notice
+
+
+def serve(scenario):
+    async def main():
+        server = GameServer()
+        listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+
+        async def connect():
+            client = Client(*await asyncio.open_connection("127.0.0.1", port))
+            await client.until("WELCOME")
+            return client
+
+        try:
+            await scenario(server, connect)
+        finally:
+            listener.close()
+            for table in list(server.tables.values()):
+                table.task.cancel()
+    asyncio.run(main())
+
+
+def test_table_closes_when_its_last_waiting_client_leaves():
+    async def scenario(server, connect):
+        creator = await connect()
+        await creator.send("NEW 3 2")
+        await creator.until("TABLE 1 SEAT 0")
+        await creator.close()
+        assert not server.tables
+        other = await connect()
+        await other.send("JOIN 1")
+        await other.until("ERROR")
+    serve(scenario)
+
+
+def test_seat_reopens_when_a_client_leaves_the_lobby():
+    async def scenario(server, connect):
+        creator = await connect()
+        await creator.send("NEW 4 3")
+        await creator.until("TABLE 1 SEAT 0")
+        leaver = await connect()
+        await leaver.send("JOIN 1")
+        await leaver.until("SEAT 1")
+        await leaver.close()
+        assert server.tables[1].open_seats() == 2
+        lister = await connect()
+        await lister.send("LIST")
+        assert (await lister.until("TABLES"))[-1] == "TABLES 1 (2 open)"
+    serve(scenario)
+
+
+def test_dropped_seat_is_never_handed_to_a_newcomer():
+    async def scenario(server, connect):
+        first = await connect()
+        await first.send("NEW 3 2")
+        await first.until("SEAT 0")
+        second = await connect()
+        await second.send("JOIN 1")
+        await second.until("GAME START")
+        await first.until("Enter your move")
+        await second.close()
+        # Sherlock moves, Watson's turn finds the connection gone, the AI plays, then Sherlock is asked again
+        await first.send("DOWN 1")
+        await first.until("Watson disconnected")
+        await first.until("Enter your move")
+        table = server.tables[1]
+        assert table.dropped == {1}
+        assert table.game.players[1].eliminated
+        newcomer = await connect()
+        await newcomer.send("LIST")
+        assert (await newcomer.until("TABLES"))[-1] == "TABLES none waiting"
+        await newcomer.send("JOIN 1")
+        await newcomer.until("ERROR")
+        assert table.dropped == {1}
+        await first.send("ACCUSE", "x", "y", "z")
+        await first.until("GAME OVER")
+    serve(scenario)
+
+
+def test_started_table_refuses_joins():
+    async def scenario(server, connect):
+        solo = await connect()
+        await solo.send("NEW 2 1")
+        await solo.until("GAME START")
+        other = await connect()
+        await other.send("JOIN 1")
+        await other.until("ERROR")
+        await other.send("LIST")
+        assert (await other.until("TABLES"))[-1] == "TABLES none waiting"
+    serve(scenario)
+
+
+class ScriptedSeat:
+    # Stands in for a connection: answers prompts from a list and keeps everything sent to it.
+
+    def __init__(self, answers):
+        self.answers = iter(answers)
+        self.sent = []
+
+    async def send(self, text):
+        self.sent.append(text)
+
+    async def ask(self, prompt):
+        self.sent.append(prompt)
+        return next(self.answers)
+
+
+def test_invalid_secret_passage_asks_again():
+    table = Table(1, 2, 1, seed=3)
+    player = table.game.players[0]
+    player.position = BOARD.room_tile("Kitchen")
+    seat = ScriptedSeat(["SECRET_PASSAGE_TO_HALL", "SECRET_PASSAGE_TO_STUDY", "Ivy", "Iron"])
+    table.seats = [seat]
+    asyncio.run(table.human_turn(player, seat))
+    assert "Invalid secret passage." in seat.sent
+    assert "Sherlock uses a secret passage to the Study." in seat.sent
+    assert player.position == BOARD.room_tile("Study")
+    assert sum("Make a suggestion" in line for line in seat.sent) == 1
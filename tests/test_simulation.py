@@ -0,0 +1,35 @@
+from configurations import CHARACTERS
+from simulation import GameResult, run_game, simulate_games, summarize
+
+
+def test_run_game_is_reproducible_from_its_seed():
+    assert run_game(4, seed=11) == run_game(4, seed=11)
+
+
+def test_run_game_plays_to_a_result():
+    result = run_game(3, seed=2)
+    assert result.seed == 2
+    assert result.winner is None or result.winner in CHARACTERS[:3]
+    assert result.winner not in result.eliminated
+    assert result.turns > 0
+    assert result.events is None
+
+
+def test_simulate_games_seeds_game_i_with_seed_plus_i():
+    results = simulate_games(5, num_players=3, workers=1, seed=40)
+    assert results == [run_game(3, seed=40 + i) for i in range(5)]
+
+
+def test_summarize_counts_wins_and_turns():
+    results = [
+        GameResult(0, "Sherlock", 10, (), ("Sherlock", "Trophy", "Hall")),
+        GameResult(1, "Sherlock", 20, ("Watson",), ("Watson", "Iron", "Study")),
+        GameResult(2, None, 30, ("Sherlock", "Watson"), ("Ivy", "Bust", "Lounge")),
+    ]
+    stats = summarize(results)
+    assert stats["games"] == 3
+    assert stats["finished"] == 2
+    assert stats["wins"] == {"Sherlock": 2}
+    assert stats["mean_turns"] == 20
+    assert stats["mean_eliminated"] == 1
+    assert summarize([])["mean_turns"] == 0.0
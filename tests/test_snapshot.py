@@ -0,0 +1,67 @@
+import pytest
+
+from cluedo import CluedoGame
+from gamelog import NULL
+from snapshot import fork, from_bytes, restore, resume, snapshot, to_bytes
+from turnmanager import TurnManager
+
+
+def manager_for(seed, num_players=5):
+    game = CluedoGame(num_players, ai_seats=range(num_players), seed=seed, log=NULL)
+    return TurnManager(game, interactive=False)
+
+
+def outcome(manager):
+    game = manager.game
+    return game.winner, manager.turns_played, [p.eliminated for p in game.players], game.events.events
+
+
+@pytest.mark.parametrize("seed", [0, 1, 3, 5])
+@pytest.mark.parametrize("pause_at", [0, 3, 10])
+def test_resumed_game_plays_out_like_the_uninterrupted_one(seed, pause_at):
+    straight = manager_for(seed)
+    straight.run()
+    paused = manager_for(seed)
+    paused.run(pause_at)
+    resumed = resume(from_bytes(to_bytes(snapshot(paused.game, paused))), log=NULL, interactive=False)
+    resumed.run()
+    assert outcome(resumed) == outcome(straight)
+
+
+def test_serialised_snapshot_round_trips():
+    manager = manager_for(1)
+    manager.run(4)
+    state = snapshot(manager.game, manager)
+    assert from_bytes(to_bytes(state)) == state
+
+
+def test_restore_rebuilds_players_and_deduction():
+    manager = manager_for(5)
+    manager.run(5)
+    game = manager.game
+    copy = restore(snapshot(game, manager), log=NULL)
+    for original, restored in zip(game.players, copy.players):
+        assert (restored.name, restored.position, restored.cards, restored.eliminated) == \
+               (original.name, original.position, original.cards, original.eliminated)
+        assert restored.suggestion_history == original.suggestion_history
+        assert restored.deduction.has == original.deduction.has
+        assert restored.deduction.lacks == original.deduction.lacks
+    assert copy.rng.getstate() == game.rng.getstate()
+
+
+def test_fork_is_independent_of_the_original():
+    manager = manager_for(3)
+    manager.run(2)
+    game = manager.game
+    before = snapshot(game, manager)
+    branch = fork(game, manager)
+    assert branch.events.events == []
+    branch.players[0].eliminated = True
+    branch.players[1].deduction.learn_has(branch.players[2].name, branch.players[2].cards[0])
+    TurnManager(branch, interactive=False).run()
+    assert snapshot(game, manager) == before
+
+
+def test_rejects_other_versions():
+    with pytest.raises(ValueError):
+        from_bytes(b"[99, []]")
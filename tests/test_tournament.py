@@ -0,0 +1,81 @@
+import statistics
+
+import pytest
+
+from tournament import RunningMean, Schedule, lineups, read_results, run_tournament, wilson_interval
+
+ENTRANTS = ["rules", "sampling"]
+OPTIONS = dict(num_players=3, rounds=2, workers=1, seed=5, budget=0.001)
+
+
+def test_lineups_seat_every_entrant_everywhere():
+    result = lineups(["a", "b"], 3)
+    assert result == [("a", "b", "a"), ("b", "a", "a"), ("a", "a", "b")]
+    for seat in range(3):
+        assert {lineup[seat] for lineup in result} == {"a", "b"}
+
+
+def test_schedule_rounds_share_a_seed():
+    schedule = Schedule(["a", "b"], 3, rounds=2, seed=10)
+    assert len(schedule) == 6
+    assert [match.seed for match in schedule] == [10, 10, 10, 11, 11, 11]
+    assert schedule[4].lineup == ("b", "a", "a")
+    with pytest.raises(IndexError):
+        schedule[6]
+
+
+@pytest.mark.parametrize("suffix", ["jsonl", "csv"])
+def test_interrupted_run_resumes_to_the_same_results(tmp_path, suffix):
+    full = tmp_path / f"full.{suffix}"
+    expected = run_tournament(ENTRANTS, str(full), **OPTIONS)
+    lines = full.read_text().splitlines(keepends=True)
+    # Killed after a few games, halfway through writing the next one
+    keep = 3 if suffix == "jsonl" else 4
+    partial = tmp_path / f"partial.{suffix}"
+    partial.write_text("".join(lines[:keep]) + lines[keep][:10])
+    played = []
+    resumed = run_tournament(ENTRANTS, str(partial), on_result=lambda result, standings: played.append(result.index), **OPTIONS)
+    assert partial.read_text() == full.read_text()
+    assert played == [3, 4, 5]
+    assert resumed.report() == expected.report()
+    assert list(read_results(str(partial))) == list(read_results(str(full)))
+
+
+def test_finished_run_plays_nothing_more(tmp_path):
+    output = str(tmp_path / "results.jsonl")
+    run_tournament(ENTRANTS, output, **OPTIONS)
+    played = []
+    run_tournament(ENTRANTS, output, on_result=lambda result, standings: played.append(result), **OPTIONS)
+    assert played == []
+
+
+def test_results_from_another_tournament_are_refused(tmp_path):
+    output = str(tmp_path / "results.jsonl")
+    run_tournament(ENTRANTS, output, **OPTIONS)
+    with pytest.raises(ValueError):
+        run_tournament(ENTRANTS, output, **{**OPTIONS, "seed": 6})
+
+
+def test_bad_entrants():
+    with pytest.raises(ValueError):
+        run_tournament(["rules", "nobody"], "unused.jsonl")
+    with pytest.raises(ValueError):
+        run_tournament(["rules", "rules"], "unused.jsonl")
+
+
+def test_running_mean_matches_statistics():
+    values = [3, 9, 4, 12, 7]
+    mean = RunningMean()
+    for value in values:
+        mean.add(value)
+    assert mean.mean == pytest.approx(statistics.mean(values))
+    low, high = mean.interval()
+    assert low < mean.mean < high
+
+
+def test_wilson_interval_stays_inside_zero_and_one():
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+    low, high = wilson_interval(10, 10)
+    assert 0.0 < low < high == 1.0
+    low, high = wilson_interval(0, 10)
+    assert low == 0.0 < high < 1.0
@@ -0,0 +1,78 @@
+from cluedo import CluedoGame
+from gamelog import INFO, NULL, BufferSink
+from player import Player
+from tracker import Tracker, display_and_save_tracker, generate_tracker_log
+from turnmanager import TurnManager
+
+
+def test_lines_hold_history_and_summary():
+    tracker = Tracker("Sherlock", "g")
+    tracker.record("Ivy", "Iron", "Hall", "Watson")
+    tracker.record("Lilith", "Bust", "Study", None)
+    tracker.record("Ivy", "Trophy", "Hall", "Daniel")
+    assert tracker.lines() == [
+        "INFO TRACKER",
+        "Your suggestion history:",
+        "  • Ivy, Iron, Hall → Refuted by Watson",
+        "  • Lilith, Bust, Study → No player refuted",
+        "  • Ivy, Trophy, Hall → Refuted by Daniel",
+        "\n Confirmed NOT in solution:",
+        "  Ivy, Iron, Hall, Trophy",
+        "\n Suspicious (no player could refute):",
+        "  • Lilith, Bust, Study",
+    ]
+
+
+def test_extend_matches_record():
+    entries = [("Ivy", "Iron", "Hall", "Watson"), ("Lilith", "Bust", "Study", None)]
+    one, many = Tracker("Sherlock", "g"), Tracker("Sherlock", "g")
+    for entry in entries:
+        one.record(*entry)
+    many.extend(entries)
+    assert one.lines() == many.lines()
+    assert one._pending == many._pending
+
+
+def test_file_is_only_appended_to(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    tracker = Tracker("Sherlock", "g")
+    tracker.record("Ivy", "Iron", "Hall", "Watson")
+    tracker.flush()
+    first = (tmp_path / tracker.filename).read_text()
+    tracker.flush()
+    assert (tmp_path / tracker.filename).read_text() == first  # nothing new, no second summary
+    tracker.record("Lilith", "Bust", "Study", None)
+    tracker.flush()
+    text = (tmp_path / tracker.filename).read_text()
+    assert text.startswith(first)
+    assert text.count("Refuted by Watson") == 1
+    assert "--- Summary after 2 suggestion(s) ---" in text
+
+
+def test_generate_tracker_log_reads_the_player_history():
+    player = Player("Sherlock", (0, 0), is_ai=True)
+    player.suggestion_history.append(("Ivy", "Iron", "Hall", "Watson"))
+    tracker = Tracker("Sherlock", "g")
+    tracker.record("Ivy", "Iron", "Hall", "Watson")
+    assert generate_tracker_log(player) == tracker.lines()
+
+
+def test_display_goes_through_the_log_sink(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    tracker = Tracker("Sherlock", "g")
+    tracker.record("Ivy", "Iron", "Hall", "Watson")
+    log = BufferSink(level=INFO)
+    display_and_save_tracker(tracker, log)
+    lines = log.drain()
+    assert lines[:len(tracker.lines())] == tracker.lines()
+    assert (tmp_path / tracker.filename).exists()
+
+
+def test_manager_tracker_catches_up_on_earlier_suggestions():
+    game = CluedoGame(3, ai_seats=[1, 2], seed=1, log=NULL)
+    manager = TurnManager(game, interactive=False)
+    player = game.players[0]
+    player.suggestion_history.append(("Ivy", "Iron", "Hall", None))
+    tracker = manager.tracker_for(player)
+    assert tracker.history_lines == ["  • Ivy, Iron, Hall → No player refuted"]
+    assert manager.tracker_for(player) is tracker
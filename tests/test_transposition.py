@@ -0,0 +1,98 @@
+import pytest
+
+from cards import CATEGORY_MASKS, lowest_card
+from configurations import CHARACTERS
+from deduction import DeductionEngine
+from player import Player
+from transposition import CachedStrategy, DecisionCache, canonical_state
+
+HAND = ["Watson", "Ivy", "Iron", "Bust", "Hall", "Study"]
+SUGGESTIONS = [("Daniel", "Trophy", "Lounge", "Watson"), ("James", "Trophy", "Library", None)]
+#swaps cards within each category, so the two games are the same up to names
+SWAP = {"Watson": "James", "James": "Watson", "Iron": "Trophy", "Trophy": "Iron", "Hall": "Kitchen", "Kitchen": "Hall"}
+
+
+def engine(names, rename=lambda card: card):
+    e = DeductionEngine(names, [6, 6, 6])
+    e.learn_hand("Sherlock", [rename(card) for card in HAND])
+    for char, weapon, room, refuter in SUGGESTIONS:
+        e.record_suggestion("Sherlock", (rename(char), rename(weapon), rename(room)), refuter)
+    return e
+
+
+def swapped(card):
+    return SWAP.get(card, card)
+
+
+def test_key_ignores_card_names_and_seat_rotation():
+    key, _ = canonical_state(engine(CHARACTERS[:3]), "Sherlock", "Hall")
+    assert canonical_state(engine(CHARACTERS[:3], swapped), "Sherlock", "Kitchen")[0] == key
+    rotated = [CHARACTERS[2], CHARACTERS[0], CHARACTERS[1]]  # same clockwise order, Sherlock no longer first
+    assert canonical_state(engine(rotated), "Sherlock", "Hall")[0] == key
+
+
+def test_key_changes_with_knowledge_and_room():
+    e = engine(CHARACTERS[:3])
+    key, _ = canonical_state(e, "Sherlock", "Hall")
+    assert canonical_state(e, "Sherlock", "Lounge")[0] != key
+    e.learn_has("Daniel", "Lilith")
+    assert canonical_state(e, "Sherlock", "Hall")[0] != key
+
+
+class LowestCards:
+    # Deterministic stand-in strategy that counts how often it is asked.
+    name = "lowest"
+
+    def __init__(self):
+        self.calls = 0
+
+    def choose_suggestion(self, player, rng=None):
+        self.calls += 1
+        possible = player.deduction.solution_mask()
+        return tuple(lowest_card(possible & mask) for mask in CATEGORY_MASKS.values())
+
+    def choose_accusation(self, player, rng=None):
+        self.calls += 1
+        return None
+
+
+def player(rename=lambda card: card):
+    p = Player("Sherlock", (0, 0), is_ai=True)
+    p.deduction = engine(CHARACTERS[:3], rename)
+    return p
+
+
+def test_cached_decision_is_replayed_in_the_new_labelling():
+    inner = LowestCards()
+    strategy = CachedStrategy(inner, DecisionCache())
+    first = strategy.choose_suggestion(player())
+    other = player(swapped)
+    assert strategy.choose_suggestion(other) == tuple(swapped(card) for card in first)
+    assert inner.calls == 1
+    assert strategy.cache.stats()["hits"] == 1
+
+
+def test_waiting_to_accuse_is_remembered():
+    inner = LowestCards()
+    strategy = CachedStrategy(inner, DecisionCache())
+    assert strategy.choose_accusation(player()) is None
+    assert strategy.choose_accusation(player(swapped)) is None
+    assert inner.calls == 1
+
+
+def test_cache_evicts_the_least_recently_used_entry():
+    cache = DecisionCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache and "a" in cache and "c" in cache
+    assert cache.get("b", "missing") == "missing"
+    assert cache.stats() == {"size": 2, "maxsize": 2, "hits": 1, "misses": 1, "evictions": 1, "hit_rate": 0.5}
+    cache.clear()
+    assert len(cache) == 0 and cache.stats()["hits"] == 0
+
+
+def test_cache_needs_room_for_one_entry():
+    with pytest.raises(ValueError):
+        DecisionCache(0)
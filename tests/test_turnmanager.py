@@ -0,0 +1,35 @@
+from board import BOARD
+from cluedo import CluedoGame
+from gamelog import INFO, BufferSink
+from turnmanager import TurnManager
+
+
+def human_game(position):
+    log = BufferSink(level=INFO)
+    game = CluedoGame(2, ai_seats=[1], seed=3, log=log)
+    game.players[0].position = position
+    return TurnManager(game, interactive=False), game.players[0], log
+
+
+def test_use_secret_passage_moves_only_through_a_real_passage():
+    manager, player, _ = human_game(BOARD.room_tile("Kitchen"))
+    assert manager.use_secret_passage(player, "SECRET_PASSAGE_TO_HALL") is None
+    assert player.position == BOARD.room_tile("Kitchen")
+    assert manager.use_secret_passage(player, "SECRET_PASSAGE_TO_STUDY") == "Study"
+    assert player.position == BOARD.room_tile("Study")
+
+
+def test_hallway_has_no_passages():
+    manager, player, _ = human_game((2, 1))
+    assert manager.use_secret_passage(player, "SECRET_PASSAGE_TO_STUDY") is None
+
+
+def test_terminal_turn_asks_again_after_an_invalid_passage_and_suggests_once():
+    manager, player, log = human_game(BOARD.room_tile("Kitchen"))
+    answers = iter(["", "SECRET_PASSAGE_TO_HALL", "SECRET_PASSAGE_TO_STUDY", "Ivy", "Iron"])
+    manager.ask = lambda prompt: next(answers)
+    manager.play_turn(player)
+    lines = log.drain()
+    assert "Invalid secret passage." in lines
+    assert player.position == BOARD.room_tile("Study")
+    assert sum(line.startswith("You suggested:") for line in lines) == 1
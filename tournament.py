@@ -0,0 +1,384 @@
+#round-robin tournaments between ai strategies, seats rotated so no entrant keeps the same turn order
+#every game is appended to the output file (jsonl, or csv by extension) as soon as it finishes and folded into running
+#standings, nothing per game is kept in memory. rerunning the same tournament on the same file resumes where it stopped
+import argparse
+import csv
+import itertools
+import json
+import math
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from dataclasses import dataclass
+from functools import partial
+
+from configurations import CHARACTERS
+from inference import DEFAULT_DECISION_BUDGET, SamplingStrategy
+from search import SearchStrategy
+from simulation import DEFAULT_MAX_TURNS, run_game
+from transposition import CachedStrategy, shared_cache
+
+ENTRANTS = {
+    "rules": lambda budget: None, #built-in lowest-card rule, no strategy object
+    "sampling": SamplingStrategy,
+    "mcts": SearchStrategy,
+}
+Z_95 = 1.96 #normal quantile for the 95% intervals
+IN_FLIGHT_PER_WORKER = 4 #games queued per worker, keeps the pool busy without submitting the whole schedule
+CSV_FIELDS = ("index", "seed", "lineup", "winner", "turns", "eliminated")
+
+_SEAT_OF = {name: seat for seat, name in enumerate(CHARACTERS)}
+_instances: dict[tuple, object] = {} #(entrant, budget, cache size) -> strategy, reused by every game a worker plays
+
+
+@dataclass(frozen=True)
+class Match:
+    """One scheduled game: its position in the schedule, the entrant in each seat and the deal seed."""
+    index: int
+    lineup: tuple[str, ...]
+    seed: int
+
+
+@dataclass(frozen=True)
+class MatchResult:
+    """Outcome of one tournament game, seats are indexes into the lineup."""
+    index: int
+    seed: int
+    lineup: tuple[str, ...]
+    winner: int | None
+    turns: int
+    eliminated: tuple[int, ...]
+
+
+def lineups(entrants: list[str], num_players: int) -> list[tuple[str, ...]]:
+    """Round robin over groups of entrants; each group fills the table in turn and is seated in every distinct rotation."""
+    size = min(len(entrants), num_players)
+    result = []
+    for group in itertools.combinations(entrants, size):
+        base = [group[seat % size] for seat in range(num_players)]
+        for shift in range(num_players):
+            lineup = tuple(base[shift:] + base[:shift])
+            if lineup not in result:
+                result.append(lineup)
+    return result
+
+
+class Schedule:
+    # Every lineup plays once per round and all lineups in a round share one deal seed, so entrants face the same deals.
+    # Match i is computed from i alone, which is what lets a resumed run check the file against the schedule.
+
+    def __init__(self, entrants: list[str], num_players: int, rounds: int, seed: int = 0):
+        self.lineups = lineups(entrants, num_players)
+        self.rounds = rounds
+        self.seed = seed
+
+    def __len__(self):
+        return self.rounds * len(self.lineups)
+
+    def __getitem__(self, index: int) -> Match:
+        if not 0 <= index < len(self):
+            raise IndexError("match index out of range")
+        round_number, position = divmod(index, len(self.lineups))
+        return Match(index, self.lineups[position], self.seed + round_number)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+class RunningMean:
+    # Welford's online mean and variance.
+    __slots__ = ("count", "mean", "_m2")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def interval(self, z: float = Z_95) -> tuple[float, float]:
+        """Normal confidence interval for the mean."""
+        if self.count < 2:
+            return (self.mean, self.mean) if self.count else (0.0, 0.0)
+        half = z * math.sqrt(self._m2 / (self.count - 1) / self.count)
+        return (self.mean - half, self.mean + half)
+
+
+def wilson_interval(wins: int, trials: int, z: float = Z_95) -> tuple[float, float]:
+    """Wilson score interval for a win rate, well behaved near 0 and 1 unlike the normal one."""
+    if not trials:
+        return (0.0, 1.0)
+    rate = wins / trials
+    denominator = 1 + z * z / trials
+    centre = (rate + z * z / (2 * trials)) / denominator
+    half = z * math.sqrt(rate * (1 - rate) / trials + z * z / (4 * trials * trials)) / denominator
+    return (max(0.0, centre - half), min(1.0, centre + half))
+
+
+class EntrantStats:
+    # Running totals for one entrant over every seat it occupied.
+    __slots__ = ("seats", "wins", "eliminated", "win_turns")
+
+    def __init__(self):
+        self.seats = 0
+        self.wins = 0
+        self.eliminated = 0
+        self.win_turns = RunningMean()
+
+
+class Standings:
+    # Online aggregation, one result at a time.
+
+    def __init__(self, num_players: int):
+        self.num_players = num_players
+        self.games = 0
+        self.unfinished = 0
+        self.turns = RunningMean()
+        self.seat_wins = [0] * num_players
+        self.entrants: dict[str, EntrantStats] = {}
+
+    def add(self, result: MatchResult):
+        self.games += 1
+        self.turns.add(result.turns)
+        for name in result.lineup:
+            self.entrants.setdefault(name, EntrantStats()).seats += 1
+        for seat in result.eliminated:
+            self.entrants[result.lineup[seat]].eliminated += 1
+        if result.winner is None:
+            self.unfinished += 1
+            return
+        self.seat_wins[result.winner] += 1
+        stats = self.entrants[result.lineup[result.winner]]
+        stats.wins += 1
+        stats.win_turns.add(result.turns)
+
+    def table(self) -> list[dict]:
+        """One row per entrant, best win rate per seat first."""
+        rows = []
+        for name, stats in self.entrants.items():
+            low, high = wilson_interval(stats.wins, stats.seats)
+            rows.append({
+                "entrant": name,
+                "seats": stats.seats,
+                "wins": stats.wins,
+                "win_rate": stats.wins / stats.seats if stats.seats else 0.0,
+                "win_rate_ci": (low, high),
+                "eliminated": stats.eliminated,
+                "mean_win_turns": stats.win_turns.mean,
+                "mean_win_turns_ci": stats.win_turns.interval(),
+            })
+        rows.sort(key=lambda row: -row["win_rate"])
+        return rows
+
+    def report(self) -> str:
+        low, high = self.turns.interval()
+        lines = [f"{self.games} games, {self.unfinished} unfinished, mean turns {self.turns.mean:.1f} [{low:.1f}, {high:.1f}]",
+                 f"  chance per seat is {1 / self.num_players:.3f}; win rate per seat with 95% interval:"]
+        for row in self.table():
+            rate_low, rate_high = row["win_rate_ci"]
+            lines.append(f"  {row['entrant']:>10}: {row['win_rate']:.3f} [{rate_low:.3f}, {rate_high:.3f}]  "
+                         f"{row['wins']}/{row['seats']} seats, {row['eliminated']} eliminated, wins in {row['mean_win_turns']:.1f} turns")
+        if self.games:
+            lines.append("  wins by seat: " + ", ".join(f"{seat}: {wins / self.games:.3f}" for seat, wins in enumerate(self.seat_wins)))
+        return "\n".join(lines)
+
+
+# --- result files -----------------------------------------------------
+
+def _is_csv(path: str) -> bool:
+    return path.lower().endswith(".csv")
+
+
+def _trim_torn_tail(path: str):
+    #a run killed mid-write can leave half a line at the end, drop it so appending starts on a clean line
+    with open(path, "rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        if not end:
+            return
+        f.seek(end - 1)
+        if f.read(1) == b"\n":
+            return
+        position = end
+        while position > 0:
+            step = min(4096, position)
+            f.seek(position - step)
+            newline = f.read(step).rfind(b"\n")
+            if newline >= 0:
+                position = position - step + newline + 1
+                break
+            position -= step
+        f.truncate(position)
+
+
+def _to_row(result: MatchResult) -> dict:
+    return {
+        "index": result.index,
+        "seed": result.seed,
+        "lineup": "|".join(result.lineup),
+        "winner": "" if result.winner is None else result.winner,
+        "turns": result.turns,
+        "eliminated": "|".join(map(str, result.eliminated)),
+    }
+
+
+def _from_row(row: dict) -> MatchResult:
+    return MatchResult(
+        index=int(row["index"]),
+        seed=int(row["seed"]),
+        lineup=tuple(row["lineup"].split("|")),
+        winner=None if row["winner"] in ("", None) else int(row["winner"]),
+        turns=int(row["turns"]),
+        eliminated=tuple(int(seat) for seat in str(row["eliminated"]).split("|") if seat != ""),
+    )
+
+
+def read_results(path: str):
+    """Yield every result stored in a jsonl or csv results file, in file order."""
+    with open(path, newline="") as f:
+        if _is_csv(path):
+            for row in csv.DictReader(f):
+                yield _from_row(row)
+        else:
+            for line in f:
+                if line.strip():
+                    yield _from_row(json.loads(line))
+
+
+class ResultWriter:
+    # Append-only results file, flushed after every game so a crash loses at most the game being written.
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", newline="")
+        self._csv = None
+        if _is_csv(path):
+            self._csv = csv.DictWriter(self._file, CSV_FIELDS)
+            if self._file.tell() == 0:
+                self._csv.writeheader()
+
+    def append(self, result: MatchResult):
+        row = _to_row(result)
+        if self._csv is not None:
+            self._csv.writerow(row)
+        else:
+            self._file.write(json.dumps(row, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# --- playing ----------------------------------------------------------
+
+def _entrant(name: str, budget: float, cache_size: int = 0):
+    key = (name, budget, cache_size)
+    if key not in _instances:
+        strategy = ENTRANTS[name](budget)
+        if strategy is not None and cache_size:
+            strategy = CachedStrategy(strategy, shared_cache(cache_size)) #one cache per worker, shared by its entrants
+        _instances[key] = strategy
+    return _instances[key]
+
+
+def play_match(num_players: int, max_turns: int | None, budget: float, match: Match, cache_size: int = 0) -> MatchResult:
+    """Play one scheduled game with every seat controlled by its entrant; cache_size > 0 puts decisions through a transposition cache."""
+    strategies = {seat: strategy for seat, name in enumerate(match.lineup) if (strategy := _entrant(name, budget, cache_size)) is not None}
+    result = run_game(num_players, match.seed, max_turns, strategies=strategies)
+    return MatchResult(match.index, match.seed, match.lineup, _SEAT_OF.get(result.winner), result.turns,
+                       tuple(_SEAT_OF[name] for name in result.eliminated))
+
+
+def _play_pending(play, pending, workers: int):
+    #yields results as they finish; only a bounded window of games is ever submitted
+    if workers == 1:
+        for match in pending:
+            yield play(match)
+        return
+    limit = workers * IN_FLIGHT_PER_WORKER
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        running = set()
+        for match in pending:
+            running.add(pool.submit(play, match))
+            if len(running) >= limit:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in as_completed(running):
+            yield future.result()
+
+
+def run_tournament(entrants: list[str], output: str, num_players: int = 4, rounds: int = 100, workers: int | None = None, seed: int = 0,
+                   budget: float = DEFAULT_DECISION_BUDGET, max_turns: int | None = DEFAULT_MAX_TURNS, on_result=None, cache_size: int = 0) -> Standings:
+    """Play the whole schedule, appending each game to `output` as it finishes; games already in `output` are skipped."""
+    unknown = [name for name in entrants if name not in ENTRANTS]
+    if unknown:
+        raise ValueError(f"unknown entrants {unknown}, choose from {sorted(ENTRANTS)}")
+    if not entrants or len(set(entrants)) != len(entrants):
+        raise ValueError("entrants must be a non-empty list of distinct names")
+    schedule = Schedule(entrants, num_players, rounds, seed)
+    standings = Standings(num_players)
+    done = set()
+    if os.path.exists(output):
+        _trim_torn_tail(output)
+        for result in read_results(output):
+            if not 0 <= result.index < len(schedule) or schedule[result.index].lineup != result.lineup or schedule[result.index].seed != result.seed:
+                raise ValueError(f"{output} holds results from a different tournament")
+            if result.index not in done:
+                done.add(result.index)
+                standings.add(result)
+    pending = (match for match in schedule if match.index not in done)
+    play = partial(play_match, num_players, max_turns, budget, cache_size=cache_size)
+    with ResultWriter(output) as writer:
+        for result in _play_pending(play, pending, workers or os.cpu_count() or 1):
+            writer.append(result)
+            standings.add(result)
+            if on_result is not None:
+                on_result(result, standings)
+    return standings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Round-robin tournament between AI strategies with rotated seats.")
+    parser.add_argument("--entrants", nargs="+", default=["rules", "sampling", "mcts"], choices=sorted(ENTRANTS))
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=100, help="times every lineup is played, each round on a new deal")
+    parser.add_argument("--out", default="tournament.jsonl", help="results file (.jsonl or .csv), resumed if it exists")
+    parser.add_argument("--workers", type=int, default=None, help="defaults to the number of cpus")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--budget", type=float, default=DEFAULT_DECISION_BUDGET, help="seconds per decision for thinking entrants")
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+    parser.add_argument("--cache", type=int, default=0, help="transposition cache entries per worker for thinking entrants, 0 is off")
+    parser.add_argument("--report-every", type=int, default=100, help="print standings after this many new games, 0 for only at the end")
+    args = parser.parse_args()
+
+    schedule_size = len(Schedule(args.entrants, args.players, args.rounds))
+    start = time.perf_counter()
+    played = 0
+
+    def progress(result, standings):
+        nonlocal played
+        played += 1
+        if args.report_every and played % args.report_every == 0:
+            print(f"[{standings.games}/{schedule_size}] {played / (time.perf_counter() - start):.1f} games/sec")
+            print(standings.report())
+
+    standings = run_tournament(args.entrants, args.out, args.players, args.rounds, args.workers, args.seed, args.budget, args.max_turns, progress, args.cache)
+    print(f"Played {played} new games ({standings.games}/{schedule_size} done) in {time.perf_counter() - start:.2f}s, results in {args.out}")
+    print(standings.report())
+    if args.cache and args.workers == 1:
+        print("Decision cache: " + ", ".join(f"{key} {value:.3f}" if isinstance(value, float) else f"{key} {value}" for key, value in shared_cache().stats().items()))
+
+
+if __name__ == "__main__":
+    main()
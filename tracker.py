@@ -1,39 +1,78 @@
 #tracker to assist human players
-import os
+#summaries are kept up to date as suggestions happen, and the log file is only ever appended to
+import subprocess
+
+class Tracker:
+    # One per human player per game. Writes to tracker_log_<game>_<player>.txt
+
+    def __init__(self, player_name, game_id, open_viewer: bool = False):
+        self.player_name = player_name
+        self.filename = f"tracker_log_{game_id}_{player_name}.txt"
+        self.open_viewer = open_viewer
+        self.history_lines = []
+        self.not_solution = {} #dict keeps first-seen order, values unused
+        self.suspicious = []
+        self._pending = [] #lines not yet appended to the file
+        self._summarised = -1 #how many suggestions the last written summary covered
+        self._pending.append("INFO TRACKER")
+        self._pending.append(f"Suggestion history for {player_name}:")
+
+    def record(self, char, weap, room, refuter):
+        self.extend(((char, weap, room, refuter),))
+
+    def extend(self, entries):
+        #batch form of record(), for catching up on a whole history at once
+        history, not_solution, suspicious = self.history_lines, self.not_solution, self.suspicious
+        start = len(history)
+        for char, weap, room, refuter in entries:
+            if refuter:
+                history.append(f"  • {char}, {weap}, {room} → Refuted by {refuter}")
+                for card in (char, weap, room):
+                    not_solution.setdefault(card, None)
+            else:
+                history.append(f"  • {char}, {weap}, {room} → No player refuted")
+                suspicious.append((char, weap, room))
+        self._pending.extend(history[start:])
+
+    def summary_lines(self):
+        lines = ["\n Confirmed NOT in solution:"]
+        lines.append(f"  {', '.join(self.not_solution) if self.not_solution else 'None yet'}")
+        lines.append("\n Suspicious (no player could refute):")
+        for triplet in self.suspicious:
+            lines.append(f"  • {triplet[0]}, {triplet[1]}, {triplet[2]}")
+        return lines
+
+    def lines(self):
+        return ["INFO TRACKER", "Your suggestion history:"] + self.history_lines + self.summary_lines()
+
+    def flush(self):
+        #append new history lines, plus a fresh summary block if anything changed since the last one
+        if len(self.history_lines) != self._summarised:
+            self._pending.append(f"\n--- Summary after {len(self.history_lines)} suggestion(s) ---")
+            self._pending.extend(self.summary_lines())
+            self._pending.append("")
+            self._summarised = len(self.history_lines)
+        if self._pending:
+            with open(self.filename, "a") as f:
+                f.write("\n".join(self._pending) + "\n")
+            self._pending = []
+
 
 def generate_tracker_log(player):
-    lines = []
-    lines.append("INFO TRACKER")
-    lines.append("Your suggestion history:")
-    for char, weap, room, refuter in player.suggestion_history:
-        result = f"Refuted by {refuter}" if refuter else "No player refuted"
-        lines.append(f"  • {char}, {weap}, {room} → {result}")
-    
-    not_solution = set()
-    suspicious = []
-
-    for char, weap, room, refuter in player.suggestion_history:
-        if refuter:
-            not_solution.update([char, weap, room])
-        else:
-            suspicious.append((char, weap, room))
-
-    lines.append("\n Confirmed NOT in solution:")
-    lines.append(f"  {', '.join(not_solution) if not_solution else 'None yet'}")
-
-    lines.append("\n Suspicious (no player could refute):")
-    for triplet in suspicious:
-        lines.append(f"  • {triplet[0]}, {triplet[1]}, {triplet[2]}")
-
-    return lines
-
-def display_and_save_tracker(player):
-    lines = generate_tracker_log(player)
-    filename = "tracker_log.txt"
-    with open(filename, "w") as f:
-        for line in lines:
-            f.write(line + "\n")
-    print(f"\n[TRACKER] Written to {filename}\n")
-
-    # Auto-open the file
-    os.system(f"open {filename}") 
+    tracker = Tracker(player.name, "log")
+    tracker.extend(player.suggestion_history)
+    return tracker.lines()
+
+def display_and_save_tracker(tracker, log):
+    #log is the game's gamelog sink, the tracker is shown at info level like the rest of a human's turn
+    for line in tracker.lines():
+        log.info(line)
+    tracker.flush()
+    log.info("\n[TRACKER] Written to {}\n", tracker.filename)
+
+    # Optionally open the file in the system viewer, without going through a shell
+    if tracker.open_viewer:
+        try:
+            subprocess.Popen(["open", tracker.filename], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError:
+            log.info("[TRACKER] Could not open a viewer, the file is still saved.")
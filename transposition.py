@@ -0,0 +1,159 @@
+#transposition cache for ai decisions
+#exact knowledge states rarely come up twice, but the same situation up to relabelling does: which character you hold
+#doesn't matter, only what is known about each card. keys are canonical under renaming cards within a category and
+#rotating the seats so the deciding player comes first, and decisions are stored in that canonical labelling
+from collections import OrderedDict
+
+from cards import ALL_CARDS, CARD_INDEX, CATEGORY_MASKS
+from movement import check_room_entry
+
+DEFAULT_CACHE_SIZE = 1 << 16 #decisions kept per cache, each entry is a few hundred bytes
+_MISSING = object()
+_CATEGORY_CARDS = [[card for card in range(len(ALL_CARDS)) if mask >> card & 1] for mask in CATEGORY_MASKS.values()]
+
+_shared = None #one cache per process, see shared_cache()
+
+
+def _relabel(mask: int, new_index: list[int]) -> int:
+    relabelled = 0
+    while mask:
+        low = mask & -mask
+        relabelled |= 1 << new_index[low.bit_length() - 1]
+        mask ^= low
+    return relabelled
+
+
+def canonical_state(engine, decider: str, room: str | None = None) -> tuple[tuple, list[int]]:
+    """Key for the decider's knowledge plus room, and the card order it uses (canonical index -> real card index).
+
+    Equal keys always mean the two states are the same up to relabelling, ties in the ordering only cost missed hits."""
+    num_owners = len(engine.sizes)
+    seat = engine.seat[decider]
+    # Players clockwise from the decider, then the envelope
+    owners = [(seat + step) % engine.envelope for step in range(engine.envelope)] + [engine.envelope]
+    has = [engine.has[owner] for owner in owners]
+    lacks = [engine.lacks[owner] for owner in owners]
+    clauses = [set(engine.clauses[owner]) for owner in owners]
+    # Within each category order the cards by what is known about them
+    order = []
+    for cards in _CATEGORY_CARDS:
+        order.extend(sorted(cards, key=lambda card: tuple(
+            (has[k] >> card & 1, lacks[k] >> card & 1, sum(clause >> card & 1 for clause in clauses[k])) for k in range(num_owners))))
+    new_index = [0] * len(ALL_CARDS)
+    for position, card in enumerate(order):
+        new_index[card] = position
+    key = (
+        tuple(engine.sizes[owner] for owner in owners),
+        tuple(_relabel(mask, new_index) for mask in has),
+        tuple(_relabel(mask, new_index) for mask in lacks),
+        tuple(tuple(sorted(_relabel(clause, new_index) for clause in owner_clauses)) for owner_clauses in clauses),
+        None if room not in CARD_INDEX else new_index[CARD_INDEX[room]],
+    )
+    return key, order
+
+
+def knowledge_key(player, room: str | None = None) -> tuple:
+    """Canonical hashable encoding of everything an ai player knows, plus the room it stands in."""
+    return canonical_state(player.deduction, player.name, room)[0]
+
+
+class DecisionCache:
+    # Bounded LRU map from knowledge keys to decisions, with hit/miss/eviction counters.
+    # Plain dict-like object, so one instance can be shared by every game (and strategy) a worker runs.
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, value):
+        entries = self._entries
+        if key in entries:
+            entries.move_to_end(key)
+        elif len(entries) >= self.maxsize:
+            entries.popitem(last=False)
+            self.evictions += 1
+        entries[key] = value
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def shared_cache(maxsize: int = DEFAULT_CACHE_SIZE) -> DecisionCache:
+    """The process-wide cache, created on first use; later calls return it whatever maxsize they pass."""
+    global _shared
+    if _shared is None:
+        _shared = DecisionCache(maxsize)
+    return _shared
+
+
+class CachedStrategy:
+    # Wraps a strategy (see Player.strategy) and remembers its decisions by canonical knowledge state.
+    # Keys carry the wrapped strategy's name and budget, so differently tuned strategies can share one cache.
+    # A cached decision is replayed as is, which also means the wrapped strategy doesn't draw from the game rng on a hit.
+
+    def __init__(self, strategy, cache: DecisionCache | None = None):
+        self.strategy = strategy
+        self.cache = cache if cache is not None else shared_cache()
+        self.name = getattr(strategy, "name", type(strategy).__name__)
+        self._tag = (self.name, getattr(strategy, "budget", None))
+
+    def _decide(self, action: str, choose, player, rng, remember_none: bool):
+        if player.deduction is None:
+            return choose(player, rng)
+        key, order = canonical_state(player.deduction, player.name, check_room_entry(player.position))
+        key = (action, self._tag, key)
+        stored = self.cache.get(key, _MISSING)
+        if stored is not _MISSING:
+            return None if stored is None else tuple(ALL_CARDS[order[card]] for card in stored)
+        decision = choose(player, rng)
+        if decision is None:
+            if remember_none:
+                self.cache.put(key, None)
+            return None
+        position = {card: i for i, card in enumerate(order)}
+        self.cache.put(key, tuple(position[CARD_INDEX[card]] for card in decision))
+        return decision
+
+    def choose_suggestion(self, player, rng=None) -> tuple[str, str, str] | None:
+        #None means "use the built-in rule", not worth remembering
+        return self._decide("suggest", self.strategy.choose_suggestion, player, rng, remember_none=False)
+
+    def choose_accusation(self, player, rng=None) -> tuple[str, str, str] | None:
+        #None (wait another turn) is a decision too
+        return self._decide("accuse", self.strategy.choose_accusation, player, rng, remember_none=True)
+
+    def close(self):
+        self.strategy.close()
@@ -1,41 +1,157 @@
-import random
+import contextlib
+
 from movement import move_player, check_room_entry, will_move_off_board
-from configurations import SECRET_PASSAGES, ROOMS
+from board import BOARD
 from player import Player
-from tracker import display_and_save_tracker
+from tracker import Tracker, display_and_save_tracker
+from cards import CARD_BITS, cards_of
+
+_NO_METRICS = contextlib.nullcontext()
 
 class TurnManager:
-    def __init__(self, game):
+    def __init__(self, game, interactive: bool = True, metrics=None, open_tracker: bool = False):
         self.game = game  # gives access to players, solution, etc.
+        self.interactive = interactive  # False skips the "press Enter" pauses so ai-only games run unattended
+        self.metrics = metrics  # optional metrics.Metrics registry for per-phase timings
+        self.turns_played = 0
+        self.open_tracker = open_tracker  # launch the system viewer on TRACK
+        self.trackers = {}  # player name -> Tracker, created on first use
+        self.log = game.log  # gamelog sink shared with the game and its players
+
+    def tracker_for(self, player):
+        tracker = self.trackers.get(player.name)
+        if tracker is None:
+            tracker = Tracker(player.name, self.game.seed, self.open_tracker)
+            tracker.extend(player.suggestion_history) #catch up on anything before the tracker existed
+            self.trackers[player.name] = tracker
+        return tracker
+
+    def phase(self, name):
+        #times one phase of a turn, free when no metrics registry is attached
+        if self.metrics is None:
+            return _NO_METRICS
+        return self.metrics.phase(name)
+
+    def count(self, name, amount=1):
+        if self.metrics is not None:
+            self.metrics.count(name, amount)
+
+    def ask(self, prompt):
+        #buffered output has to reach the terminal before we wait on it
+        self.log.flush()
+        return input(prompt)
+
+    def pause(self, prompt):
+        if self.interactive:
+            self.ask(prompt)
+
+    def thinking_rng(self, player, purpose):
+        #only seats that think (a strategy or a sampling budget) draw from it, the built-in rule gets None and pays nothing
+        if player.strategy is None and not player.decision_budget:
+            return None
+        return self.game.thinking_rng(self.game.players.index(player), self.turns_played, purpose)
+
+    def record_move(self, player):
+        self.game.events.move(self.game.players.index(player), player.position)
+
+    # --- rule helpers shared by the terminal turn and the network server ---
+
+    def move_straight(self, player, direction, steps):
+        #straight line move from a human command, False (and no move) if it isn't at least one step or would leave the board
+        if steps < 1 or will_move_off_board(player.position, direction, steps):
+            return False
+        move_player(player, direction, steps)
+        self.record_move(player)
+        return True
+
+    def secret_passage_destination(self, player, command):
+        #"SECRET_PASSAGE_TO_<ROOM>" -> room name if the player is in a room with that passage, else None
+        dest_room = command.replace("SECRET_PASSAGE_TO_", "").title().replace("_", " ")
+        current_room = check_room_entry(player.position)
+        if current_room and BOARD.passages.get(current_room) == dest_room:
+            return dest_room
+        return None
+
+    def use_secret_passage(self, player, command):
+        #takes the passage named by a human command and returns the room, None (and no move) if there is no such passage here
+        dest_room = self.secret_passage_destination(player, command)
+        if dest_room is None:
+            return None
+        self.log.info("{} uses a secret passage to the {}.", player.name, dest_room)
+        with self.phase("movement"):
+            player.position = BOARD.room_tile(dest_room)
+            self.record_move(player)
+        return dest_room
+
+    def summon(self, suggester, char, room):
+        #the suggested character is pulled into the room
+        for p in self.game.players:
+            if p.name.lower() == char.lower() and p != suggester:
+                p.position = BOARD.room_tile(room)
+                self.record_move(p)
+                self.log.info("{} has been moved to the {} as part of the suggestion.", p.name, room)
+                break
+
+    def resolve_suggestion(self, player, char, weapon, room):
+        #human suggestion after the cards are chosen: summon, refute, log, and let the ai seats learn from it
+        self.summon(player, char, room)
+        with self.phase("refutation"):
+            refuter, shown_card = self.game.refute(player, (char, weapon, room))
+        self.record_suggestion(player, (char, weapon, room), refuter, shown_card)
+        refuter_name = refuter.name if refuter is not None else None
+        tracker = self.tracker_for(player) #before appending, a new tracker catches up on the history itself
+        player.suggestion_history.append((char, weapon, room, refuter_name))
+        tracker.record(*player.suggestion_history[-1])
+        with self.phase("knowledge"):
+            self.share_suggestion(player, (char, weapon, room), refuter_name)
+        return refuter, shown_card
+
+    def resolve_accusation(self, player, accusation):
+        #returns True for a correct accusation (the player wins), otherwise the player is eliminated
+        correct = tuple(accusation) == self.game.solution
+        self.game.events.accusation(self.game.players.index(player), accusation, correct)
+        self.count("accusations")
+        if correct:
+            self.game.winner = player.name
+        else:
+            player.eliminated = True
+            self.count("eliminations")
+        return correct
+
+    # --- turns ---
 
     def play_turn(self, player):
         if player.eliminated:
-            print(f"{player.name} has been eliminated and cannot take a turn.")
+            self.log.info("{} has been eliminated and cannot take a turn.", player.name)
             return
 
-        print(f"\n--- {player.name}'s Turn ---")
+        self.log.info("\n--- {}'s Turn ---", player.name)
         current_pos = player.position
         room_name = check_room_entry(current_pos)
-        pos_display = f"{current_pos} ({room_name})" if room_name else str(current_pos)
-        print(f"Current position: {pos_display}")
+        if room_name:
+            self.log.info("Current position: {} ({})", current_pos, room_name)
+        else:
+            self.log.info("Current position: {}", current_pos)
 
-        input(f"{player.name}, press Enter to roll the die...")
-        roll = self.game.roll_die()
-        print(f"You rolled a {roll}.")
+        self.ask(f"{player.name}, press Enter to roll the die...")
+        with self.phase("roll"):
+            roll = self.game.roll_die()
+        self.log.info("You rolled a {}.", roll)
 
+        #phases time the engine's work only, never a human typing
         while True:
-            move = input("Enter your move (e.g., UP 2), 'CARDS' to view your hand, 'TRACK' to see info, 'ACCUSE' to make an accusation: ").strip().upper().split()
+            move = self.ask("Enter your move (e.g., UP 2), 'CARDS' to view your hand, 'TRACK' to see info, 'ACCUSE' to make an accusation: ").strip().upper().split()
 
             if not move:
-                print("Please enter a command.")
+                self.log.info("Please enter a command.")
                 continue
 
             if move[0] == "CARDS":
-                print(f"\nYour cards: {player.cards}\n")
+                self.log.info("\nYour cards: {}\n", player.cards)
                 continue
 
             if move[0] == "TRACK":
-                display_and_save_tracker(player)
+                display_and_save_tracker(self.tracker_for(player), self.log)
                 continue
 
             if move[0] == "ACCUSE":
@@ -46,198 +162,193 @@ class TurnManager:
                 try:
                     direction, steps = move[0], int(move[1])
                 except ValueError:
-                    print("Steps must be a number!")
+                    self.log.info("Steps must be a number!")
+                    continue
+                if steps < 1:
+                    self.log.info("Steps must be at least 1!")
                     continue
 
-                if will_move_off_board(player.position, direction, steps):
-                    print("That move will take you off the board. Try again in range.")
+                with self.phase("movement"):
+                    moved = self.move_straight(player, direction, steps)
+                if not moved:
+                    self.log.info("That move will take you off the board. Try again in range.")
                     continue
 
-                move_player(player, direction, steps)
                 new_pos = player.position
                 room = check_room_entry(new_pos)
-                pos_display = f"{new_pos} ({room})" if room else str(new_pos)
-                print(f"You have moved to {pos_display}")
+                if room:
+                    self.log.info("You have moved to {} ({})", new_pos, room)
+                else:
+                    self.log.info("You have moved to {}", new_pos)
                 break
 
             elif move[0].startswith("SECRET_PASSAGE_TO_"):
-                dest_room = move[0].replace("SECRET_PASSAGE_TO_", "").title().replace("_", " ")
-                current_room = check_room_entry(player.position)
-                if current_room and SECRET_PASSAGES.get(current_room) == dest_room:
-                    print(f"{player.name} uses a secret passage to the {dest_room}.")
-                    player.position = next(iter(ROOMS[dest_room]))
-                    self.suggest(player, dest_room)
-                else:
-                    print("Invalid secret passage.")
+                if self.use_secret_passage(player, move[0]) is None:
+                    self.log.info("Invalid secret passage.")
+                    continue
                 break
             else:
-                print("Invalid move input.")
+                self.log.info("Invalid move input.")
 
         new_room = check_room_entry(player.position)
         if new_room:
-            print(f"You entered the {new_room}.")
+            self.log.info("You entered the {}.", new_room)
             self.suggest(player, new_room)
 
     def ai_play_turn(self, player):
-        print(f"\n--- {player.name} (AI PLAYER) Turn ---")
+        self.log.info("\n--- {} (AI PLAYER) Turn ---", player.name)
         if player.eliminated:
-            print(f"{player.name} is eliminated and skips their turn.")
+            self.log.info("{} is eliminated and skips their turn.", player.name)
             return
 
-        input("Press ENTER to begin AI turn...")
+        self.pause("Press ENTER to begin AI turn...")
 
         current_room = check_room_entry(player.position)
         if current_room:
-            print(f"{player.name} is currently in the {current_room}.")
+            self.log.info("{} is currently in the {}.", player.name, current_room)
             self.ai_suggest(player, current_room)
-            input("Press ENTER to continue...")
+            self.pause("Press ENTER to continue...")
             self.ai_accuse_if_confident(player)
             return
 
-        print(f"{player.name} is in the hallway and deciding where to go...")
-
-        possible_rooms = list(player.possible_solution["room"])
-        visited_rooms = {entry[2] for entry in player.suggestion_history}
-        unvisited_rooms = list(set(possible_rooms) - visited_rooms)
+        self.log.info("{} is in the hallway and deciding where to go...", player.name)
 
-        target_rooms = unvisited_rooms if unvisited_rooms else possible_rooms
-        target_room = random.choice(target_rooms)
-        target_tiles = ROOMS[target_room]
+        with self.phase("roll"):
+            roll = self.game.roll_die()
+        self.log.info("{} rolled a {}.", player.name, roll)
 
-        target_x, target_y = random.choice(target_tiles)
-        current_x, current_y = player.position
-        dx, dy = target_x - current_x, target_y - current_y
+        with self.phase("movement"):
+            possible_rooms = player.possible_in("room")
+            target_rooms = cards_of(possible_rooms & ~player.suggestion_history.rooms or possible_rooms) #unvisited first
 
-        if abs(dx) > abs(dy):
-            direction = "RIGHT" if dx > 0 else "LEFT"
-        else:
-            direction = "DOWN" if dy > 0 else "UP"
-
-        if will_move_off_board(player.position, direction, 1):
-            print(f"{player.name} can't move {direction} this turn.")
+            #distance fields are precomputed, so picking the room that leaves the least walking is a lookup per room
+            target_room = BOARD.best_target(target_rooms, player.position, roll)
+            path = BOARD.path_towards(target_room, player.position, roll) if target_room is not None else []
+        if target_room is None:
+            self.log.info("{} can't reach any room this turn.", player.name)
+            return
+        if not path:
+            self.log.info("{} can't move this turn.", player.name)
             return
 
-        move_player(player, direction, 1)
+        player.position = path[-1]
+        self.record_move(player)
         new_pos = player.position
-        print(f"{player.name} moved {direction} to {new_pos}")
+        self.log.info("{} heads for the {} and moves {} step(s) to {}", player.name, target_room, len(path), new_pos)
 
         new_room = check_room_entry(new_pos)
         if new_room:
-            print(f"{player.name} has entered the {new_room}.")
+            self.log.info("{} has entered the {}.", player.name, new_room)
             self.ai_suggest(player, new_room)
             self.ai_accuse_if_confident(player)
         else:
-            print(f"{player.name} is still in the hallway.")
+            self.log.info("{} is still in the hallway.", player.name)
 
     def ai_suggest(self, player, room):
-        print(f"{player.name} (AI PLAYER) is making a suggestion in the {room}...")
+        self.log.info("{} (AI PLAYER) is making a suggestion in the {}...", player.name, room)
 
-        suggestion = player.choose_suggestion()
+        with self.phase("suggestion"):
+            suggestion = player.choose_suggestion(self.thinking_rng(player, "suggest"))
         if not suggestion:
-            print("[AI ERROR] Could not generate suggestion.")
+            self.log.debug("[AI ERROR] Could not generate suggestion.")
             return
 
         char, weapon, room = suggestion
-        print(f"{player.name} suggests: {char} with the {weapon} in the {room}")
+        self.log.info("{} suggests: {} with the {} in the {}", player.name, char, weapon, room)
+        self.summon(player, char, room)
+
+        with self.phase("refutation"):
+            refuter, card_shown = self.game.refute(player, suggestion)
+        refuted = refuter is not None
+        refuter_name = refuter.name if refuted else None
+        self.record_suggestion(player, suggestion, refuter, card_shown)
+        if refuted:
+            self.log.info("{} refutes this suggestion by showing a card.", refuter_name)
 
+        with self.phase("knowledge"):
+            player.observe_suggestion(char, weapon, room, refuter_name, [p.name for p in self.game.players])
+            if refuted:
+                player.update_knowledge_from_refutation(player.name, suggestion, refuter_name, card_shown)
+            self.share_suggestion(player, suggestion, refuter_name)
+        if not refuted:
+            self.log.info("No player could refute this suggestion.")
+
+    def record_suggestion(self, player, suggestion, refuter, card_shown):
+        self.count("suggestions")
+        self.count("refuted" if refuter is not None else "unrefuted")
+        players = self.game.players
+        seat = players.index(player)
+        self.game.events.suggestion(seat, suggestion)
+        self.game.events.refutation(seat, players.index(refuter) if refuter is not None else None, card_shown)
+
+    def share_suggestion(self, suggester, suggestion, refuter_name):
+        #every other ai at the table gets to deduce from the public outcome of a suggestion
+        if not all(card in CARD_BITS for card in suggestion):
+            return #typo'd human suggestion, nothing reliable to learn
         for p in self.game.players:
-            if p.name.lower() == char.lower() and p != player:
-                p.position = next(iter(ROOMS[room]))
-                print(f"{p.name} has been moved to the {room} as part of the suggestion.")
-                break
-
-        suggestion_set = {char, weapon, room}
-        refuted = False
-        refuter_name = None
-        card_shown = None
-        current_index = self.game.players.index(player)
-
-        for i in range(1, len(self.game.players)):
-            next_player = self.game.players[(current_index + i) % len(self.game.players)]
-            matching_cards = [card for card in next_player.cards if card in suggestion_set]
-
-            if matching_cards:
-                card_shown = random.choice(matching_cards)
-                print(f"{next_player.name} refutes this suggestion by showing a card.")
-                refuted = True
-                refuter_name = next_player.name
-                break
-
-        player.observe_suggestion(char, weapon, room, refuter_name, [p.name for p in self.game.players])
-        if refuted:
-            player.update_knowledge_from_refutation(player.name, suggestion, refuter_name, card_shown)
-        else:
-            print("No player could refute this suggestion.")
+            if p.is_ai and p is not suggester:
+                p.observe_other_suggestion(suggester.name, suggestion, refuter_name)
 
 
     def ai_accuse_if_confident(self, player):
-        accusation = player.make_accusation()
+        with self.phase("accusation"):
+            accusation = player.make_accusation(self.thinking_rng(player, "accuse"))
         if accusation is None:
-            print(f"{player.name} (AI PLAYER) is not confident enough to accuse yet.")
+            self.log.info("{} (AI PLAYER) is not confident enough to accuse yet.", player.name)
             return
 
         char, weapon, room = accusation
-        print(f"\n{player.name} (AI PLAYER) is making an accusation: {char} with the {weapon} in the {room}")
+        self.log.info("\n{} (AI PLAYER) is making an accusation: {} with the {} in the {}", player.name, char, weapon, room)
 
-        if (char, weapon, room) == self.game.solution:
-            print(f"\n{player.name} (AI PLAYER) guessed correctly and wins the game!!!")
-            exit()
+        if self.resolve_accusation(player, accusation):
+            self.log.info("\n{} (AI PLAYER) guessed correctly and wins the game!!!", player.name)
         else:
-            print(f"\n{player.name} (AI PLAYER) was wrong and is now ELIMINATED!")
-            player.eliminated = True
+            self.log.info("\n{} (AI PLAYER) was wrong and is now ELIMINATED!", player.name)
             
     def suggest(self, player, room):
-        print(f"{player.name}, make a suggestion in the {room}:")
-        char = input("  Character: ").strip()
-        weapon = input("  Weapon: ").strip()
-
-        print(f"You suggested: {char} with the {weapon} in the {room}")
+        self.log.info("{}, make a suggestion in the {}:", player.name, room)
+        char = self.ask("  Character: ").strip()
+        weapon = self.ask("  Weapon: ").strip()
 
-        for p in self.game.players:
-            if p.name.lower() == char.lower() and p != player:
-                p.position = next(iter(ROOMS[room]))
-                print(f"{p.name} has been moved to the {room} as part of the suggestion.")
-                break
+        self.log.info("You suggested: {} with the {} in the {}", char, weapon, room)
 
-        refuted = False
-        current_index = self.game.players.index(player)
-        for i in range(1, len(self.game.players)):
-            next_player = self.game.players[(current_index + i) % len(self.game.players)]
-            matching_cards = [card for card in next_player.cards if card in {char, weapon, room}]
-            if matching_cards:
-                shown_card = random.choice(matching_cards)
-                print(f"{next_player.name} refuted your suggestion by showing you the card: {shown_card}")
-                refuted = True
-                break
-
-        if not refuted:
-            print("No one could refute your suggestion.")
-        #log for tracking
-        player.suggestion_history.append((char, weapon, room, next_player.name if refuted else None))
+        refuter, shown_card = self.resolve_suggestion(player, char, weapon, room)
+        if refuter is not None:
+            self.log.info("{} refuted your suggestion by showing you the card: {}", refuter.name, shown_card)
+        else:
+            self.log.info("No one could refute your suggestion.")
 
 
     def accuse(self, player):
-        print(f"{player.name}, make an accusation!")
-        char = input("  Character: ").strip()
-        weapon = input("  Weapon: ").strip()
-        room = input("  Room: ").strip()
+        self.log.info("{}, make an accusation!", player.name)
+        char = self.ask("  Character: ").strip()
+        weapon = self.ask("  Weapon: ").strip()
+        room = self.ask("  Room: ").strip()
 
-        print(f"\nYou accused: {char} with the {weapon} in the {room}")
+        self.log.info("\nYou accused: {} with the {} in the {}", char, weapon, room)
 
-        if (char, weapon, room) == self.game.solution:
-            print(f"\n{player.name} made a correct accusation and wins the game!")
-            exit()
+        with self.phase("accusation"):
+            correct = self.resolve_accusation(player, (char, weapon, room))
+        if correct:
+            self.log.info("\n{} made a correct accusation and wins the game!", player.name)
         else:
-            print(f"\nWrong accusation. {player.name} is eliminated from making further turns.")
-            player.eliminated = True
+            self.log.info("\nWrong accusation. {} is eliminated from making further turns.", player.name)
 
-    def run(self):
-        while True:
+    def run(self, max_turns=None):
+        #plays turns until someone wins or everyone is eliminated, max_turns caps headless games
+        while not self.game.is_over():
+            if max_turns is not None and self.turns_played >= max_turns:
+                break
             current_player = self.game.players[self.game.current_player_idx]
             if current_player.is_ai:
                 self.ai_play_turn(current_player)
-                input("Press Enter to continue AI turn...")
+                if not self.game.is_over():
+                    self.pause("Press Enter to continue AI turn...")
             else:
                 self.play_turn(current_player)
-                input("Press Enter to end your turn...")
+                if not self.game.is_over():
+                    self.ask("Press Enter to end your turn...")
+            self.turns_played += 1
+            self.count("turns")
             self.game.current_player_idx = (self.game.current_player_idx + 1) % self.game.num_players
+        self.log.flush()